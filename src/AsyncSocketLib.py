@@ -0,0 +1,108 @@
+# AsyncSocketLib.py
+# asyncio obdoba SocketLib nad StreamReader/StreamWriter. Formát zpráv je stejný: prefix "ML", délka a payload.
+# Díky tomu jedna smyčka událostí obslouží stovky spojení bez vlákna na každé z nich (zátěžové testy, headless klienti).
+# Príklad: conn = await FramedConnection.open("127.0.0.1", 10000); await conn.send(b"LK:PONG:jmeno:0")
+
+import asyncio
+import time
+
+from SocketLib import FrameParser, encode_frame, get_stats, get_trace, TRACE_SENT, TRACE_RECEIVED
+
+# Přijmutí zprávy ze StreamReaderu
+# Hlavičku i payload skládá sdílený FrameParser; čte se jen tolik, kolik parser chce, aby se nenačetla další zpráva.
+# Se zapnutými statistikami SocketLib (enable_stats) se zaznamená i doba příjmu a počet čtení.
+# Se zapnutým záznamem (enable_trace) se zpráva zapíše pod spojení key (výchozí je reader).
+async def read_frame(reader: asyncio.StreamReader, key=None) -> bytes:
+    parser = FrameParser()
+    stats = get_stats()
+    started = None
+    reads = 0
+    while True:
+        chunk = await reader.read(parser.wanted())
+        if not chunk:
+            raise ConnectionError("Disconnected while reading")
+        if stats is not None:
+            reads += 1
+            if started is None:
+                started = time.perf_counter()
+        frames = parser.feed(chunk)
+        if frames:
+            payload = frames[0]
+            payload = payload if type(payload) is bytes else bytes(payload)
+            if stats is not None:
+                stats.record_received(payload, time.perf_counter() - started, reads)
+            trace = get_trace()
+            if trace is not None:
+                trace.record(TRACE_RECEIVED, reader if key is None else key, payload)
+            return payload
+
+# Zápis zprávy do StreamWriteru (bez čekání na odeslání, na to je writer.drain())
+# Hlavička a payload se předají transportu zvlášť, payload se tedy nekopíruje.
+# compress=True (binary=True) jen pokud protistrana při přihlášení potvrdila CAP_ZLIB (CAP_BINARY).
+# key jako u read_frame (výchozí je writer).
+def write_frame(writer: asyncio.StreamWriter, payload: bytes, compress: bool = False, binary: bool = False, key=None):
+    stats = get_stats()
+    if stats is not None:
+        stats.record_sent(payload)
+    trace = get_trace()
+    if trace is not None:
+        trace.record(TRACE_SENT, writer if key is None else key, payload)
+    header, payload = encode_frame(payload, compress, binary)
+    writer.write(header)
+    writer.write(payload)
+
+# Spojení posílající a přijímající celé zprávy
+# send() čeká přes drain(), dokud transport neodešle data nad svým limitem (backpressure).
+# Atributy compress a binary se nastaví po úspěšném vyjednání CAP_ZLIB a CAP_BINARY při přihlášení.
+class FramedConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.compress = False
+        self.binary = False
+
+    # Otevření nového TCP spojení
+    @classmethod
+    async def open(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    # Přijmutí jedné zprávy
+    async def recv(self) -> bytes:
+        return await read_frame(self.reader, self)
+
+    # Odeslání zprávy a počkání, až transport uvolní místo v bufferu
+    async def send(self, payload: bytes):
+        write_frame(self.writer, payload, self.compress, self.binary, self)
+        await self.writer.drain()
+
+    # Zařazení zprávy k odeslání bez čekání; pro více zpráv za sebou a jeden drain() na konci
+    def send_nowait(self, payload: bytes):
+        write_frame(self.writer, payload, self.compress, self.binary, self)
+
+    async def drain(self):
+        await self.writer.drain()
+
+    # Uzavření spojení
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # Iterace přes příchozí zprávy až do odpojení protistrany
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self.recv()
+        except ConnectionError:
+            raise StopAsyncIteration
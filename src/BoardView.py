@@ -0,0 +1,211 @@
+# BoardView.py
+# Hrací deska Tk klienta na jednom Canvasu v retained módu s virtualizovanými řádky.
+# Položky Canvasu (pozadí řádku, číslo kola, kolíky tipu a hodnocení) existují jen pro řádky, které se
+# vejdou do okna; při posunu se stejné položky přepíšou na jiná kola, takže deska s 50 koly stojí
+# stejně jako s 10. render porovná nový stav řádku s naposledy vykresleným a přes itemconfigure
+# změní jen kolíky, které se opravdu změnily. Žádné ničení a vytváření widgetů ani update_idletasks.
+# Příklad: board = BoardView(parent, palette, num_pegs=4, empty=6); board.pack(fill="both", expand=True)
+#          board.render(client.rounds, client.currentRoundNumber)
+
+import colorsys
+import functools
+import tkinter as tk
+from tkinter import ttk
+
+# Barvy klasické hry (0-5); další barvy větších desek se dopočítají
+PALETTE = ("#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4")
+
+ROW_HEIGHT = 40
+ROW_GAP = 4
+ROW_PITCH = ROW_HEIGHT + ROW_GAP
+TOP = 5
+PEG_R = 11
+PEG_GAP = 6
+EVAL_R = 5
+EVAL_GAP = 2
+
+BG = "#ffffff"
+CURRENT_BG = "#fffac8"
+EMPTY_OUTLINE = "#cccccc"
+PEG_OUTLINE = "#7a7a7a"
+BLACK_PEG = "#FF6C1D"
+WHITE_PEG = "#969696"
+EMPTY_EVAL = "#f0f0f0"
+
+# Paleta pro count barev: klasických šest, zbytek rovnoměrně po barevném kruhu mezi nimi
+@functools.lru_cache(maxsize=None)
+def make_palette(count):
+    palette = list(PALETTE[:count])
+    extra = count - len(palette)
+    for i in range(extra):
+        r, g, b = colorsys.hsv_to_rgb((i + 0.5) / extra, 0.55 if i % 2 else 0.85, 0.75 if i % 2 else 0.95)
+        palette.append(f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}")
+    return tuple(palette)
+
+# Poslední tip kola (při chybějícím tipu prázdné pozice)
+def parse_guess(rnd, num_pegs, empty):
+    if rnd.guesses and isinstance(rnd.guesses[-1], list):
+        return rnd.guesses[-1][:num_pegs]
+    return [empty] * num_pegs
+
+# Poslední hodnocení kola jako (černé, bílé)
+def parse_eval(rnd):
+    if rnd.evaluations:
+        ev = rnd.evaluations[-1]
+        if isinstance(ev, tuple) and len(ev) >= 2:
+            return (int(ev[0]), int(ev[1]))
+    return (0, 0)
+
+# Položky jednoho viditelného řádku desky a naposledy vykreslený stav
+class _Row:
+    __slots__ = ("bg", "label", "pegs", "evals", "state")
+
+    def __init__(self, bg, label, pegs, evals, empty):
+        self.bg = bg
+        self.label = label
+        self.pegs = pegs
+        self.evals = evals
+        self.state = (None, False, (empty,) * len(pegs), (0, 0)) # (kolo, aktuální, tip, hodnocení); tak řádek vzniká
+
+class BoardView(tk.Frame):
+    def __init__(self, master, palette, num_pegs=4, empty=6):
+        super().__init__(master, bg=BG, bd=1, relief=tk.RIDGE)
+        self.palette = palette
+        self.num_pegs = num_pegs
+        self.empty = empty
+        self.eval_columns = (num_pegs + 1) // 2
+        self.width = 70 + num_pegs * (2 * PEG_R + PEG_GAP) + 20 + self.eval_columns * (2 * EVAL_R + EVAL_GAP) + 10
+        self.rows = [] # Znovupoužívané řádky (položky Canvasu) pro viditelná kola
+        self.rounds = []
+        self.current = 0
+        self.first = 0 # Kolo v prvním viditelném řádku
+        self.visible = 1 # Počet celých řádků, které se vejdou do okna
+        self.canvas = tk.Canvas(self, bg=BG, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+
+    # Vykreslení stavu hry; když aktuální kolo vyjede z okna, deska skočí o stránku (kolo bude nahoře),
+    # takže se viditelné řádky přepisují jednou za stránku, ne v každém kole
+    def render(self, rounds, current):
+        if current != self.current or not self.rounds:
+            if not self.first <= current < self.first + self.visible:
+                self.first = current
+        self.rounds = rounds
+        self.current = current
+        self.first = self._clamp(self.first)
+        self._refresh()
+
+    # Příkaz pro scrollbar: ("moveto", zlomek) nebo ("scroll", počet, "units"/"pages")
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            first = int(round(float(args[1]) * len(self.rounds)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self.visible
+            first = self.first + step
+        else:
+            return
+        first = self._clamp(first)
+        if first != self.first:
+            self.first = first
+            self._refresh()
+
+    def _clamp(self, first):
+        return max(0, min(first, len(self.rounds) - self.visible))
+
+    # Změna velikosti: doplní řádky, aby pokryly i částečně viditelný řádek dole
+    def _on_resize(self, event):
+        self.visible = max(1, (event.height - TOP) // ROW_PITCH)
+        needed = -(-(event.height - TOP) // ROW_PITCH)
+        while len(self.rows) < needed:
+            self._create_row(len(self.rows))
+        self.first = self._clamp(self.first)
+        self._refresh()
+
+    # Přepsání viditelných řádků na kola first.. a nastavení scrollbaru
+    def _refresh(self):
+        rounds = self.rounds
+        total = len(rounds)
+        for slot, row in enumerate(self.rows):
+            idx = self.first + slot
+            if idx < total:
+                rnd = rounds[idx]
+                self._update_row(row, idx, idx == self.current, parse_guess(rnd, self.num_pegs, self.empty), parse_eval(rnd))
+            else:
+                self._update_row(row, None, False, (self.empty,) * self.num_pegs, (0, 0))
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # Vytvoření položek řádku v pozici slot (pozadí, číslo kola, kolíky tipu a hodnocení)
+    def _create_row(self, slot):
+        canvas = self.canvas
+        top = TOP + slot * ROW_PITCH
+        cy = top + ROW_HEIGHT // 2
+        bg = canvas.create_rectangle(5, top, 5 + self.width, top + ROW_HEIGHT, fill=BG, width=0)
+        label = canvas.create_text(30, cy, text="", font=("Arial", 10, "normal"))
+
+        pegs = []
+        x = 70 + PEG_R
+        for _ in range(self.num_pegs):
+            pegs.append(canvas.create_oval(x - PEG_R, cy - PEG_R, x + PEG_R, cy + PEG_R,
+                                           fill=BG, outline=EMPTY_OUTLINE, width=2, state=tk.HIDDEN))
+            x += 2 * PEG_R + PEG_GAP
+
+        evals = []
+        left = x + 20 - PEG_R
+        for i in range(self.num_pegs):
+            ex = left + (i % self.eval_columns) * (2 * EVAL_R + EVAL_GAP)
+            ey = cy - EVAL_R - EVAL_GAP // 2 + (i // self.eval_columns) * (2 * EVAL_R + EVAL_GAP)
+            evals.append(canvas.create_oval(ex, ey, ex + 2 * EVAL_R, ey + 2 * EVAL_R,
+                                            fill=EMPTY_EVAL, outline=EMPTY_OUTLINE, width=1, state=tk.HIDDEN))
+
+        self.rows.append(_Row(bg, label, pegs, evals, self.empty))
+
+    # Změna řádku podle nového stavu; beze změny stavu se nic nevolá. idx None = řádek pod posledním kolem
+    def _update_row(self, row, idx, is_current, guess, evaluation):
+        state = (idx, is_current, tuple(guess), evaluation)
+        old = row.state
+        if state == old:
+            return
+        canvas = self.canvas
+        if old[0] != idx:
+            canvas.itemconfigure(row.label, text="" if idx is None else str(idx + 1))
+            if old[0] is None or idx is None:
+                shown = tk.HIDDEN if idx is None else tk.NORMAL
+                for item in row.pegs + row.evals:
+                    canvas.itemconfigure(item, state=shown)
+        if old[1] != is_current:
+            canvas.itemconfigure(row.bg, fill=CURRENT_BG if is_current else BG)
+            canvas.itemconfigure(row.label, font=("Arial", 10, "bold" if is_current else "normal"))
+
+        palette = self.palette
+        old_guess = old[2]
+        for i, (item, val) in enumerate(zip(row.pegs, guess)):
+            if i < len(old_guess) and old_guess[i] == val:
+                continue
+            if 0 <= val < len(palette):
+                canvas.itemconfigure(item, fill=palette[val], outline=PEG_OUTLINE)
+            else:
+                canvas.itemconfigure(item, fill=BG, outline=EMPTY_OUTLINE)
+
+        if old[3] != evaluation:
+            blacks, whites = evaluation
+            for i, item in enumerate(row.evals):
+                if i < blacks:
+                    color = BLACK_PEG
+                elif i < blacks + whites:
+                    color = WHITE_PEG
+                else:
+                    color = EMPTY_EVAL
+                canvas.itemconfigure(item, fill=color)
+        row.state = state
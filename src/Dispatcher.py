@@ -0,0 +1,85 @@
+# Dispatcher.py
+# Směrování příchozích zpráv (objektů z Messages.decode) na obslužné funkce podle typu zprávy.
+# Obsluha se registruje pro třídu zprávy nebo její TYPE; vyhledání je jeden přístup do slovníku.
+# Stejný dispatcher může používat Tk klient, bot i testovací skript, každý si zaregistruje vlastní obsluhy.
+# Příklad: dispatcher.register(Messages.Ping, lambda msg: send(Messages.Pong(name, role)))
+
+import sys
+import time
+
+class Dispatcher:
+    def __init__(self):
+        self._handlers = {}
+        self._default = None
+        self._timings = None # TYPE -> [počet, celkový čas, nejdelší čas], jen se zapnutým měřením
+
+    # Registrace obsluhy pro typ zprávy (třída z Messages nebo řetězec TYPE); vrací předchozí obsluhu
+    def register(self, message_type, handler):
+        key = _type_key(message_type)
+        previous = self._handlers.get(key)
+        self._handlers[key] = handler
+        return previous
+
+    # Dekorátor pro registraci: @dispatcher.on(Messages.Ping)
+    def on(self, message_type):
+        def decorator(handler):
+            self.register(message_type, handler)
+            return handler
+        return decorator
+
+    # Odebrání obsluhy; vrací odebranou obsluhu nebo None
+    def unregister(self, message_type):
+        return self._handlers.pop(_type_key(message_type), None)
+
+    # Obsluha pro zprávy, které žádnou registrovanou obsluhu nemají (výchozí je zahození)
+    def set_default(self, handler):
+        self._default = handler
+
+    # Předání zprávy obsluze; vrací výsledek obsluhy
+    def dispatch(self, message):
+        handler = self._handlers.get(message.TYPE, self._default)
+        if handler is None:
+            return None
+        if self._timings is None:
+            return handler(message)
+        start = time.perf_counter()
+        try:
+            return handler(message)
+        finally:
+            self._record(message.TYPE, time.perf_counter() - start)
+
+    # Zapnutí a vypnutí měření doby obsluhy podle typu zprávy
+    def enable_timing(self):
+        if self._timings is None:
+            self._timings = {}
+
+    def disable_timing(self):
+        self._timings = None
+
+    def _record(self, kind, elapsed):
+        entry = self._timings.get(kind)
+        if entry is None:
+            entry = self._timings[kind] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+    # Naměřené doby obsluhy: TYPE -> {"count", "total", "max"} (prázdné, pokud se neměří)
+    def timings(self) -> dict:
+        if self._timings is None:
+            return {}
+        return {kind: {"count": c, "total": t, "max": m} for kind, (c, t, m) in list(self._timings.items())}
+
+    # Výpis naměřených dob (výchozí je stderr)
+    def dump_timings(self, file=None):
+        file = file or sys.stderr
+        for kind, t in sorted(self.timings().items()):
+            print(f"[DISPATCH] {kind:<24} {t['count']:>6}x avg {t['total'] / t['count'] * 1000:.3f} ms"
+                  f" max {t['max'] * 1000:.3f} ms", file=file)
+
+# Klíč tabulky obsluh: TYPE třídy zprávy nebo přímo řetězec
+def _type_key(message_type) -> str:
+    if isinstance(message_type, str):
+        return message_type
+    return message_type.TYPE
@@ -0,0 +1,751 @@
+# LogikClient.py
+# Jádro klienta hry Logik bez GUI: připojení, přihlášení, lobby, připojení do místnosti, kola hry,
+# odpovědi na PING a reconnect. Veškerý stav protokolu je tady; Tk klient (LogikApp v client2.py),
+# bot nebo zátěžový test jen volá metody a poslouchá události (on/off, blokující wait).
+# Události se předávají přes post (u Tk master.after); bez něj běží přímo ve vlákně síťové smyčky.
+# Připojení blokuje (connect) nebo proběhne ve vlákně síťové smyčky (connect_async, výsledek jako událost).
+# Příklad: client = LogikClient("127.0.0.1", 10000); client.connect(); client.login("Pavel", 1)
+#          rooms, = client.wait("room_list", 5.0)
+
+import selectors
+import socket
+import sys
+import threading
+import time
+
+from SocketLib import sendMessage, FrameReader, FrameWriter, CAP_ZLIB, CAP_BINARY, parse_capabilities, format_capabilities, get_stats
+import Messages
+from Messages import decode, Geometry, CAP_GEOMETRY
+from Dispatcher import Dispatcher
+from NetworkLoop import NetworkLoop
+
+# Počet kol hry a kolíků v tipu klasické desky (jinou geometrii ohlásí server nebo ji zadá uživatel)
+ROUNDS = Messages.NUM_ROUNDS
+NUM_PEGS = Messages.NUM_PEGS
+# Prázdná pozice v tipu klasické desky (žádná barva); obecně geometry.empty
+NO_COLOR = Messages.EMPTY_PEG
+# Nejdelší čekání na navázání spojení se serverem
+CONNECT_TIMEOUT = 5.0
+# Bez zprávy od serveru po tuto dobu (PING chodí každých 5 s) se ve hře hlásí odpojení a začne reconnect
+IDLE_TIMEOUT = 6.0
+# Prodleva mezi neúspěšnými pokusy o reconnect
+RECONNECT_DELAY = 1.0
+# Jak dlouho platí místní označení obsazené místnosti (po JOIN_FAIL), než se znovu nabídne
+TAKEN_TTL = 10.0
+
+# Datová struktura pro jedno kolo hry
+class RoundInfo:
+    __slots__ = ("roundNumber", "guesses", "evaluations")
+
+    def __init__(self, roundNumber, num_pegs=NUM_PEGS, empty=NO_COLOR):
+        self.roundNumber = roundNumber # Číslo kola
+        self.guesses = [[empty] * num_pegs] # Defaultní prázdný tip (empty = žádná barva)
+        self.evaluations = [] # List hodnocení
+
+# Mezipaměť seznamu místností z ROOM_LIST
+# ID místností jsou řetězce jako v ROOM_LIST; čísla od volajícího (join_room(1)) se na ně převedou.
+# Generace se zvýší jen při změně seznamu, update vrací přidané a odebrané místnosti.
+# Místnost, kam se nepodařilo vstoupit, se hned označí jako obsazená (na TAKEN_TTL sekund),
+# takže další pokus může jít do jiné místnosti bez čekání na nový seznam ze serveru.
+class RoomCache:
+    def __init__(self, taken_ttl=TAKEN_TTL):
+        self.rooms = []
+        self.generation = 0
+        self.taken_ttl = taken_ttl
+        self._taken = {} # ID místnosti -> čas označení (time.monotonic)
+
+    # Nový seznam ze serveru; vrací (přidané, odebrané), při beze změny dva prázdné seznamy
+    def update(self, rooms):
+        rooms = [str(room) for room in rooms]
+        if rooms == self.rooms:
+            return [], []
+        old = set(self.rooms)
+        new = set(rooms)
+        added = [room for room in rooms if room not in old]
+        removed = [room for room in self.rooms if room not in new]
+        for room in removed:
+            self._taken.pop(room, None)
+        self.rooms = rooms
+        self.generation += 1
+        return added, removed
+
+    # Označení místnosti jako obsazené (JOIN_FAIL)
+    def mark_taken(self, room_id):
+        if room_id is not None:
+            self._taken[str(room_id)] = time.monotonic()
+
+    def is_taken(self, room_id):
+        room_id = str(room_id)
+        marked = self._taken.get(room_id)
+        if marked is None:
+            return False
+        if time.monotonic() - marked >= self.taken_ttl:
+            del self._taken[room_id]
+            return False
+        return True
+
+    # Místnosti bez platného označení obsazenosti, v pořadí ze serveru
+    def free(self):
+        return [room for room in self.rooms if not self.is_taken(room)]
+
+    # Další volná místnost po místnosti after (dokola); None, když žádná není
+    def next_free(self, after=None):
+        rooms = self.rooms
+        after = None if after is None else str(after)
+        start = rooms.index(after) + 1 if after in rooms else 0
+        for i in range(len(rooms)):
+            room = rooms[(start + i) % len(rooms)]
+            if not self.is_taken(room):
+                return room
+        return None
+
+# Jedno čekání na událost LogikClient (viz LogikClient.expect)
+class _Waiter:
+    def __init__(self, client, event):
+        self.client = client
+        self.event = event
+        self._done = threading.Event()
+        self._args = None
+        client.on(event, self._handler)
+
+    def _handler(self, *args):
+        if not self._done.is_set():
+            self._args = args
+            self._done.set()
+            self.client.off(self.event, self._handler)
+
+    # Vrací argumenty události; po vypršení timeoutu vyhodí TimeoutError
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            self.client.off(self.event, self._handler)
+            raise TimeoutError(f"No {self.event} within {timeout} s")
+        return self._args
+
+# Jeden rozpracovaný pokus o reconnect: neblokující socket a čtečka odpovědi serveru
+class _ReconnectAttempt:
+    __slots__ = ("sock", "reader")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = FrameReader(sock)
+
+# Události (název: argumenty obsluhy)
+#   connected: (žádné)                  connect_failed: error (po connect_async)
+#   login_success: capabilities        login_failed: message
+#   reconnect_confirm: state            reconnect_fail: message
+#   room_list: rooms                    join_success: room_id       join_fail: room_id
+#   game_start: other_name              unexpected: phase, message (None = neplatná zpráva)
+#   disconnected: error (mimo hru)      connection_lost: error (ve hře, začíná reconnect)
+#   reconnecting: elapsed               reconnected: state
+#   presence: name (nebo None)          colors_chosen: (žádné)
+#   guess: colors                       evaluation: blacks, whites
+#   game_over: winner                   opponent_left: name
+class LogikClient:
+    # geometry: deska pro server, který ji neohlásí (C++ server hraje jen klasickou)
+    # offer_geometry: nabídnout při přihlášení GEOM a převzít desku ohlášenou serverem; výchozí (None) jen
+    # u jiné než klasické desky, protože starší servery pětidílné START_LOGIN odmítnou
+    def __init__(self, host, port, compress=False, binary=False, post=None, geometry=Messages.CLASSIC,
+                 offer_geometry=None):
+        self.host = host
+        self.port = port
+        self.post = post
+        self.name = None
+        self.role = None
+        self.socket = None
+        self.reader = None
+        self.writer = None # Vlákno odesílající zprávy ze fronty (FrameWriter)
+        self.connected = False
+        self.connecting = False # Běží connect_async
+        self.offer_compression = compress # Nabídnout serveru kompresi při přihlášení
+        self.compress = False # Komprese vyjednaná se serverem
+        self.offer_binary = binary # Nabídnout serveru binární hlavičku při přihlášení
+        self.offer_geometry = geometry != Messages.CLASSIC if offer_geometry is None else offer_geometry
+        self.binary = False # Binární hlavička vyjednaná se serverem
+        self.phase = None # Na jakou odpověď serveru klient čeká: login, reconnect, lobby, join, waiting, game
+        self.joining_room = None
+        self.room_cache = RoomCache()
+        self.other_player_name = None
+        self.isRunning = False # Hra běží
+        self.reconnecting = False
+        self._reconnect_attempt = None # Rozpracovaný pokus o reconnect (_ReconnectAttempt)
+        self.last_online = None
+        self.me_online = 1
+        self.opponent_online = 1
+        self.geometry = geometry # Podle ní se převádějí barvy ve zprávách tohoto klienta
+        self.currentRoundNumber = 0
+        self.rounds = []
+        self._initialize_rounds()
+        self._listeners = {}
+        self.dispatcher = self._build_dispatcher()
+        if get_stats() is not None:
+            self.dispatcher.enable_timing()
+        # Síťová smyčka: příjem a dekódování zpráv; obsluhy zpráv i události běží tam, kam je pošle post
+        self.loop = NetworkLoop(self._post, self.onNetworkMessages, self.onNetworkDisconnect, decode=self.decode_message)
+
+    # --- Události ---
+
+    # Přidání obsluhy události
+    def on(self, event, handler):
+        self._listeners.setdefault(event, []).append(handler)
+        return handler
+
+    # Odebrání obsluhy události
+    def off(self, event, handler):
+        handlers = self._listeners.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    # Čekání na událost (pro boty a testy, nevolat z vlákna, ve kterém běží obsluhy); vrací její argumenty
+    # Událost, kterou vyvolá teprve vlastní požadavek, je bezpečnější čekat přes expect() zaregistrované předem.
+    def wait(self, event, timeout=None):
+        return self.expect(event).wait(timeout)
+
+    # Zaregistrování čekání na událost ještě před požadavkem, který ji vyvolá
+    # Příklad: waiter = client.expect("game_start"); client.join_room("1"); other_name, = waiter.wait(5.0)
+    def expect(self, event):
+        return _Waiter(self, event)
+
+    def _emit(self, event, *args):
+        for handler in list(self._listeners.get(event, ())):
+            handler(*args)
+
+    # Vyvolání události z vlákna síťové smyčky (reconnect) ve vlákně obsluh
+    def _emit_later(self, event, *args):
+        self._post(lambda: self._emit(event, *args))
+
+    def _post(self, func):
+        if self.post is None:
+            func()
+        else:
+            self.post(func)
+
+    # --- Spojení ---
+
+    # Připojení k serveru (blokuje); chybu připojení vyhodí
+    def connect(self):
+        # Nový pokus po odpojení (mimo hru): staré spojení se zahodí
+        if self.socket is not None:
+            self.loop.detach()
+            try:
+                if self.writer is not None:
+                    self.writer.close(flush=False)
+                self.socket.close()
+            except Exception:
+                pass
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.settimeout(CONNECT_TIMEOUT)
+            self.socket.connect((self.host, self.port))
+            self.socket.settimeout(None)
+        except OSError:
+            if self.socket is not None:
+                self.socket.close()
+            self.socket = None
+            self.writer = None
+            self.connected = False
+            raise
+        self.reader = FrameReader(self.socket)
+        self.writer = FrameWriter(self.socket)
+        self.loop.attach(self.socket, self.reader)
+        self.connected = True
+
+    # Připojení ve vlákně síťové smyčky, volající (GUI) se nezablokuje; výsledek přijde jako událost
+    # connected / connect_failed. Další volání během probíhajícího připojení nic nedělá.
+    def connect_async(self):
+        if self.connecting or self.connected:
+            return
+        self.connecting = True
+        self.loop.call_soon(self._connect_step)
+
+    def _connect_step(self):
+        try:
+            self.connect()
+        except OSError as e:
+            self._post(lambda error=e: self._connect_done("connect_failed", error))
+            return
+        self._post(lambda: self._connect_done("connected"))
+
+    def _connect_done(self, event, *args):
+        self.connecting = False
+        self._emit(event, *args)
+
+    # Ukončení spojení a síťové smyčky; zprávy čekající ve frontě se ještě odešlou
+    def close(self):
+        self.isRunning = False
+        self.connected = False
+        self.loop.stop()
+        attempt = self._reconnect_attempt
+        if attempt is not None:
+            attempt.sock.close()
+        if self.socket:
+            try:
+                # Odeslání zpráv, které ještě čekají ve frontě (např. potvrzení odpojení)
+                if self.writer is not None:
+                    self.writer.close(timeout=0.5)
+            except Exception:
+                pass
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+                self.socket.close()
+            except Exception:
+                pass
+            finally:
+                self.socket = None
+                self.reader = None
+                self.writer = None
+
+    # Odeslání zprávy (Messages.Message) na server (s kompresí a binární hlavičkou, pokud byly vyjednány)
+    # Zpráva se jen zařadí do fronty FrameWriteru, volající tedy na odeslání nečeká.
+    def _send(self, msg):
+        writer = self.writer
+        if writer is None:
+            raise ConnectionError("Not connected")
+        writer.send(msg.encode(), compress=self.compress, binary=self.binary)
+
+    # Převod přijaté zprávy na objekt (Messages); zpráva, která neodpovídá protokolu, vrací None
+    def decode_message(self, data):
+        try:
+            return decode(data, self.geometry)
+        except ValueError as e:
+            print(f"[DEBUG] Neplatná zpráva: {e}")
+            return None
+
+    # Výpis statistik SocketLib (jen se zapnutými statistikami)
+    def dump_stats(self):
+        stats = get_stats()
+        if stats is None:
+            return
+        reader = self.reader
+        if reader is not None:
+            print(f"[STATS] rozečtená data v bufferu: {reader.pending()}", file=sys.stderr)
+        writer = self.writer
+        if writer is not None:
+            print(f"[STATS] odesílání: {writer.latency()}", file=sys.stderr)
+        stats.dump()
+        self.dispatcher.dump_timings()
+
+    # --- Požadavky na server; chybu odeslání vyhodí ---
+
+    # Přihlášení; odpověď: login_success nebo login_failed
+    def login(self, name, role):
+        self.name = name
+        self.role = role
+        # Volitelné páté pole se schopnostmi klienta; server, který je zná, je vrátí v LOGIN_SUCCESS.
+        # Bez nabídnutých schopností jde klasické čtyřdílné START_LOGIN, které přijme i starší server.
+        offered = set()
+        if self.offer_geometry:
+            offered.add(CAP_GEOMETRY)
+        if self.offer_compression:
+            offered.add(CAP_ZLIB)
+        if self.offer_binary:
+            offered.add(CAP_BINARY)
+        self.phase = "login"
+        self._send(Messages.StartLogin(name, role, format_capabilities(offered)))
+
+    # Obnovení rozehrané hry z přihlašovací obrazovky; odpověď: reconnect_confirm nebo reconnect_fail
+    def reconnect(self, name, role):
+        self.name = name
+        self.role = role
+        self.phase = "reconnect"
+        self._send(Messages.ReconnectRequest(name, role))
+
+    # Seznam místností; odpověď: room_list
+    def request_rooms(self):
+        self.phase = "lobby"
+        self._send(Messages.RequestRooms(self.name, self.role))
+
+    # Připojení do místnosti; odpověď: join_success (pak game_start) nebo join_fail
+    def join_room(self, room_id):
+        room_id = str(room_id) # Stejný typ jako ID v ROOM_LIST a mezipaměti
+        self.phase = "join"
+        self.joining_room = room_id
+        self._send(Messages.JoinRoom(self.name, self.role, room_id))
+
+    # Nový pokus o vstup po join_fail: další volná místnost z mezipaměti, bez čekání na ROOM_LIST.
+    # Server po JOIN_FAIL přijímá jen REQUEST_ROOMS, proto jde hned za ním JOIN_ROOM ve stejné dávce;
+    # odpověď ROOM_LIST pak jen obnoví mezipaměť. Vrací ID místnosti, nebo None (žádná volná místnost).
+    def join_next_room(self):
+        room_id = self.room_cache.next_free(self.joining_room)
+        if room_id is None:
+            return None
+        self._send(Messages.RequestRooms(self.name, self.role))
+        self.join_room(room_id)
+        return room_id
+
+    # Tajná kombinace (hodnotitel)
+    def send_choice(self, colors):
+        self._send(Messages.ChoosingColors(colors, self.geometry))
+
+    # Tip (tipující)
+    def send_guess(self, colors):
+        self._send(Messages.GuessingColors(colors, self.geometry))
+
+    # Hodnocení tipu (hodnotitel); zapíše se hned i do aktuálního kola
+    def send_evaluation(self, blacks, whites):
+        self._send(Messages.Evaluation(blacks, whites))
+        self.addEvaluation((blacks, whites))
+
+    # Návrat do lobby po konci hry
+    def return_to_lobby(self):
+        self.isRunning = False
+        self.reconnecting = False
+        self.currentRoundNumber = 0
+        self._initialize_rounds()
+        # V lobby čekáme bez hlídání neaktivity
+        self.loop.set_idle_timeout(None)
+
+    # --- Stav hry ---
+
+    # Počet kolíků v tipu podle geometrie
+    num_pegs = property(lambda self: self.geometry.pegs)
+
+    # Změna geometrie desky (mimo hru); zprávy se dál dekódují podle ní
+    def set_geometry(self, geometry):
+        self.geometry = geometry
+        self._initialize_rounds()
+
+    # Inicializace kol hry
+    def _initialize_rounds(self):
+        geometry = self.geometry
+        self.rounds = [RoundInfo(i, geometry.pegs, geometry.empty) for i in range(geometry.rounds)]
+
+    # Začátek hry (po GAME_START nebo obnovení); ve hře se hlídá neaktivita
+    def _start_game(self):
+        self.phase = "game"
+        self.isRunning = True
+        self.last_online = time.time()
+        self.loop.set_idle_timeout(IDLE_TIMEOUT)
+
+    # Obnovení herního stavu ze snímku hry (Messages.ReconnectConfirm); vrací stav hry
+    def parseAndAttachReconnectData(self, data):
+        print(f"Parsuji reconnect data: {data}")
+        self.other_player_name = data.other_name
+        self._initialize_rounds()
+
+        for i, (guess, blacks, whites) in enumerate(data.rounds):
+            if i < len(self.rounds):
+                round_obj = self.rounds[i]
+            else:
+                round_obj = RoundInfo(i, self.num_pegs, self.geometry.empty)
+                self.rounds.append(round_obj)
+
+            round_obj.guesses = [list(guess[:self.num_pegs])]
+            round_obj.evaluations = [(blacks, whites)]
+
+        self.currentRoundNumber = data.round_number
+        return data.state
+
+    # Přidá tip do aktuálního kola
+    def addGuess(self, guesses_list):
+        if 0 <= self.currentRoundNumber < len(self.rounds):
+            self.rounds[self.currentRoundNumber].guesses = [list(guesses_list)]
+
+    # Přidá hodnocení do aktuálního kola
+    def addEvaluation(self, evaluation_tuple):
+        if 0 <= self.currentRoundNumber < len(self.rounds):
+            self.rounds[self.currentRoundNumber].evaluations.append(evaluation_tuple)
+
+    # Přesune hru do dalšího kola
+    def nextRound(self):
+        if self.currentRoundNumber < len(self.rounds) - 1:
+            self.currentRoundNumber += 1
+
+    # --- Příjem zpráv ---
+
+    # Tabulka obsluh zpráv přijímaných přes síťovou smyčku
+    def _build_dispatcher(self):
+        dispatcher = Dispatcher()
+        dispatcher.register(Messages.LoginSuccess, self.onLoginSuccess)
+        dispatcher.register(Messages.ReconnectConfirm, self.onReconnectConfirm)
+        dispatcher.register(Messages.ReconnectFail, self.onReconnectFail)
+        dispatcher.register(Messages.RoomList, self.onRoomList)
+        dispatcher.register(Messages.JoinSuccess, self.onJoinSuccess)
+        dispatcher.register(Messages.JoinFail, self.onJoinFail)
+        dispatcher.register(Messages.GameStart, self.onGameStart)
+        dispatcher.register(Messages.Ping, self.onPing)
+        dispatcher.register(Messages.WinGame, self.onWinGame)
+        dispatcher.register(Messages.PermanentDisconnect, self.onPermanentDisconnect)
+        dispatcher.register(Messages.TemporaryDisconnect, self.onTemporaryDisconnect)
+        dispatcher.register(Messages.ReconnectOtherPlayer, self.onReconnectOtherPlayer)
+        dispatcher.register(Messages.ChoosingColorsConfirm, self.onChoosingColorsConfirm)
+        dispatcher.register(Messages.GuessingColorsAck, self.onGuessingColorsAck)
+        dispatcher.register(Messages.EvaluationAck, self.onEvaluationAck)
+        dispatcher.set_default(self.onUnexpected)
+        return dispatcher
+
+    # Dávka zpráv ze síťové smyčky
+    def onNetworkMessages(self, messages):
+        self.last_online = time.time()
+        for message in messages:
+            if message is None:
+                self.onUnexpected(message)
+            else:
+                self.dispatcher.dispatch(message)
+
+    # Odpojení nebo neaktivita hlášená síťovou smyčkou
+    def onNetworkDisconnect(self, error):
+        if self.phase == "game":
+            if isinstance(error, socket.timeout):
+                # Neaktivita -> detekuj odpojení a přepni do reconnectingu
+                print("[DEBUG] recv timeout -> handleDisconnect")
+                self.dump_stats()
+            self.handleDisconnect(error)
+        else:
+            self.connected = False
+            self._emit("disconnected", error)
+
+    # Zpráva, kterou v dané fázi nikdo neobsluhuje (nebo neodpovídá protokolu)
+    def onUnexpected(self, message):
+        phase = self.phase
+        if phase == "login":
+            self.phase = None
+            self.connected = False
+            self._emit("login_failed", message)
+        elif phase == "reconnect":
+            self.phase = None
+            self.connected = False
+            self._emit("reconnect_fail", message)
+        elif phase != "game":
+            if phase == "join":
+                self.room_cache.mark_taken(self.joining_room)
+            self._emit("unexpected", phase, message)
+
+    def onLoginSuccess(self, message):
+        if self.phase != "login":
+            return
+        self.phase = None
+        accepted = parse_capabilities(message.capabilities)
+        self.compress = CAP_ZLIB in accepted
+        self.binary = CAP_BINARY in accepted
+        # Ohlášená geometrie má přednost před zadanou; server bez GEOM hraje tu zadanou
+        try:
+            announced = Geometry.from_capabilities(accepted)
+        except ValueError as e:
+            print(f"[DEBUG] Neplatná geometrie od serveru: {e}")
+            announced = None
+        if announced is not None and announced != self.geometry:
+            print(f"[DEBUG] Server hraje na desce {announced}")
+            self.set_geometry(announced)
+        self._emit("login_success", accepted)
+
+    def onReconnectConfirm(self, message):
+        if self.phase != "reconnect":
+            return
+        state = self.parseAndAttachReconnectData(message)
+        self._start_game()
+        self._emit("reconnect_confirm", state)
+
+    def onReconnectFail(self, message):
+        if self.phase != "reconnect":
+            return
+        self.phase = None
+        self._emit("reconnect_fail", message)
+
+    # Seznam místností: ve fázi join je to odpověď na REQUEST_ROOMS z join_next_room a hlásí se jen změna
+    def onRoomList(self, message):
+        if self.phase not in ("lobby", "join"):
+            return
+        added, removed = self.room_cache.update(message.rooms)
+        if self.phase == "lobby" or added or removed:
+            self._emit("room_list", list(self.room_cache.rooms))
+
+    def onJoinSuccess(self, message):
+        if self.phase != "join":
+            return
+        self.phase = "waiting"
+        self._emit("join_success", self.joining_room)
+
+    def onJoinFail(self, message):
+        if self.phase != "join":
+            return
+        self.room_cache.mark_taken(self.joining_room)
+        self._emit("join_fail", self.joining_room)
+
+    # Start hry: potvrzení serveru a přepnutí do herní fáze
+    def onGameStart(self, message):
+        if self.phase != "waiting":
+            return
+        self.other_player_name = message.other_name
+        try:
+            self._send(Messages.ReadyGameStart(self.name, self.role))
+        except Exception as e:
+            self.connected = False
+            self._emit("disconnected", e)
+            return
+        self._initialize_rounds()
+        self.currentRoundNumber = 0
+        self._start_game()
+        self._emit("game_start", message.other_name)
+
+    # odpověď na ping
+    def onPing(self, message):
+        if self.reconnecting:
+            return
+        try:
+            self.last_online = time.time()
+            self._send(Messages.Pong(self.name, self.role))
+        except Exception:
+            self.handleDisconnect(None)
+
+    # výhra/prohra
+    def onWinGame(self, message):
+        try:
+            self._send(Messages.WinGameAck())
+        except Exception:
+            pass
+        self.isRunning = False
+        self.reconnecting = False
+        self._emit("game_over", message.winner)
+
+    # permanentní odpojení
+    def onPermanentDisconnect(self, message):
+        self.opponent_online = 0
+        try:
+            self._send(Messages.PermanentDisconnectConfirm(self.name, self.role))
+        except Exception:
+            pass
+        self.isRunning = False
+        self._emit("opponent_left", message.name)
+
+    # dočasné odpojení
+    def onTemporaryDisconnect(self, message):
+        self.opponent_online = 0
+        try:
+            self._send(Messages.TemporaryDisconnectConfirm(self.name, self.role))
+        except Exception:
+            pass
+        self._emit("presence", message.name)
+
+    # reconnect jiného hráče
+    def onReconnectOtherPlayer(self, message):
+        self.opponent_online = 1
+        try:
+            self._send(Messages.ReconnectOtherPlayerAck())
+        except Exception:
+            pass
+        self._emit("presence", None)
+
+    # herní zprávy (volba)
+    def onChoosingColorsConfirm(self, message):
+        self._emit("colors_chosen")
+
+    # herní zprávy (tipování)
+    def onGuessingColorsAck(self, message):
+        self.addGuess(message.colors)
+        self._emit("guess", message.colors)
+
+    # herní zprávy (hodnocení)
+    def onEvaluationAck(self, message):
+        self.addEvaluation((message.blacks, message.whites))
+        self.nextRound()
+        self._emit("evaluation", message.blacks, message.whites)
+
+    # --- Reconnect ---
+
+    # Zpracování odpojení od serveru během hry
+    def handleDisconnect(self, error):
+        if not self.isRunning:
+            return
+        if not self.reconnecting:
+            self.reconnecting = True
+            self.me_online = 0
+            self._emit("connection_lost", error)
+            self.loop.call_soon(self.reconnectStep)
+
+    # Jeden pokus o reconnect ve vlákně síťové smyčky; při neúspěchu se naplánuje další
+    def reconnectStep(self):
+        if not self.isRunning or not self.reconnecting:
+            return
+        ref = self.last_online if isinstance(self.last_online, (int, float)) else time.time()
+        self._emit_later("reconnecting", int(time.time() - ref))
+        self.attemptReconnect()
+
+    # Obnovení stavu hry ze snímku (ve vlákně obsluh, stejně jako ostatní změny stavu)
+    def _reconnected(self, snapshot):
+        state = self.parseAndAttachReconnectData(snapshot)
+        self.reconnecting = False
+        self.me_online = 1
+        self._start_game()
+        self._emit("reconnected", state)
+
+    # Pokus o reconnect k serveru (ve vlákně síťové smyčky). Smyčku neblokuje: connect je neblokující
+    # a na jeho dokončení i na odpověď serveru se čeká přes selector (NetworkLoop.watch), takže mezitím
+    # dál běží časovače, úlohy z call_soon i probuzení. Celý pokus je omezený na IDLE_TIMEOUT.
+    # Po RECONNECT_CONFIRM se spojení vymění a snímek hry se předá do _reconnected,
+    # jinak se po RECONNECT_DELAY naplánuje další reconnectStep.
+    def attemptReconnect(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        attempt = _ReconnectAttempt(sock)
+        self._reconnect_attempt = attempt
+        try:
+            sock.connect((self.host, self.port))
+        except (BlockingIOError, InterruptedError):
+            pass # Spojení se navazuje
+        except OSError:
+            self._reconnect_failed(attempt)
+            return
+        self.loop.watch(sock, selectors.EVENT_WRITE, self._reconnect_connected)
+        self.loop.call_later(IDLE_TIMEOUT, self._reconnect_failed, attempt)
+
+    # Socket pokusu je zapisovatelný: connect skončil (úspěchem nebo chybou v SO_ERROR)
+    def _reconnect_connected(self, sock, mask):
+        attempt = self._reconnect_attempt
+        if attempt is None or attempt.sock is not sock:
+            return
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+            self._reconnect_failed(attempt)
+            return
+        try:
+            # Žádost je malá a buffer nového spojení prázdný, odejde celá i z neblokujícího socketu
+            sendMessage(sock, Messages.ReconnectRequest(self.name, self.role).encode())
+        except OSError:
+            self._reconnect_failed(attempt)
+            return
+        self.loop.watch(sock, selectors.EVENT_READ, self._reconnect_readable)
+
+    # Socket pokusu je čitelný: odpověď serveru (může dorazit po částech)
+    def _reconnect_readable(self, sock, mask):
+        attempt = self._reconnect_attempt
+        if attempt is None or attempt.sock is not sock:
+            return
+        try:
+            response = attempt.reader.read_frame()
+        except (BlockingIOError, InterruptedError):
+            return # Odpověď ještě nedorazila celá
+        except (OSError, ValueError):
+            self._reconnect_failed(attempt)
+            return
+        msg = self.decode_message(response)
+        if not isinstance(msg, Messages.ReconnectConfirm) or not self.isRunning or not self.reconnecting:
+            self._reconnect_failed(attempt)
+            return
+
+        self._reconnect_attempt = None
+        self.loop.unwatch(sock)
+        sock.setblocking(True)
+        self.loop.detach()
+        try:
+            if self.writer is not None:
+                self.writer.close(flush=False)
+            self.socket.close()
+        except Exception:
+            pass
+        self.socket = sock
+        self.reader = attempt.reader
+        self.writer = FrameWriter(sock)
+        self.compress = False # Na novém spojení se komprese ani binární hlavička nevyjednávaly
+        self.binary = False
+        # Zprávy, které přišly za RECONNECT_CONFIRM, zůstaly ve čtečce a smyčka je předá po připojení
+        self.loop.attach(sock, attempt.reader)
+        self._post(lambda: self._reconnected(msg))
+
+    # Neúspěch nebo vypršení pokusu (časovač z attemptReconnect); pokus, který už skončil, se přeskočí
+    def _reconnect_failed(self, attempt):
+        if attempt is not self._reconnect_attempt:
+            return
+        self._reconnect_attempt = None
+        self.loop.unwatch(attempt.sock)
+        # Zavře se až po odregistrování ze selectoru (úlohy smyčky běží v pořadí zařazení)
+        self.loop.call_soon(attempt.sock.close)
+        self.loop.call_later(RECONNECT_DELAY, self.reconnectStep)
@@ -0,0 +1,640 @@
+# LogikServer.py
+# Referenční server LK v Pythonu nad asyncio, náhrada C++ serveru (server.cpp, Game.cpp) pro testy a benchmarky klientů.
+# Implementuje stejný stavový automat: přihlášení a reconnect, lobby se seznamem místností, vstup do místnosti,
+# start hry (GAME_START / READY_GAME_START), stavy volba → tipování → hodnocení, PING/PONG, dočasné odpojení
+# (7 s bez PONG, hra se pozastaví a čeká na RECONNECT_REQUEST se snímkem RECONNECT_CONFIRM) a trvalé odpojení
+# (40 s, druhý hráč dostane PERMANENT_DISCONNECT a jde do lobby).
+# Místo vláken na klienta a na hru běží vše v jedné smyčce událostí: každé spojení je asyncio.Protocol,
+# který přijatá data předá FrameParseru a zprávy hned obslouží, časovače PING a odpojení obstarává jedna
+# periodická úloha pro všechny běžící hry. Jedno jádro tak zvládne tisíce spojení.
+# Proti C++ serveru navíc: přijme schopnosti ZLIB a BIN z přihlášení (--plain je vypne, jako u C++ serveru),
+# uzavřené spojení hráče ve hře bere hned jako dočasné odpojení (nečeká 7 s) a hráče s chybnou zprávou odpojí.
+# Geometrii desky (--pegs, --colors, --rounds) ohlásí klientům, kteří nabídnou schopnost GEOM.
+# Použití: python LogikServer.py <pocet_mistnosti> <port> [adresa] [--plain] [--verbose]
+#          [--pegs 4] [--colors 6] [--rounds 10]
+
+import argparse
+import asyncio
+import sys
+import time
+
+import Messages
+from Messages import decode
+from SocketLib import FrameParser, encode_frame, CAP_ZLIB, CAP_BINARY, parse_capabilities, format_capabilities
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+# Interval posílání PING hráčům ve hře
+PING_INTERVAL = 5.0
+# Bez PONG déle než toto je hráč dočasně odpojený, hra se pozastaví
+TEMPORARY_TIMEOUT = 7.0
+# Bez PONG déle než toto je hráč odpojený trvale, hra končí
+PERMANENT_TIMEOUT = 40.0
+# Perioda kontroly časovačů všech běžících her
+CHECK_INTERVAL = 0.5
+# Schopnosti, které server umí, pokud nejsou vypnuté (--plain)
+SUPPORTED_CAPABILITIES = frozenset((CAP_ZLIB, CAP_BINARY))
+# Fronta nepřijatých spojení pro listen()
+BACKLOG = 1024
+
+# Stavy hry, hodnoty odpovídají GameState v Game.hpp (posílají se v RECONNECT_CONFIRM)
+CHOOSING = 0
+GUESSING = 1
+EVALUATING = 2
+DISCONNECTED_G = 3
+DISCONNECTED_E = 4
+DISCONNECTED_BOTH = 5
+
+# Role hráčů
+GUESSER = 0
+EVALUATOR = 1
+
+# Stavy spojení (ConnectClientState v server.hpp)
+# foreign: čeká se na START_LOGIN nebo RECONNECT_REQUEST, login: přihlášený, čeká se na REQUEST_ROOMS,
+# lobby: čeká se na JOIN_ROOM, room: hráč je v místnosti, leaving: po PERMANENT_DISCONNECT se čeká na potvrzení
+FOREIGN = "foreign"
+LOGIN = "login"
+LOBBY = "lobby"
+ROOM = "room"
+LEAVING = "leaving"
+
+_verbose = False
+
+def log(*args):
+    if _verbose:
+        print(*args)
+
+# Jedno TCP spojení s klientem
+# Přijatá data skládá FrameParser, každá celá zpráva se dekóduje a předá serveru podle stavu spojení.
+class Connection(asyncio.Protocol):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.parser = FrameParser()
+        self.state = FOREIGN
+        self.name = None
+        self.role = None
+        self.game = None
+        self.compress = False
+        self.binary = False
+        self.closed = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections += 1
+
+    def data_received(self, data):
+        try:
+            frames = self.parser.feed(data)
+        except ValueError as e:
+            log(f"Chybná hlavička od {self.name}: {e}")
+            self.server.kick(self)
+            return
+        for frame in frames:
+            if self.closed:
+                return
+            try:
+                message = decode(frame, self.server.geometry)
+            except ValueError as e:
+                log(f"Chybná zpráva od {self.name}: {e}")
+                self.server.kick(self)
+                return
+            self.server.handle(self, message)
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self.server.connections -= 1
+        self.server.on_connection_lost(self)
+
+    # Odeslání zprávy; do zavřeného spojení se nic neposílá
+    def send(self, message):
+        if self.closed:
+            return
+        header, payload = encode_frame(message.encode(), self.compress, self.binary)
+        self.transport.write(header + payload)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.transport.close()
+
+# Hráč v místnosti (Player.hpp); spojení se při reconnectu vymění
+class Player:
+    __slots__ = ("name", "role", "conn", "valid", "last_seen", "last_ping", "ready")
+
+    def __init__(self, conn):
+        self.name = conn.name
+        self.role = conn.role
+        self.conn = conn
+        self.valid = True
+        self.last_seen = time.monotonic()
+        self.last_ping = 0.0
+        self.ready = False
+
+    # Spojení je otevřené
+    def connected(self) -> bool:
+        return self.conn is not None and not self.conn.closed
+
+    def send(self, message):
+        if self.conn is not None:
+            self.conn.send(message)
+
+# Herní místnost (Game.cpp)
+# Stavové obslužné metody vrací False pro zprávu, která v daném stavu nemá co dělat; hra pak končí
+# trvalým odpojením hráče, který ji poslal.
+class Game:
+    def __init__(self, server, game_id):
+        self.server = server
+        self.game_id = game_id
+        self.players = [None, None] # Podle role: [tipující (G), hodnotitel (E)]
+        self.running = False
+        self.paused = False
+        self.starting = False # GAME_START odeslán, čeká se na READY_GAME_START obou hráčů
+        self.early = [] # Zprávy hráče, který už je připravený, ale hra ještě nezačala (C++ je nechá v socketu)
+        self.state = CHOOSING
+        self.last_valid_state = CHOOSING
+        self.round_number = 0
+        self.rounds = []
+        self.secret = None
+        self.kicked = 0
+        self.state_handlers = {
+            CHOOSING: self.manageMessageChoosing,
+            GUESSING: self.manageMessageGuessing,
+            EVALUATING: self.manageMessageEvaluating,
+            DISCONNECTED_G: self.manageMessageDisconnectedG,
+            DISCONNECTED_E: self.manageMessageDisconnectedE,
+            DISCONNECTED_BOTH: self.manageMessageDisconnectedBoth,
+        }
+
+    @property
+    def guesser(self):
+        return self.players[GUESSER]
+
+    @property
+    def evaluator(self):
+        return self.players[EVALUATOR]
+
+    # Oběma hráčům se otevřeným spojením
+    def broadcast(self, message):
+        for player in self.players:
+            if player is not None:
+                player.send(message)
+
+    # Oba hráči jsou v místnosti: GAME_START se jménem protihráče a čekání na READY_GAME_START
+    def announce(self):
+        self.starting = True
+        guesser, evaluator = self.players
+        guesser.ready = evaluator.ready = False
+        guesser.send(Messages.GameStart(evaluator.name))
+        evaluator.send(Messages.GameStart(guesser.name))
+
+    def start(self):
+        log(f"Spouštím hru v místnosti {self.game_id}")
+        now = time.monotonic()
+        self.starting = False
+        self.running = True
+        self.paused = False
+        self.state = CHOOSING
+        self.last_valid_state = CHOOSING
+        self.round_number = 0
+        geometry = self.server.geometry
+        self.rounds = [[(geometry.empty,) * geometry.pegs, 0, 0] for _ in range(geometry.rounds)]
+        self.secret = None
+        self.kicked = 0
+        for player in self.players:
+            player.last_seen = now
+            player.last_ping = 0.0
+        self.server.running.add(self)
+        self.ping(now)
+        early, self.early = self.early, []
+        for conn, message in early:
+            self.handle(conn, message)
+
+    def stop(self):
+        self.running = False
+        self.paused = False
+        self.server.running.discard(self)
+
+    # Uvolnění místnosti (emptyRoom)
+    def empty(self):
+        for player in self.players:
+            if player is not None and player.conn is not None and player.conn.game is self:
+                player.conn.game = None
+        self.players = [None, None]
+        self.starting = False
+        self.early = []
+
+    # Zpráva od hráče v místnosti
+    def handle(self, conn, message):
+        player = self.players[conn.role]
+        if player is None or player.conn is not conn:
+            return # Zastaralé spojení hráče, který se mezitím připojil znovu
+        if not self.running:
+            if self.starting and player.ready:
+                self.early.append((conn, message))
+                return
+            if self.starting and type(message) is Messages.ReadyGameStart:
+                player.ready = True
+                if self.guesser.ready and self.evaluator.ready:
+                    self.start()
+                return
+            log(f"Chybná zpráva od {conn.name} před začátkem hry: {message!r}")
+            self.server.kick(conn)
+            return
+        if type(message) is Messages.Pong:
+            player.last_seen = time.monotonic()
+            return
+        if not self.state_handlers[self.state](message, conn.role == GUESSER):
+            log(f"Chybná zpráva od {conn.name} ve stavu {self.state}, ukončuji hru: {message!r}")
+            self.endPermanently(conn.role)
+
+    def manageMessageChoosing(self, message, guesser) -> bool:
+        kind = type(message)
+        if kind is Messages.ChoosingColors:
+            self.broadcast(Messages.ChoosingColorsConfirm())
+            self.secret = message.colors
+            self.state = GUESSING
+            return True
+        return kind is Messages.ReconnectOtherPlayerAck
+
+    def manageMessageGuessing(self, message, guesser) -> bool:
+        kind = type(message)
+        if kind is Messages.WinGameAck:
+            self.returnToLobby(GUESSER if guesser else EVALUATOR)
+            return True
+        if kind is Messages.GuessingColors:
+            if self.round_number >= self.server.geometry.rounds:
+                return False
+            self.broadcast(Messages.GuessingColorsAck(message.colors, self.server.geometry))
+            self.rounds[self.round_number][0] = message.colors
+            self.state = EVALUATING
+            return True
+        return kind is Messages.ReconnectOtherPlayerAck
+
+    def manageMessageEvaluating(self, message, guesser) -> bool:
+        kind = type(message)
+        if kind is Messages.Evaluation:
+            geometry = self.server.geometry
+            if not geometry.valid_evaluation(message.blacks, message.whites):
+                return False
+            self.broadcast(Messages.EvaluationAck(message.blacks, message.whites))
+            self.recordEvaluation(message)
+            if message.blacks == geometry.pegs:
+                self.broadcast(Messages.WinGame(GUESSER))
+            elif self.round_number >= geometry.rounds - 1:
+                self.broadcast(Messages.WinGame(EVALUATOR))
+            self.round_number += 1
+            self.state = GUESSING
+            return True
+        return kind is Messages.ReconnectOtherPlayerAck
+
+    # Hodnotitel je odpojený, tipující může dál tipovat
+    def manageMessageDisconnectedE(self, message, guesser) -> bool:
+        kind = type(message)
+        if kind is Messages.PermanentDisconnectConfirm or kind is Messages.TemporaryDisconnectConfirm:
+            return True
+        if kind is Messages.GuessingColors:
+            if self.round_number >= self.server.geometry.rounds:
+                return False
+            self.guesser.send(Messages.GuessingColorsAck(message.colors, self.server.geometry))
+            self.rounds[self.round_number][0] = message.colors
+            self.manageLastValidStateChange(EVALUATING)
+            return True
+        return False
+
+    # Tipující je odpojený, hodnotitel může dál hodnotit
+    def manageMessageDisconnectedG(self, message, guesser) -> bool:
+        kind = type(message)
+        if kind is Messages.PermanentDisconnectConfirm or kind is Messages.TemporaryDisconnectConfirm:
+            return True
+        if kind is Messages.Evaluation:
+            geometry = self.server.geometry
+            if not geometry.valid_evaluation(message.blacks, message.whites):
+                return False
+            self.evaluator.send(Messages.EvaluationAck(message.blacks, message.whites))
+            self.recordEvaluation(message)
+            if message.blacks == geometry.pegs:
+                self.evaluator.send(Messages.WinGame(GUESSER))
+            elif self.round_number > geometry.rounds - 1:
+                self.evaluator.send(Messages.WinGame(EVALUATOR))
+            self.round_number += 1
+            self.manageLastValidStateChange(GUESSING)
+            return True
+        if kind is Messages.WinGameAck and not guesser:
+            self.returnToLobby(EVALUATOR)
+            return True
+        return False
+
+    def manageMessageDisconnectedBoth(self, message, guesser) -> bool:
+        kind = type(message)
+        return kind is Messages.PermanentDisconnectConfirm or kind is Messages.TemporaryDisconnectConfirm
+
+    def recordEvaluation(self, message):
+        if self.round_number < len(self.rounds):
+            round_info = self.rounds[self.round_number]
+            round_info[1] = message.blacks
+            round_info[2] = message.whites
+
+    # Změna stavu s ohledem na odpojení obou hráčů (manageStateChange)
+    def manageStateChange(self, state, is_guesser_setting):
+        if state == DISCONNECTED_G and self.state == DISCONNECTED_E:
+            self.state = DISCONNECTED_BOTH
+        elif state == DISCONNECTED_E and self.state == DISCONNECTED_G:
+            self.state = DISCONNECTED_BOTH
+        elif self.state == DISCONNECTED_BOTH:
+            # Jeden z odpojených se vrátil, odpojený zůstává ten druhý
+            self.state = DISCONNECTED_E if is_guesser_setting else DISCONNECTED_G
+        else:
+            self.state = state
+
+    def manageLastValidStateChange(self, state):
+        if self.state != DISCONNECTED_BOTH:
+            self.last_valid_state = state
+
+    # Hráč potvrdil konec hry a vrací se do lobby; po obou hráčích je místnost volná
+    def returnToLobby(self, role):
+        player = self.players[role]
+        self.players[role] = None
+        self.server.returnPlayerToLobby(player.conn)
+        self.kicked += 1
+        if self.kicked >= 2:
+            self.stop()
+            self.empty()
+
+    # Trvalé odpojení hráče s rolí role: hra končí, druhý hráč dostane PERMANENT_DISCONNECT a jde do lobby
+    def endPermanently(self, role):
+        gone = self.players[role]
+        other = self.players[1 - role]
+        self.stop()
+        self.empty()
+        if gone is not None and gone.connected():
+            gone.conn.close()
+        if other is not None and other.valid and other.connected():
+            log(f"Odesílám PERMANENT_DISCONNECT hráči {other.name}")
+            other.send(Messages.PermanentDisconnect(gone.name, gone.role))
+            other.conn.state = LEAVING
+
+    # Reconnect hráče do běžící hry (continueGame); vrací snímek pro RECONNECT_CONFIRM
+    def continueGame(self, conn):
+        player = self.players[conn.role]
+        other = self.players[1 - conn.role]
+        log(f"Pokračuji ve hře pro hráče {conn.name} s rolí {conn.role}")
+        if self.state != DISCONNECTED_BOTH:
+            self.paused = False
+        self.manageStateChange(self.last_valid_state, conn.role == GUESSER)
+        if other is not None and other.valid:
+            other.send(Messages.ReconnectOtherPlayer())
+        if player.conn is not None and player.conn is not conn:
+            player.conn.close()
+        player.conn = conn
+        player.valid = True
+        player.last_seen = time.monotonic()
+        conn.game = self
+        rounds = tuple((tuple(guess), blacks, whites) for guess, blacks, whites in self.rounds)
+        other_name = other.name if other is not None else ""
+        return Messages.ReconnectConfirm(self.round_number, rounds, self.last_valid_state, other_name, self.server.geometry)
+
+    # PING hráčům, kterým od posledního uplynul PING_INTERVAL
+    def ping(self, now):
+        for player in self.players:
+            if player is not None and now - player.last_ping >= PING_INTERVAL and player.connected():
+                player.last_ping = now
+                player.send(Messages.Ping())
+
+    # Kontrola dočasného a trvalého odpojení (checkPlayerTimeouts)
+    def checkTimeouts(self, now):
+        if self.kicked > 0:
+            return # Hráči se vracejí do lobby
+        for role in (EVALUATOR, GUESSER):
+            player = self.players[role]
+            if not self.running or player is None:
+                return
+            other = self.players[1 - role]
+            silent = now - player.last_seen
+            if silent > PERMANENT_TIMEOUT:
+                log(f"Hráč {player.name} odpojen trvale, končím hru v místnosti {self.game_id}")
+                self.endPermanently(role)
+            elif silent > TEMPORARY_TIMEOUT or not player.connected():
+                if player.valid:
+                    log(f"Hráč {player.name} dočasně odpojen, pozastavuji hru v místnosti {self.game_id}")
+                    self.manageLastValidStateChange(self.state)
+                    self.manageStateChange(DISCONNECTED_E if role == EVALUATOR else DISCONNECTED_G, role == GUESSER)
+                    if other is not None and other.valid:
+                        other.send(Messages.TemporaryDisconnect(player.name, player.role))
+                    player.valid = False
+                    self.paused = True
+            elif not player.valid:
+                player.valid = True
+        if self.paused and self.guesser.valid and self.evaluator.valid:
+            self.paused = False
+
+class LogikServer:
+    # geometry: deska pro všechny místnosti; zprávy všech spojení se podle ní dekódují
+    def __init__(self, room_count, host="0.0.0.0", port=10000, capabilities=SUPPORTED_CAPABILITIES,
+                 geometry=Messages.CLASSIC):
+        self.host = host
+        self.port = port
+        self.capabilities = frozenset(capabilities)
+        self.geometry = geometry
+        self.games = {game_id: Game(self, game_id) for game_id in range(1, room_count + 1)}
+        self.running = set() # Běžící hry, kterým se posílá PING a kontrolují časovače
+        self.room_list = Messages.RoomList(str(game_id) for game_id in self.games)
+        self.connections = 0
+        self.handlers = {
+            FOREIGN: self.handleLoginAndReconnect,
+            LOGIN: self.handleLobbyRequest,
+            LOBBY: self.handleRoomRequest,
+            ROOM: self.handleGameMessage,
+            LEAVING: self.handleLeaving,
+        }
+        self._server = None
+        self._timer = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: Connection(self), self.host, self.port, backlog=BACKLOG)
+        self._timer = asyncio.create_task(self.checkTimers())
+        print(f"Server běží na adrese {self.host}:{self.port}, místností: {len(self.games)}")
+        sys.stdout.flush()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def handle(self, conn, message):
+        self.handlers[conn.state](conn, message)
+
+    # Ukončení spojení klienta kvůli chybné zprávě (closeAndKickClient)
+    def kick(self, conn):
+        conn.close()
+        self.removePlayerFromRoom(conn)
+
+    def on_connection_lost(self, conn):
+        game = conn.game
+        if game is None:
+            return
+        player = game.players[conn.role]
+        if player is None or player.conn is not conn:
+            return
+        if not game.running:
+            self.removePlayerFromRoom(conn)
+        elif game.kicked > 0:
+            # Druhý hráč už hru potvrdil a odešel, místnost se uvolní
+            game.stop()
+            game.empty()
+        # Odpojení z běžící hry vyřeší příští checkTimeouts (dočasné odpojení)
+
+    # Odebrání hráče z místnosti, kde se čeká na začátek hry
+    def removePlayerFromRoom(self, conn):
+        game = conn.game
+        if game is None or game.running:
+            return
+        player = game.players[conn.role]
+        if player is not None and player.conn is conn:
+            game.players[conn.role] = None
+            game.starting = False
+            game.early = []
+        conn.game = None
+
+    def returnPlayerToLobby(self, conn):
+        if conn is None:
+            return
+        conn.game = None
+        conn.state = LOGIN
+
+    # Stav foreign: přihlášení nebo reconnect do rozehrané hry
+    def handleLoginAndReconnect(self, conn, message):
+        kind = type(message)
+        if kind is Messages.StartLogin:
+            offered = parse_capabilities(message.capabilities)
+            accepted = offered & self.capabilities
+            if Messages.CAP_GEOMETRY in offered:
+                accepted.add(self.geometry.capability())
+            conn.name = message.name
+            conn.role = message.role
+            conn.send(Messages.LoginSuccess(message.name, message.role, format_capabilities(accepted)))
+            conn.compress = CAP_ZLIB in accepted
+            conn.binary = CAP_BINARY in accepted
+            conn.state = LOGIN
+        elif kind is Messages.ReconnectRequest:
+            game = self.findDisconnected(message.name, message.role)
+            if game is None:
+                conn.send(Messages.ReconnectFail())
+                return
+            conn.name = message.name
+            conn.role = message.role
+            conn.send(game.continueGame(conn))
+            conn.state = ROOM
+        else:
+            self.kick(conn)
+
+    # Běžící hra, ve které je hráč se jménem a rolí dočasně odpojený
+    def findDisconnected(self, name, role):
+        for game in self.running:
+            player = game.players[role]
+            if player is not None and not player.valid and player.name == name:
+                return game
+        return None
+
+    # Stav login: seznam místností
+    def handleLobbyRequest(self, conn, message):
+        if type(message) is not Messages.RequestRooms:
+            self.kick(conn)
+            return
+        conn.send(self.room_list)
+        conn.state = LOBBY
+
+    # Stav lobby: vstup do místnosti, po druhém hráči začíná hra
+    def handleRoomRequest(self, conn, message):
+        if type(message) is not Messages.JoinRoom:
+            self.kick(conn)
+            return
+        game = self.games.get(message.room_id)
+        if game is None or game.running or game.players[conn.role] is not None:
+            conn.send(Messages.JoinFail())
+            conn.state = LOGIN
+            return
+        game.players[conn.role] = Player(conn)
+        conn.game = game
+        conn.state = ROOM
+        conn.send(Messages.JoinSuccess())
+        if game.guesser is not None and game.evaluator is not None:
+            game.announce()
+
+    def handleGameMessage(self, conn, message):
+        if conn.game is None:
+            self.kick(conn)
+            return
+        conn.game.handle(conn, message)
+
+    # Stav leaving: hra skončila trvalým odpojením protihráče, čeká se na PERMANENT_DISCONNECT_CONFIRM
+    # Zprávy, které klient poslal, než se o konci dozvěděl, se ignorují; REQUEST_ROOMS už patří do lobby.
+    def handleLeaving(self, conn, message):
+        if type(message) is Messages.RequestRooms:
+            self.handleLobbyRequest(conn, message)
+        elif type(message) is Messages.PermanentDisconnectConfirm:
+            conn.state = LOGIN
+
+    # Periodická kontrola všech běžících her: PING a odpojení
+    async def checkTimers(self):
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            now = time.monotonic()
+            for game in list(self.running):
+                game.ping(now)
+                game.checkTimeouts(now)
+
+# Zvýšení limitu otevřených souborů (každé spojení je jeden deskriptor)
+def raise_fd_limit():
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def main():
+    global _verbose
+    parser = argparse.ArgumentParser(description="Referenční server Logik v Pythonu")
+    parser.add_argument("rooms", type=int, help="počet místností")
+    parser.add_argument("port", type=int)
+    parser.add_argument("address", nargs="?", default="0.0.0.0")
+    parser.add_argument("--plain", action="store_true", help="nepřijímat ZLIB ani BIN (jako C++ server)")
+    parser.add_argument("--verbose", action="store_true", help="vypisovat průběh her")
+    parser.add_argument("--pegs", type=int, default=Messages.NUM_PEGS, help="počet kolíků v tipu")
+    parser.add_argument("--colors", type=int, default=Messages.NUM_COLORS, help="počet barev")
+    parser.add_argument("--rounds", type=int, default=Messages.NUM_ROUNDS, help="počet kol hry")
+    args = parser.parse_args()
+    _verbose = args.verbose
+
+    if args.rooms <= 0:
+        parser.error("Počet místností musí být kladný")
+    if not 0 < args.port <= 65535:
+        parser.error(f"Neplatný port: {args.port}")
+    try:
+        geometry = Messages.Geometry(args.pegs, args.colors, args.rounds)
+    except ValueError as e:
+        parser.error(str(e))
+
+    raise_fd_limit()
+    host = "0.0.0.0" if args.address == "any" else args.address
+    server = LogikServer(args.rooms, host, args.port, () if args.plain else SUPPORTED_CAPABILITIES, geometry)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,8 @@ std::string LoginMessage::serialize() const{
 }
 
 bool LoginMessage::evaluate(){
-    if(parts.size() != LOGIN_PARTS_LENGTH){
+    /*Páté pole se schopnostmi klienta server zatím nepodporuje, proto ho ignoruje a v odpovědi nevrací (komprese zůstane vypnutá)*/
+    if(parts.size() != LOGIN_PARTS_LENGTH && parts.size() != LOGIN_CAPABILITIES_PARTS_LENGTH){
         return false;
     }
     std::string gamePrefix = parts[0];
@@ -61,6 +61,8 @@ inline constexpr const char* RECONNECT_OTHER_PLAYER_PREFIX_ACK = "RECONNECT_OTHE
 inline constexpr const char DELIM = ':';
 
 const int LOGIN_PARTS_LENGTH = 4;
+/*Přihlášení s volitelným pátým polem se schopnostmi klienta (např. ZLIB)*/
+const int LOGIN_CAPABILITIES_PARTS_LENGTH = 5;
 const int LOBBY_PARTS_LENGTH = 4;
 const int ROOM_PARTS_LENGTH = 5;
 const int START_GAME_PARTS_LENGTH = 4;
@@ -0,0 +1,514 @@
+# Messages.py
+# Typované zprávy protokolu LK, obdoba Messages.hpp/Messages.cpp na straně Pythonu.
+# decode() rozdělí payload jednou podle ':' a podle typu (druhé pole za "LK") vytvoří objekt zprávy,
+# serialize()/encode() vytvoří přesně ten text, který posílá nebo očekává C++ server.
+# Třídy používají __slots__, takže zpráva je malý objekt bez __dict__.
+# Barvy (CHOOSING_COLORS, GUESSING_COLORS(_ACK), RECONNECT_CONFIRM) se převádějí podle geometrie desky,
+# kterou si nese každé spojení: decode(payload, geometry), zpráva ji dostane jako parametr a serialize ji použije.
+# Příklad: decode(b"LK:EVALUATION_ACK:2:1") -> EvaluationAck(blacks=2, whites=1)
+
+GAME_PREFIX = "LK"
+DELIM = ":"
+
+# Klasická deska: 4 kolíky, 6 barev, 10 kol; prázdná pozice v tipu ve snímku hry (RECONNECT_CONFIRM)
+# má kód rovný počtu barev, tj. 6
+NUM_PEGS = 4
+NUM_COLORS = 6
+NUM_ROUNDS = 10
+EMPTY_PEG = NUM_COLORS
+
+# Schopnost z přihlášení: klient nabídne "GEOM", server v LOGIN_SUCCESS vrátí "GEOM=kolíky/barvy/kola"
+CAP_GEOMETRY = "GEOM"
+# Znaky barev v poli zprávy (0-9, pak a-z); posledním použitým znakem je prázdná pozice
+COLOR_SYMBOLS = "0123456789abcdefghijklmnopqrstuvwxyz"
+# Meze geometrie: hodnocení ve snímku hry má na černé a bílé po jedné číslici
+MAX_PEGS = 9
+MAX_COLORS = len(COLOR_SYMBOLS) - 1
+MAX_ROUNDS = 999
+# Nejvýš tolik kombinací se předpočítá do tabulky; větší desky se převádějí po znacích
+CODE_TABLE_LIMIT = 1 << 16
+
+# Základ všech zpráv
+# TYPE je prefix stavu ze hlavičky Messages.hpp, SIZE počet polí za typem (None = libovolný),
+# FIELDS názvy atributů zprávy (podtřídy se stejnými atributy mají __slots__ prázdné).
+class Message:
+    __slots__ = ()
+    TYPE = None
+    SIZE = 0
+    FIELDS = ()
+    GEOMETRIC = False # parse potřebuje geometrii desky (barvy)
+
+    # Hodnoty atributů zprávy v pořadí FIELDS
+    def fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    # Text zprávy tak, jak jde na drát
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}"
+
+    # Payload pro sendMessage
+    def encode(self) -> bytes:
+        return self.serialize().encode()
+
+    # Vytvoření zprávy z částí payloadu rozdělených podle ':' (parts[0] je "LK", parts[1] typ)
+    # Počet částí už zkontroloval decode() podle SIZE.
+    @classmethod
+    def parse(cls, parts: list):
+        return cls()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.fields() == other.fields()
+
+    def __hash__(self):
+        return hash((self.TYPE, self.fields()))
+
+    def __repr__(self):
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({args})"
+
+# Zpráva s polem jména a role hráče ("LK:<TYP>:jmeno:role")
+class PlayerMessage(Message):
+    FIELDS = ("name", "role")
+    __slots__ = FIELDS
+    SIZE = 2
+
+    def __init__(self, name: str, role: int):
+        self.name = name
+        self.role = role
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.name}{DELIM}{self.role}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        return cls(parts[2], _parse_role(parts[3]))
+
+# Předpočítané převody, aby se při každé zprávě nemusely znaky převádět a kontrolovat po jednom
+_ROLES = {"0": 0, "1": 1}
+_DIGITS = {str(i): i for i in range(10)}
+
+# Všechny kombinace kolíků s barvami 0..max_color: text -> n-tice barev
+def _color_codes(pegs: int, max_color: int) -> dict:
+    codes = {"": ()}
+    for _ in range(pegs):
+        codes = {text + COLOR_SYMBOLS[c]: colors + (c,) for text, colors in codes.items() for c in range(max_color + 1)}
+    return codes
+
+# Geometrie desky: počet kolíků v tipu, barev a kol hry
+# Převod pole barev "0123" <-> (0, 1, 2, 3): u malých desek (klasická má 7^4 kombinací) vyhledáním
+# v předpočítané tabulce, u velkých po znacích, takže ani 6 kolíků s 10 barvami nestaví obří tabulky.
+class Geometry:
+    __slots__ = ("pegs", "colors", "rounds", "empty", "_codes", "_peg_codes", "_peg_text", "_values", "_peg_values")
+
+    def __init__(self, pegs: int = NUM_PEGS, colors: int = NUM_COLORS, rounds: int = NUM_ROUNDS):
+        if not 1 <= pegs <= MAX_PEGS:
+            raise ValueError(f"Invalid number of pegs: {pegs} (1-{MAX_PEGS})")
+        if not 2 <= colors <= MAX_COLORS:
+            raise ValueError(f"Invalid number of colors: {colors} (2-{MAX_COLORS})")
+        if not 1 <= rounds <= MAX_ROUNDS:
+            raise ValueError(f"Invalid number of rounds: {rounds} (1-{MAX_ROUNDS})")
+        self.pegs = pegs
+        self.colors = colors
+        self.rounds = rounds
+        self.empty = colors
+        self._values = {COLOR_SYMBOLS[c]: c for c in range(colors)}
+        self._peg_values = {COLOR_SYMBOLS[c]: c for c in range(colors + 1)}
+        if (colors + 1) ** pegs <= CODE_TABLE_LIMIT:
+            self._codes = _color_codes(pegs, colors - 1)
+            self._peg_codes = _color_codes(pegs, colors)
+            self._peg_text = {colors: text for text, colors in self._peg_codes.items()}
+        else:
+            self._codes = self._peg_codes = self._peg_text = None
+
+    # Barvy tipu nebo tajné kombinace; s empty=True smí obsahovat i prázdnou pozici (snímek hry)
+    def parse_colors(self, field: str, empty: bool = False) -> tuple:
+        codes = self._peg_codes if empty else self._codes
+        if codes is not None:
+            colors = codes.get(field)
+        elif len(field) == self.pegs:
+            try:
+                colors = tuple(map((self._peg_values if empty else self._values).__getitem__, field))
+            except KeyError:
+                colors = None
+        else:
+            colors = None
+        if colors is None:
+            raise ValueError(f"Invalid colors: {field}")
+        return colors
+
+    def format_colors(self, colors) -> str:
+        colors = tuple(colors)
+        if self._peg_text is not None:
+            text = self._peg_text.get(colors)
+        elif len(colors) == self.pegs and all(type(c) is int and 0 <= c <= self.empty for c in colors):
+            text = "".join(COLOR_SYMBOLS[c] for c in colors)
+        else:
+            text = None
+        if text is None:
+            raise ValueError(f"Invalid colors: {colors}")
+        return text
+
+    # Platné hodnocení tipu (černé a bílé dohromady nejvýš počet kolíků)
+    def valid_evaluation(self, blacks: int, whites: int) -> bool:
+        return 0 <= blacks and 0 <= whites and blacks + whites <= self.pegs
+
+    # Pole schopnosti pro LOGIN_SUCCESS ("GEOM=4/6/10")
+    def capability(self) -> str:
+        return f"{CAP_GEOMETRY}={self.pegs}/{self.colors}/{self.rounds}"
+
+    # Geometrie ohlášená serverem v množině schopností; None, když ji server neposlal
+    @classmethod
+    def from_capabilities(cls, caps):
+        prefix = CAP_GEOMETRY + "="
+        for cap in caps:
+            if cap.startswith(prefix):
+                values = cap[len(prefix):].split("/")
+                if len(values) != 3 or not all(value.isdigit() for value in values):
+                    raise ValueError(f"Invalid geometry: {cap}")
+                return cls(*map(int, values))
+        return None
+
+    def __eq__(self, other):
+        return isinstance(other, Geometry) and (self.pegs, self.colors, self.rounds) == (other.pegs, other.colors, other.rounds)
+
+    def __hash__(self):
+        return hash((self.pegs, self.colors, self.rounds))
+
+    def __repr__(self):
+        return f"Geometry(pegs={self.pegs}, colors={self.colors}, rounds={self.rounds})"
+
+CLASSIC = Geometry()
+
+# Role 0 (tipující) nebo 1 (hodnotitel)
+def _parse_role(field: str) -> int:
+    role = _ROLES.get(field)
+    if role is None:
+        raise ValueError(f"Invalid role: {field}")
+    return role
+
+# Nezáporné celé číslo; jednociferná (hodnocení, stav) se jen vyhledají v tabulce
+def _parse_int(field: str) -> int:
+    value = _DIGITS.get(field)
+    if value is not None:
+        return value
+    if not field.isdigit():
+        raise ValueError(f"Invalid number: {field}")
+    return int(field)
+
+# ---------------------------------------------------------------------------
+# Zprávy od klienta pro server
+# ---------------------------------------------------------------------------
+
+# Přihlášení; volitelné páté pole se schopnostmi klienta (např. "ZLIB,BIN")
+class StartLogin(Message):
+    FIELDS = ("name", "role", "capabilities")
+    __slots__ = FIELDS
+    TYPE = "START_LOGIN"
+    SIZE = None
+
+    def __init__(self, name: str, role: int, capabilities: str = ""):
+        self.name = name
+        self.role = role
+        self.capabilities = capabilities
+
+    def serialize(self) -> str:
+        msg = f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.name}{DELIM}{self.role}"
+        if self.capabilities:
+            msg += f"{DELIM}{self.capabilities}"
+        return msg
+
+    @classmethod
+    def parse(cls, parts: list):
+        if len(parts) == 4:
+            return cls(parts[2], _parse_role(parts[3]))
+        if len(parts) == 5:
+            return cls(parts[2], _parse_role(parts[3]), parts[4])
+        raise ValueError(f"Invalid {cls.TYPE} message")
+
+class RequestRooms(PlayerMessage):
+    __slots__ = ()
+    TYPE = "REQUEST_ROOMS"
+
+class JoinRoom(Message):
+    FIELDS = ("name", "role", "room_id")
+    __slots__ = FIELDS
+    TYPE = "JOIN_ROOM"
+    SIZE = 3
+
+    def __init__(self, name: str, role: int, room_id: int):
+        self.name = name
+        self.role = role
+        self.room_id = room_id
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.name}{DELIM}{self.role}{DELIM}{self.room_id}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        return cls(parts[2], _parse_role(parts[3]), _parse_int(parts[4]))
+
+class ReadyGameStart(PlayerMessage):
+    __slots__ = ()
+    TYPE = "READY_GAME_START"
+
+class Pong(PlayerMessage):
+    __slots__ = ()
+    TYPE = "PONG"
+
+class PermanentDisconnectConfirm(PlayerMessage):
+    __slots__ = ()
+    TYPE = "PERMANENT_DISCONNECT_CONFIRM"
+
+class TemporaryDisconnectConfirm(PlayerMessage):
+    __slots__ = ()
+    TYPE = "TEMPORARY_DISCONNECT_CONFIRM"
+
+class ReconnectRequest(PlayerMessage):
+    __slots__ = ()
+    TYPE = "RECONNECT_REQUEST"
+
+# Tajná kombinace od hodnotitele; geometry určuje převod barev (do rovnosti zpráv se nepočítá)
+class ChoosingColors(Message):
+    FIELDS = ("colors",)
+    __slots__ = FIELDS + ("geometry",)
+    TYPE = "CHOOSING_COLORS"
+    SIZE = 1
+    GEOMETRIC = True
+
+    def __init__(self, colors: tuple, geometry: Geometry = CLASSIC):
+        self.colors = tuple(colors)
+        self.geometry = geometry
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.geometry.format_colors(self.colors)}"
+
+    @classmethod
+    def parse(cls, parts: list, geometry: Geometry = CLASSIC):
+        return cls(geometry.parse_colors(parts[2]), geometry)
+
+# Tip od tipujícího
+class GuessingColors(ChoosingColors):
+    __slots__ = ()
+    TYPE = "GUESSING_COLORS"
+
+# Hodnocení tipu od hodnotitele
+class Evaluation(Message):
+    FIELDS = ("blacks", "whites")
+    __slots__ = FIELDS
+    TYPE = "EVALUATION"
+    SIZE = 2
+
+    def __init__(self, blacks: int, whites: int):
+        self.blacks = blacks
+        self.whites = whites
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.blacks}{DELIM}{self.whites}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        return cls(_parse_int(parts[2]), _parse_int(parts[3]))
+
+class WinGameAck(Message):
+    __slots__ = ()
+    TYPE = "WIN_GAME_ACK"
+
+class ReconnectOtherPlayerAck(Message):
+    __slots__ = ()
+    TYPE = "RECONNECT_OTHER_PLAYER_ACK"
+
+# ---------------------------------------------------------------------------
+# Zprávy od serveru pro klienta
+# ---------------------------------------------------------------------------
+
+# Potvrzení přihlášení; capabilities obsahuje schopnosti, které server přijal (C++ server je nevrací)
+class LoginSuccess(StartLogin):
+    __slots__ = ()
+    TYPE = "LOGIN_SUCCESS"
+
+# Seznam volných místností (ID jako text, tak jak je poslal server)
+# Server bez volných místností pošle "LK:ROOM_LIST:" s jedním prázdným polem.
+class RoomList(Message):
+    FIELDS = ("rooms",)
+    __slots__ = FIELDS
+    TYPE = "ROOM_LIST"
+    SIZE = None
+
+    def __init__(self, rooms=()):
+        self.rooms = tuple(rooms)
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{DELIM.join(self.rooms)}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        return cls(part for part in parts[2:] if part)
+
+class JoinSuccess(Message):
+    __slots__ = ()
+    TYPE = "JOIN_SUCCESS"
+
+class JoinFail(Message):
+    __slots__ = ()
+    TYPE = "JOIN_FAIL"
+
+# Začátek hry se jménem protihráče
+class GameStart(Message):
+    FIELDS = ("other_name",)
+    __slots__ = FIELDS
+    TYPE = "GAME_START"
+    SIZE = 1
+
+    def __init__(self, other_name: str):
+        self.other_name = other_name
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.other_name}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        return cls(parts[2])
+
+class Ping(Message):
+    __slots__ = ()
+    TYPE = "PING"
+
+class PermanentDisconnect(PlayerMessage):
+    __slots__ = ()
+    TYPE = "PERMANENT_DISCONNECT"
+
+class TemporaryDisconnect(PlayerMessage):
+    __slots__ = ()
+    TYPE = "TEMPORARY_DISCONNECT"
+
+# Snímek rozehrané hry po reconnectu
+# rounds je n-tice kol (tip jako n-tice barev, černé, bílé); prázdná pozice tipu má kód empty z geometrie
+# (u klasické desky EMPTY_PEG).
+# state je stav hry (0 = volba, 1 = tipování, 2 = hodnocení).
+class ReconnectConfirm(Message):
+    FIELDS = ("round_number", "rounds", "state", "other_name")
+    __slots__ = FIELDS + ("geometry",)
+    TYPE = "RECONNECT_CONFIRM"
+    SIZE = None
+    GEOMETRIC = True
+
+    def __init__(self, round_number: int, rounds: tuple, state: int, other_name: str, geometry: Geometry = CLASSIC):
+        self.round_number = round_number
+        self.rounds = tuple(rounds)
+        self.state = state
+        self.other_name = other_name
+        self.geometry = geometry
+
+    def serialize(self) -> str:
+        format_colors = self.geometry.format_colors
+        rounds = "".join(f"{format_colors(guess)}{blacks}{whites}{DELIM}" for guess, blacks, whites in self.rounds)
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.round_number}{DELIM}{rounds}{self.state}{DELIM}{self.other_name}"
+
+    @classmethod
+    def parse(cls, parts: list, geometry: Geometry = CLASSIC):
+        if len(parts) < 5:
+            raise ValueError(f"Invalid {cls.TYPE} message")
+        pegs = geometry.pegs
+        rounds = []
+        for part in parts[3:-2]:
+            if len(part) != pegs + 2:
+                raise ValueError(f"Invalid round in {cls.TYPE}: {part}")
+            blacks = _DIGITS.get(part[pegs])
+            whites = _DIGITS.get(part[pegs + 1])
+            if blacks is None or whites is None:
+                raise ValueError(f"Invalid round in {cls.TYPE}: {part}")
+            rounds.append((geometry.parse_colors(part[:pegs], True), blacks, whites))
+        return cls(_parse_int(parts[2]), tuple(rounds), _parse_int(parts[-2]), parts[-1], geometry)
+
+class ReconnectFail(Message):
+    __slots__ = ()
+    TYPE = "RECONNECT_FAIL"
+
+# Potvrzení tajné kombinace; C++ server ho posílá s ':' na konci
+class ChoosingColorsConfirm(Message):
+    __slots__ = ()
+    TYPE = "CHOOSING_COLORS_CONFIRM"
+    SIZE = None
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        if len(parts) > 3 or (len(parts) == 3 and parts[2]):
+            raise ValueError(f"Invalid {cls.TYPE} message")
+        return cls()
+
+# Tip přeposlaný oběma hráčům
+class GuessingColorsAck(ChoosingColors):
+    __slots__ = ()
+    TYPE = "GUESSING_COLORS_ACK"
+
+# Hodnocení přeposlané oběma hráčům
+class EvaluationAck(Evaluation):
+    __slots__ = ()
+    TYPE = "EVALUATION_ACK"
+
+# Konec hry; winner je role vítěze (0 = tipující uhodl, 1 = hodnotitel ubránil)
+class WinGame(Message):
+    FIELDS = ("winner",)
+    __slots__ = FIELDS
+    TYPE = "WIN_GAME"
+    SIZE = 1
+
+    def __init__(self, winner: int):
+        self.winner = winner
+
+    def serialize(self) -> str:
+        return f"{GAME_PREFIX}{DELIM}{self.TYPE}{DELIM}{self.winner}"
+
+    @classmethod
+    def parse(cls, parts: list):
+        return cls(_parse_role(parts[2]))
+
+class ReconnectOtherPlayer(Message):
+    __slots__ = ()
+    TYPE = "RECONNECT_OTHER_PLAYER"
+
+# Tabulka typ -> třída, sestavená jednou při importu
+MESSAGE_TYPES = {cls.TYPE: cls for cls in (
+    StartLogin, RequestRooms, JoinRoom, ReadyGameStart, Pong, PermanentDisconnectConfirm,
+    TemporaryDisconnectConfirm, ReconnectRequest, ChoosingColors, GuessingColors, Evaluation,
+    WinGameAck, ReconnectOtherPlayerAck,
+    LoginSuccess, RoomList, JoinSuccess, JoinFail, GameStart, Ping, PermanentDisconnect,
+    TemporaryDisconnect, ReconnectConfirm, ReconnectFail, ChoosingColorsConfirm, GuessingColorsAck,
+    EvaluationAck, WinGame, ReconnectOtherPlayer,
+)}
+
+# Tabulka pro decode(): typ -> (parser, očekávaný počet částí nebo None, parser chce geometrii)
+# Zprávy bez polí nemají stav, parser pro ně vrací stále stejnou instanci.
+def _decoder(cls):
+    if cls.SIZE == 0:
+        instance = cls()
+        return (lambda parts: instance), 2, False
+    return cls.parse, (None if cls.SIZE is None else cls.SIZE + 2), cls.GEOMETRIC
+
+_DECODERS = {name: _decoder(cls) for name, cls in MESSAGE_TYPES.items()}
+
+# Převod payloadu (bytes, bytearray, memoryview nebo str) na objekt zprávy; barvy podle geometrie spojení
+# Neznámý typ, špatný prefix, počet polí nebo hodnota vyhodí ValueError.
+def decode(payload, geometry: Geometry = CLASSIC):
+    kind = type(payload)
+    if kind is str:
+        text = payload
+    elif kind is memoryview:
+        text = payload.tobytes().decode()
+    else:
+        text = payload.decode()
+    parts = text.split(DELIM)
+    if parts[0] != GAME_PREFIX or len(parts) < 2:
+        raise ValueError(f"Invalid message: {text[:64]}")
+    decoder = _DECODERS.get(parts[1])
+    if decoder is None:
+        raise ValueError(f"Unknown message type: {parts[1]}")
+    parse, size, geometric = decoder
+    if size is not None and len(parts) != size:
+        raise ValueError(f"Invalid {parts[1]} message")
+    if geometric:
+        return parse(parts, geometry)
+    return parse(parts)
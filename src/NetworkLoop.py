@@ -0,0 +1,264 @@
+# NetworkLoop.py
+# Jedna síťová smyčka nad selectors (epoll/kqueue/select podle systému) pro klienta s GUI.
+# Vlákno smyčky čeká zároveň na socket serveru a na probouzecí socketpair, přijaté zprávy dekóduje
+# a předá je GUI po dávkách: na celou dávku jedno volání post (u Tk master.after), ne jedno za zprávu.
+# Časovače (call_later) a úlohy (call_soon) běží ve stejném vlákně, takže reconnect ani kontrola
+# neaktivity nepotřebují vlastní vlákna s time.sleep a reagují hned, jak se něco stane. Další sockety
+# (navazované spojení při reconnectu) lze sledovat přes watch, smyčka na ně pak nečeká blokujícím voláním.
+# Socket zůstává blokující: po select se čte jen jednou (FrameReader.read_ready), odesílá FrameWriter.
+# S decode se zprávy dekódují hned po přijetí, velké zprávy se proto z bufferu čtečky nekopírují (owned=False).
+# Příklad: loop = NetworkLoop(lambda f: master.after(0, f), on_messages, on_disconnect, decode=decode)
+
+import heapq
+import itertools
+import selectors
+import socket
+import threading
+import time
+import traceback
+from collections import deque
+
+from SocketLib import FrameReader
+
+# Označení odpojení ve frontě pro GUI, aby se doručilo až po zprávách, které přišly před ním
+class _Disconnected:
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+class NetworkLoop:
+    # post(func): naplánuje func ve vlákně GUI (u Tk lambda f: master.after(0, f))
+    # on_messages(list): dávka přijatých (dekódovaných) zpráv, volá se ve vlákně GUI
+    # on_disconnect(error): chyba socketu nebo socket.timeout po idle_timeout sekundách bez zprávy, ve vlákně GUI
+    def __init__(self, post, on_messages, on_disconnect, decode=None, idle_timeout=None):
+        self.post = post
+        self.on_messages = on_messages
+        self.on_disconnect = on_disconnect
+        self.decode = decode
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._calls = deque() # Úlohy pro vlákno smyčky
+        self._timers = [] # Halda (čas, pořadí, funkce, argumenty)
+        self._sequence = itertools.count()
+        self._inbox = deque() # Zprávy a odpojení čekající na předání GUI
+        self._posted = False # Předání GUI je už naplánované
+        self._sock = None
+        self._reader = None
+        self._watched = {} # Další sledované sockety (watch): socket -> callback
+        self._idle_timeout = idle_timeout
+        self._last_recv = time.monotonic()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="NetworkLoop", daemon=True)
+        self._thread.start()
+
+    # Začátek čtení ze socketu; reader může obsahovat už přečtené zprávy (např. odpověď na RECONNECT_REQUEST)
+    def attach(self, sock, reader: FrameReader = None):
+        self.call_soon(self._attach, sock, reader or FrameReader(sock))
+
+    # Konec čtení ze socketu (socket se nezavírá)
+    def detach(self):
+        self.call_soon(self._detach)
+
+    # Sledování dalšího socketu, např. spojení, které se teprve navazuje (neblokující connect při reconnectu)
+    # Po každé události z events (selectors.EVENT_READ / EVENT_WRITE) se ve vlákně smyčky zavolá
+    # callback(sock, mask). Opakované watch stejného socketu jen změní události a callback.
+    def watch(self, sock, events, callback):
+        self.call_soon(self._watch, sock, events, callback)
+
+    # Konec sledování socketu z watch (socket se nezavírá)
+    def unwatch(self, sock):
+        self.call_soon(self._unwatch, sock)
+
+    # Hlášení neaktivity: po timeout sekundách bez zprávy se zavolá on_disconnect(socket.timeout); None vypne
+    def set_idle_timeout(self, timeout):
+        self.call_soon(self._set_idle_timeout, timeout)
+
+    # Provedení funkce ve vlákně smyčky (blokující síťové operace jako reconnect patří sem, ne do GUI)
+    def call_soon(self, func, *args):
+        with self._lock:
+            self._calls.append((func, args))
+        self.wake()
+
+    # Provedení funkce ve vlákně smyčky za delay sekund
+    def call_later(self, delay, func, *args):
+        with self._lock:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._sequence), func, args))
+        self.wake()
+
+    # Probuzení smyčky ze select()
+    def wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass # Plný buffer znamená, že probuzení už čeká; po stop() je socket zavřený
+
+    # Ukončení smyčky; volat lze z libovolného vlákna (nečeká se na něj, vlákno po probuzení samo skončí)
+    def stop(self):
+        self._running = False
+        self.wake()
+
+    def _attach(self, sock, reader):
+        self._detach()
+        self._sock = sock
+        self._reader = reader
+        self._last_recv = time.monotonic()
+        self._selector.register(sock, selectors.EVENT_READ)
+        self._queue_frames(reader.read_ready(fill=False, owned=self.decode is None))
+
+    def _detach(self):
+        if self._sock is not None:
+            try:
+                self._selector.unregister(self._sock)
+            except (KeyError, ValueError):
+                pass # Socket už je zavřený
+        self._sock = None
+        self._reader = None
+
+    def _watch(self, sock, events, callback):
+        if sock in self._watched:
+            self._selector.modify(sock, events)
+        else:
+            self._selector.register(sock, events)
+        self._watched[sock] = callback
+
+    def _unwatch(self, sock):
+        if self._watched.pop(sock, None) is not None:
+            try:
+                self._selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass # Socket už je zavřený
+
+    def _set_idle_timeout(self, timeout):
+        self._idle_timeout = timeout
+        self._last_recv = time.monotonic()
+
+    def _run(self):
+        try:
+            while self._running:
+                events = self._selector.select(self._next_timeout())
+                for key, mask in events:
+                    if key.fileobj is self._wake_r:
+                        self._drain_wakeups()
+                    elif key.fileobj is self._sock:
+                        self._read()
+                    else:
+                        # Callback mohl mezitím sledování tohoto socketu zrušit
+                        callback = self._watched.get(key.fileobj)
+                        if callback is not None:
+                            self._call(callback, (key.fileobj, mask))
+                self._run_calls()
+                self._run_timers()
+                self._check_idle()
+                self._deliver_later()
+        finally:
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    # Doba, po kterou může select() spát: nejbližší časovač nebo hlídání neaktivity
+    def _next_timeout(self):
+        deadlines = []
+        with self._lock:
+            if self._calls:
+                return 0
+            if self._timers:
+                deadlines.append(self._timers[0][0])
+        if self._sock is not None and self._idle_timeout is not None:
+            deadlines.append(self._last_recv + self._idle_timeout)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def _drain_wakeups(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    # Jedno čtení z čitelného socketu; chyba socket odpojí a nahlásí
+    def _read(self):
+        try:
+            frames = self._reader.read_ready(owned=self.decode is None)
+        except (ConnectionError, OSError) as e:
+            self._detach()
+            with self._lock:
+                self._inbox.append(_Disconnected(e))
+            return
+        self._last_recv = time.monotonic()
+        self._queue_frames(frames)
+
+    def _queue_frames(self, frames):
+        if not frames:
+            return
+        decode = self.decode
+        messages = [decode(frame) for frame in frames] if decode is not None else frames
+        with self._lock:
+            self._inbox.extend(messages)
+
+    def _run_calls(self):
+        while True:
+            with self._lock:
+                if not self._calls:
+                    return
+                func, args = self._calls.popleft()
+            self._call(func, args)
+
+    def _run_timers(self):
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._timers or self._timers[0][0] > now:
+                    return
+                _, _, func, args = heapq.heappop(self._timers)
+            self._call(func, args)
+
+    def _call(self, func, args):
+        try:
+            func(*args)
+        except Exception:
+            traceback.print_exc()
+
+    # Neaktivita se hlásí opakovaně po každých idle_timeout sekundách, socket zůstává připojený
+    def _check_idle(self):
+        if self._sock is None or self._idle_timeout is None:
+            return
+        if time.monotonic() - self._last_recv >= self._idle_timeout:
+            self._last_recv = time.monotonic()
+            with self._lock:
+                self._inbox.append(_Disconnected(socket.timeout("No message received")))
+
+    # Naplánování předání fronty GUI, pokud v ní něco je a předání ještě není naplánované
+    def _deliver_later(self):
+        with self._lock:
+            if not self._inbox or self._posted:
+                return
+            self._posted = True
+        try:
+            self.post(self._deliver)
+        except Exception:
+            with self._lock:
+                self._posted = False # GUI už neběží
+
+    # Ve vlákně GUI: předání všech zpráv a odpojení ve frontě v pořadí, v jakém přišly
+    def _deliver(self):
+        with self._lock:
+            items = list(self._inbox)
+            self._inbox.clear()
+            self._posted = False
+        batch = []
+        for item in items:
+            if type(item) is _Disconnected:
+                if batch:
+                    self.on_messages(batch)
+                    batch = []
+                self.on_disconnect(item.error)
+            else:
+                batch.append(item)
+        if batch:
+            self.on_messages(batch)
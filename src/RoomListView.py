@@ -0,0 +1,112 @@
+# RoomListView.py
+# Virtualizovaný seznam místností pro lobby Tk klienta.
+# Tlačítka existují jen pro řádky, které se vejdou do okna; při posunu se stejná tlačítka jen
+# přepíšou na jiné místnosti, takže vykreslení trvá stejně pro 10 i 10 000 místností.
+# Nový ROOM_LIST jen vymění data (pozice posunu zůstane), nic se neničí a nevytváří znovu.
+# Kolečko myši se váže jednou na seznam a jeho tlačítka, ne globálně přes bind_all.
+# Příklad: view = RoomListView(parent, on_select=self.join_room); view.pack(fill="both", expand=True)
+#          view.set_rooms([1, 2, 3])
+
+import tkinter as tk
+from tkinter import ttk
+
+# Výška jednoho řádku seznamu v pixelech (tlačítko i s mezerou)
+ROW_HEIGHT = 40
+# Mezera nad a pod tlačítkem v řádku
+ROW_PADDING = 5
+
+class RoomListView(tk.Frame):
+    # on_select(room_id): volá se po kliknutí na místnost
+    def __init__(self, master, on_select, row_height=ROW_HEIGHT, bg="#ffffff"):
+        super().__init__(master, bg=bg)
+        self.on_select = on_select
+        self.row_height = row_height
+        self.rooms = []
+        # Index první zobrazené místnosti
+        self.first = 0
+        # Počet celých řádků, které se vejdou do okna
+        self.visible = 1
+        # Znovupoužívaná tlačítka řádků a místnost, kterou právě ukazují (None = skryté)
+        self.rows = []
+        self.shown = []
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = tk.Frame(self, bg=bg)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    # Nastavení seznamu místností (po každém ROOM_LIST)
+    def set_rooms(self, rooms):
+        self.rooms = list(rooms)
+        self.first = self._clamp(self.first)
+        self._refresh()
+
+    # Příkaz pro scrollbar: ("moveto", zlomek) nebo ("scroll", počet, "units"/"pages")
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            first = int(round(float(args[1]) * len(self.rooms)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self.visible
+            first = self.first + step
+        else:
+            return
+        first = self._clamp(first)
+        if first != self.first:
+            self.first = first
+            self._refresh()
+
+    # Posun tak, aby poslední řádek seznamu byl na konci okna
+    def _clamp(self, first):
+        return max(0, min(first, len(self.rooms) - self.visible))
+
+    # Změna velikosti okna: doplní tlačítka, aby pokryla i částečně viditelný řádek
+    def _on_resize(self, event):
+        self.visible = max(1, event.height // self.row_height)
+        needed = -(-event.height // self.row_height)
+        while len(self.rows) < needed:
+            index = len(self.rows)
+            btn = ttk.Button(self.body, width=30, command=lambda i=index: self._select(i))
+            self._bind_wheel(btn)
+            self.rows.append(btn)
+            self.shown.append(None)
+        self.first = self._clamp(self.first)
+        self._refresh()
+
+    # Přepsání tlačítek na aktuální výřez seznamu; mění se jen řádky, kde se místnost liší
+    def _refresh(self):
+        total = len(self.rooms)
+        for i, btn in enumerate(self.rows):
+            index = self.first + i
+            room_id = self.rooms[index] if index < total else None
+            if room_id == self.shown[i]:
+                continue
+            if room_id is None:
+                btn.place_forget()
+            else:
+                if self.shown[i] is None:
+                    btn.place(relx=0.5, y=i * self.row_height + ROW_PADDING, anchor="n",
+                              height=self.row_height - 2 * ROW_PADDING)
+                btn.configure(text=f"Místnost {room_id}")
+            self.shown[i] = room_id
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # Kliknutí na i-tý řádek okna
+    def _select(self, row):
+        room_id = self.shown[row]
+        if room_id is not None:
+            self.on_select(room_id)
+
+    # Kolečko myši: Windows/macOS posílá <MouseWheel> s delta, X11 tlačítka 4 a 5
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
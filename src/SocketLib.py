@@ -2,64 +2,920 @@
 # Pomocná knihovna pro odesílání a přijímání zpráv přes sockety, funguje na principu prefixu "ML" následovaného délkou zprávy.
 # Vše řešeno zde na úrovních obalových funkcí nad sockety. Maximální velikost zprávy je 10 MB. 
 # Príklad poslané zprávy "ML16LK:LOGIN_SUCCESS"
+# Volitelně lze velké zprávy posílat komprimované (zlib) s prefixem "MZ", pokud to protistrana při přihlášení podporuje.
+# Druhý režim rámování ("MB" + 4 bajty délky big-endian) nemá problém s payloady začínajícími číslicí
+# a hlavičku jde přečíst jedním recv_into; také se volí při přihlášení.
 
 # Autor: Pavel Kratochvíle 2025
 
+import atexit
+import bisect
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import weakref
+import zlib
+from collections import deque
+
 MAX_SIZE = 10 * 1024 * 1024
 PREFIX = "ML"
+# Prefix komprimované zprávy, délka za ním je délka komprimovaných dat
+COMPRESSED_PREFIX = "MZ"
+# Komprimují se jen zprávy delší než tato hranice
+COMPRESS_THRESHOLD = 1024
+# Úroveň komprese; u číselných seznamů (ROOM_LIST) je nejnižší úroveň rychlejší i úspornější
+COMPRESS_LEVEL = 1
+# Binární režim: magic a délka jako 4 bajty big-endian; "MC" je komprimovaná varianta
+BINARY_PREFIX = b"MB"
+BINARY_COMPRESSED_PREFIX = b"MC"
+BINARY_LENGTH = struct.Struct(">I")
+BINARY_HEADER_SIZE = 2 + BINARY_LENGTH.size
+# Označení schopností, které si strany vymění při přihlášení
+CAP_ZLIB = "ZLIB"
+CAP_BINARY = "BIN"
+# Velikost jednoho čtení ze socketu pro FrameReader
+RECV_BUFSIZE = 64 * 1024
+# Maximální počet číslic délky (délka nad MAX_SIZE nemá smysl číst dál)
+MAX_LENGTH_DIGITS = len(str(MAX_SIZE))
+# Do této velikosti přijímá recvMessage payload obyčejným recv(), větší rovnou do bufferu o velikosti zprávy
+RECV_COPY_THRESHOLD = 16 * 1024
+# Maximální počet bufferů v jednom volání sendmsg (IOV_MAX na Linuxu)
+IOV_MAX = 1024
+# Do této velikosti payloadu je levnější ho s hlavičkou spojit než posílat přes sendmsg
+COPY_THRESHOLD = 16 * 1024
+# Výchozí velikost kusu pro proudové čtení zprávy (recv_message_stream)
+STREAM_CHUNK_SIZE = 64 * 1024
+# Horní meze košů histogramu doby příjmu zprávy v sekundách (poslední koš je pro vše delší)
+LATENCY_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, 6.0)
+# Soubor se záznamem zpráv (trace): magic a za ním záznamy TRACE_RECORD následované payloadem
+TRACE_MAGIC = b"LKTRACE1\n"
+# Druh záznamu, číslo spojení v rámci sezení, čas (time.monotonic), délka payloadu
+TRACE_RECORD = struct.Struct(">cIdI")
+# Druhy záznamů: začátek sezení (payload "pid=<pid>"), odeslaná a přijatá zpráva
+TRACE_SESSION = b"S"
+TRACE_SENT = b">"
+TRACE_RECEIVED = b"<"
+# Nejdelší doba, po kterou může záznam zůstat jen v bufferu souboru
+TRACE_FLUSH_INTERVAL = 1.0
+
+# Aktuálně zapnuté statistiky (IOStats), None = vypnuto a nic se neměří
+_stats = None
+# Aktuálně zapnutý záznam zpráv (TraceRecorder), None = vypnuto
+_trace = None
+
+# Seznam schopností z textového pole zprávy (např. "ZLIB")
+def parse_capabilities(field: str) -> set:
+    return {cap for cap in field.split(",") if cap}
+
+# Textové pole zprávy se seznamem schopností
+def format_capabilities(caps) -> str:
+    return ",".join(sorted(caps))
+
+# Typ zprávy, tj. druhé pole za "LK" (např. "PING"); zprávy jiného formátu mají typ "?"
+def message_type(payload) -> str:
+    parts = bytes(payload[:48]).split(b":", 2)
+    if len(parts) >= 2 and parts[0] == b"LK":
+        return parts[1].decode(errors="replace")
+    return "?"
+
+# Statistiky vstupu a výstupu podle typu zprávy
+# Pro každý typ počítá odeslané a přijaté zprávy a bajty payloadu, histogram doby příjmu zprávy
+# (od prvního přijatého bajtu hlavičky po poslední bajt payloadu) a histogram počtu volání recv na zprávu.
+# Zapisuje se z více vláken (přijímací vlákno, Tk), proto zámek.
+class IOStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.types = {}
+        self.started = time.time()
+        self.last_sent = None
+        self.last_received = None
+
+    def _entry(self, kind):
+        entry = self.types.get(kind)
+        if entry is None:
+            entry = self.types[kind] = {
+                "frames_out": 0, "bytes_out": 0, "frames_in": 0, "bytes_in": 0,
+                "latency_total": 0.0, "latency_max": 0.0,
+                "latency_hist": [0] * (len(LATENCY_BUCKETS) + 1),
+                "recv_calls_hist": {},
+            }
+        return entry
+
+    # Záznam odeslané zprávy
+    def record_sent(self, payload):
+        with self._lock:
+            entry = self._entry(message_type(payload))
+            entry["frames_out"] += 1
+            entry["bytes_out"] += len(payload)
+            self.last_sent = time.time()
+
+    # Záznam přijaté zprávy, doby jejího příjmu a počtu volání recv, která na ni byla potřeba
+    def record_received(self, payload, latency: float, recv_calls: int):
+        with self._lock:
+            entry = self._entry(message_type(payload))
+            entry["frames_in"] += 1
+            entry["bytes_in"] += len(payload)
+            entry["latency_total"] += latency
+            if latency > entry["latency_max"]:
+                entry["latency_max"] = latency
+            entry["latency_hist"][bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            hist = entry["recv_calls_hist"]
+            hist[recv_calls] = hist.get(recv_calls, 0) + 1
+            self.last_received = time.time()
+
+    # Kopie aktuálního stavu (slovníky bez zámku, vhodné pro JSON)
+    def snapshot(self) -> dict:
+        with self._lock:
+            types = {}
+            for kind, entry in self.types.items():
+                entry = dict(entry, latency_hist=list(entry["latency_hist"]), recv_calls_hist=dict(entry["recv_calls_hist"]))
+                entry["latency_avg"] = entry["latency_total"] / entry["frames_in"] if entry["frames_in"] else 0.0
+                types[kind] = entry
+            return {
+                "started": self.started,
+                "time": time.time(),
+                "last_sent": self.last_sent,
+                "last_received": self.last_received,
+                "latency_buckets": list(LATENCY_BUCKETS),
+                "types": types,
+            }
+
+    # Výpis stavu v čitelné podobě (výchozí je stderr)
+    def dump(self, file=None):
+        file = file or sys.stderr
+        snap = self.snapshot()
+        now = snap["time"]
+        def ago(t):
+            return f"před {now - t:.1f} s" if t else "nikdy"
+        print(f"[STATS] {now - snap['started']:.1f} s, poslední odeslání {ago(snap['last_sent'])},"
+              f" poslední příjem {ago(snap['last_received'])}", file=file)
+        for kind, e in sorted(snap["types"].items()):
+            calls = " ".join(f"{k}x:{v}" for k, v in sorted(e["recv_calls_hist"].items()))
+            print(f"[STATS] {kind:<24} out {e['frames_out']:>6} ({e['bytes_out']} B)"
+                  f" in {e['frames_in']:>6} ({e['bytes_in']} B)"
+                  f" příjem avg {e['latency_avg'] * 1000:.3f} ms max {e['latency_max'] * 1000:.3f} ms"
+                  f" hist {e['latency_hist']} recv {calls}", file=file)
+
+# Zapnutí statistik pro všechny sockety v procesu; vrací objekt IOStats
+def enable_stats() -> IOStats:
+    global _stats
+    if _stats is None:
+        _stats = IOStats()
+    return _stats
+
+# Vypnutí statistik; vrací dosud nasbírané statistiky (nebo None)
+def disable_stats():
+    global _stats
+    stats, _stats = _stats, None
+    return stats
+
+# Aktuální statistiky, None pokud jsou vypnuté
+def get_stats():
+    return _stats
+
+# Záznam všech odeslaných a přijatých zpráv do souboru pro přehrání proti serveru (bench_replay.py)
+# Soubor se jen připisuje: každé zapnutí začne záznamem sezení, za ním jdou zprávy v pořadí, v jakém prošly
+# knihovnou, s časem time.monotonic() (na jednom stroji srovnatelný i mezi procesy) a číslem spojení.
+# Spojení se rozlišují podle socketu (u AsyncSocketLib podle FramedConnection). Ukládá se payload před
+# kompresí, takže přehrání si rámování volí samo. Proudové funkce (recv_message_stream,
+# send_message_stream) se nezaznamenávají. Zapisuje se z více vláken, proto zámek.
+class TraceRecorder:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connections = weakref.WeakKeyDictionary()
+        self._next_connection = 0
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(TRACE_MAGIC)
+        self._flushed = time.monotonic()
+        self._write(TRACE_SESSION, 0, self._flushed, f"pid={os.getpid()}".encode())
+        self.records = 0
+
+    # Záznam zprávy; key je objekt spojení (socket), direction TRACE_SENT nebo TRACE_RECEIVED
+    def record(self, direction, key, payload):
+        now = time.monotonic()
+        with self._lock:
+            if self._file is None:
+                return
+            conn = self._connections.get(key)
+            if conn is None:
+                conn = self._connections[key] = self._next_connection
+                self._next_connection += 1
+            self._write(direction, conn, now, payload)
+            self.records += 1
+            if now - self._flushed > TRACE_FLUSH_INTERVAL:
+                self._file.flush()
+                self._flushed = now
+
+    def _write(self, kind, conn, t, payload):
+        self._file.write(TRACE_RECORD.pack(kind, conn, t, len(payload)))
+        self._file.write(payload)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+# Čtení záznamu: generátor (sezení, druh, spojení, čas, payload) pro všechny zprávy v souboru
+# Sezení se čísluje od 0 v pořadí v souboru; neúplný poslední záznam (pád procesu) se přeskočí.
+def read_trace(path):
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"Not a trace file: {path}")
+        session = -1
+        while True:
+            head = f.read(TRACE_RECORD.size)
+            if len(head) < TRACE_RECORD.size:
+                return
+            kind, conn, t, length = TRACE_RECORD.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            if kind == TRACE_SESSION:
+                session += 1
+                continue
+            yield session, kind, conn, t, payload
+
+# Zapnutí záznamu zpráv do souboru path (připisuje se na konec); vrací TraceRecorder
+def enable_trace(path) -> TraceRecorder:
+    global _trace
+    if _trace is None:
+        _trace = TraceRecorder(path)
+        atexit.register(_trace.close)
+    return _trace
+
+# Vypnutí záznamu a uzavření souboru; vrací TraceRecorder (nebo None)
+def disable_trace():
+    global _trace
+    trace, _trace = _trace, None
+    if trace is not None:
+        trace.close()
+    return trace
+
+# Aktuální záznam, None pokud je vypnutý
+def get_trace():
+    return _trace
+
+# Obal socketu pro měření příjmu jedné zprávy: počítá volání recv a čas prvního přijatého bajtu
+class _TracedSocket:
+    __slots__ = ("sock", "calls", "first")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.calls = 0
+        self.first = None
+
+    def _count(self):
+        self.calls += 1
+        if self.first is None:
+            self.first = time.perf_counter()
+
+    def recv(self, n, flags=0):
+        data = self.sock.recv(n, flags)
+        self._count()
+        return data
+
+    def recv_into(self, buf, n=0, flags=0):
+        count = self.sock.recv_into(buf, n, flags)
+        self._count()
+        return count
+
+# Hlavička zprávy s payloadem délky length
+def encode_header(length: int, compressed: bool = False, binary: bool = False) -> bytes:
+    if length > MAX_SIZE:
+        raise ValueError("Message too large")
+    if binary:
+        return (BINARY_COMPRESSED_PREFIX if compressed else BINARY_PREFIX) + BINARY_LENGTH.pack(length)
+    return f"{COMPRESSED_PREFIX if compressed else PREFIX}{length}".encode()
+
+# Hlavička a payload zprávy připravené k odeslání
+# Při compress=True a dost velkém payloadu se payload zkomprimuje, pokud se tím zmenší.
+# binary=True volí binární hlavičku s pevnou délkou.
+def encode_frame(payload, compress: bool = False, binary: bool = False):
+    length = len(payload)
+    if length > MAX_SIZE:
+        raise ValueError("Message too large")
+
+    if compress and length > COMPRESS_THRESHOLD:
+        compressed = zlib.compress(payload, COMPRESS_LEVEL)
+        if len(compressed) < length:
+            return encode_header(len(compressed), True, binary), compressed
+    return encode_header(length, False, binary), payload
+
+# Rozbalení komprimovaného payloadu; výstup se rozbaluje nejvýše do MAX_SIZE, nic většího se nealokuje
+def _decompress(data) -> bytes:
+    decompressor = zlib.decompressobj()
+    try:
+        payload = decompressor.decompress(data, MAX_SIZE)
+    except zlib.error as e:
+        raise ValueError(f"Invalid compressed message: {e}")
+    if decompressor.unconsumed_tail:
+        raise ValueError("Message too large")
+    if not decompressor.eof:
+        raise ValueError("Invalid compressed message")
+    return payload
 
 # Odeslání zprávy přes socket
 # Knihovna se automaticky postará o přidání prefixu a délky zprávy.
-def sendMessage(sock, payload: bytes):
+# Velký payload se s hlavičkou neslučuje (kopie), obojí se odešle jedním voláním sendmsg.
+# U malých zpráv je kopie levnější než příprava sendmsg.
+# compress=True (binary=True) smí volající použít jen tehdy, když protistrana při přihlášení potvrdila CAP_ZLIB (CAP_BINARY).
+def sendMessage(sock, payload: bytes, compress: bool = False, binary: bool = False):
+    if _stats is not None:
+        _stats.record_sent(payload)
+    if _trace is not None:
+        _trace.record(TRACE_SENT, sock, payload)
+    header, payload = encode_frame(payload, compress, binary)
     length = len(payload)
+    if length <= COPY_THRESHOLD or not hasattr(sock, "sendmsg"):
+        sock.sendall(header + payload)
+    else:
+        sendmsg_all(sock, [header, payload])
+
+# Odeslání více zpráv najednou
+# Všechny hlavičky a payloady se předají jednomu volání sendmsg (scatter-gather), bez kopírování do jednoho bufferu.
+# Pokud jádro převezme jen část dat, pokračuje se od místa, kde odesílání skončilo.
+def send_messages(sock, payloads, compress: bool = False, binary: bool = False):
+    parts = []
+    stats = _stats
+    trace = _trace
+    for payload in payloads:
+        if stats is not None:
+            stats.record_sent(payload)
+        if trace is not None:
+            trace.record(TRACE_SENT, sock, payload)
+        header, payload = encode_frame(payload, compress, binary)
+        parts.append(header)
+        if payload:
+            parts.append(payload)
+
+    if not hasattr(sock, "sendmsg"):
+        # Např. Windows sendmsg nemá, tam zbývá spojení do jednoho bufferu
+        sock.sendall(b"".join(parts))
+        return
+    sendmsg_all(sock, parts)
+
+# Odeslání všech bufferů přes sendmsg včetně dokončení částečných zápisů
+def sendmsg_all(sock, parts):
+    views = [memoryview(p) for p in parts]
+    i = 0
+    while i < len(views):
+        sent = sock.sendmsg(views[i:i + IOV_MAX])
+        # Přeskočí celé odeslané buffery a zkrátí ten, ve kterém se odesílání zastavilo
+        while sent:
+            n = len(views[i])
+            if sent >= n:
+                sent -= n
+                i += 1
+            else:
+                views[i] = views[i][sent:]
+                sent = 0
+
+# Naplnění celého předaného bufferu (memoryview) daty ze socketu, bez mezikopií
+def recv_into_exact(sock, view: memoryview):
+    received = 0
+    n = len(view)
+    while received < n:
+        count = sock.recv_into(view[received:], n - received)
+        if not count:
+            raise ConnectionError("Disconnected while reading")
+        received += count
+
+# Přijmutí přesného počtu bajtů ze socketu
+# Čte přímo do předem alokovaného bufferu. Při owned=False vrací memoryview nad tímto bufferem (bez kopie),
+# jinak vlastní kopii jako bytes.
+def recv_exact(sock, n: int, owned: bool = True):
+    data = bytearray(n)
+    recv_into_exact(sock, memoryview(data))
+    return bytes(data) if owned else memoryview(data)
+
+# Rozbor hlavičky "ML<délka>" (nebo "MZ<délka>", "MB"/"MC" + 4 bajty délky) v buf od pozice start
+# Vrací (začátek payloadu, délka, komprimováno), nebo None, pokud hlavička ještě není celá.
+# Textová délka končí prvním nečíselným znakem.
+def _scan_header(buf, start: int = 0):
+    end = len(buf)
+    if end - start < 2:
+        return None
+
+    kind = buf[start + 1]
+    if buf[start] != 0x4D or kind not in b"LZBC": # "ML", "MZ", "MB", "MC"
+        prefix = bytes(buf[start:start + 2]).decode(errors="replace")
+        raise ValueError(f"Invalid message prefix: {prefix}")
+    compressed = kind == 0x5A or kind == 0x43
+
+    # Binární hlavička má pevnou délku
+    if kind == 0x42 or kind == 0x43:
+        if end - start < BINARY_HEADER_SIZE:
+            return None
+        length = BINARY_LENGTH.unpack_from(buf, start + 2)[0]
+        if length > MAX_SIZE:
+            raise ValueError("Message too large")
+        return start + BINARY_HEADER_SIZE, length, compressed
+
+    i = start + 2
+    while i < end and 0x30 <= buf[i] <= 0x39:
+        i += 1
+    if i - start - 2 > MAX_LENGTH_DIGITS:
+        raise ValueError("Message too large")
+    if i == end:
+        return None
+    if i == start + 2:
+        raise ValueError("Length missing after ML")
+
+    length = int(buf[start + 2:i])
     if length > MAX_SIZE:
         raise ValueError("Message too large")
+    return i, length, compressed
 
-    header = f"{PREFIX}{length}".encode()
-    sock.sendall(header + payload)
+# Parser zpráv bez vlastního I/O (sans-IO)
+# Přijímá libovolně rozsekané kusy dat přes feed() a vrací kompletní payloady. Stav rozečteného prefixu,
+# délky i payloadu si drží mezi voláními, takže ho může používat blokující čtení, asyncio i smyčka nad selectors.
+# Délka se kontroluje proti MAX_SIZE dřív, než se z payloadu cokoli uloží.
+# Zprávy delší než large_threshold se skládají rovnou do bufferu o velikosti zprávy; ten lze přes
+# frame_buffer()/frame_updated() plnit přímo z recv_into bez mezikopie.
+# Rozumí textovým i binárním hlavičkám, komprimované zprávy ("MZ", "MC") vrací už rozbalené.
+class FrameParser:
+    def __init__(self, large_threshold: int = RECV_BUFSIZE):
+        self.large_threshold = large_threshold
+        self._buffer = bytearray()
+        self._pos = 0 # Začátek dosud nezpracovaných dat v bufferu
+        self._frame = None # Rozpracovaná velká zpráva
+        self._frame_view = None
+        self._filled = 0
+        self._compressed = False
 
-# Přijmutí přesného počtu bajtů ze socketu
-def recv_exact(sock, n: int) -> bytes:
-    data = bytearray()
-    while len(data) < n:
-        chunk = sock.recv(n - len(data))
-        if not chunk:
-            raise ConnectionError("Disconnected while reading")
-        data.extend(chunk)
-    return bytes(data)
+    # Jsou v parseru nezpracovaná data?
+    def pending(self) -> bool:
+        return self._frame is not None or self._pos < len(self._buffer)
+
+    # Kolik bajtů lze ze socketu přečíst, aby se nenačetlo nic z následující zprávy
+    def wanted(self) -> int:
+        if self._frame is not None:
+            return len(self._frame) - self._filled
+        buffered = len(self._buffer) - self._pos
+        if buffered < 2:
+            return 2 - buffered
+        header = self._parse_header()
+        if header is None:
+            if self._buffer[self._pos + 1] in b"BC":
+                return BINARY_HEADER_SIZE - buffered
+            return 1 # Ještě se čtou číslice délky
+        i, length, _ = header
+        return length - (len(self._buffer) - i)
+
+    # Volné místo rozpracované velké zprávy pro recv_into, nebo None
+    def frame_buffer(self):
+        if self._frame is None:
+            return None
+        return self._frame_view[self._filled:]
+
+    # Do frame_buffer() bylo zapsáno n bajtů; vrací seznam dokončených zpráv (nejvýše jednu)
+    def frame_updated(self, n: int) -> list:
+        self._filled += n
+        if self._filled < len(self._frame):
+            return []
+        return [self._finish_frame()]
+
+    # Předání dat parseru; vrací seznam kompletních zpráv (bytes, velké zprávy jako bytearray)
+    def feed(self, data) -> list:
+        frames = []
+        data = memoryview(data)
+        if self._frame is not None:
+            n = min(len(data), len(self._frame) - self._filled)
+            self._frame_view[self._filled:self._filled + n] = data[:n]
+            data = data[n:]
+            frames.extend(self.frame_updated(n))
+        if data:
+            self._buffer += data
+            self._drain_buffer(frames)
+        return frames
+
+    # Přečte hlavičku zprávy z bufferu; vrací (začátek payloadu, délka), nebo None, pokud hlavička ještě není celá
+    def _parse_header(self):
+        return _scan_header(self._buffer, self._pos)
+
+    # Vybere z bufferu všechny kompletní zprávy, případně začne skládat velkou zprávu
+    def _drain_buffer(self, frames):
+        buf = self._buffer
+        while True:
+            header = self._parse_header()
+            if header is None:
+                break
+            i, length, compressed = header
+            buffered = len(buf) - i
+            if buffered >= length:
+                frame = bytes(buf[i:i + length])
+                frames.append(_decompress(frame) if compressed else frame)
+                self._pos = i + length
+                continue
+            if length > self.large_threshold:
+                self._compressed = compressed
+                self._frame = bytearray(length)
+                self._frame_view = memoryview(self._frame)
+                self._frame_view[:buffered] = buf[i:]
+                self._filled = buffered
+                self._pos = len(buf)
+            break
+        # Zpracovaná data se zahazují jednou za feed(), ne po každé zprávě
+        if self._pos:
+            del buf[:self._pos]
+            self._pos = 0
+
+    def _finish_frame(self):
+        frame = self._frame
+        self._frame_view.release()
+        self._frame = None
+        self._frame_view = None
+        self._filled = 0
+        if self._compressed:
+            self._compressed = False
+            return _decompress(frame)
+        return frame
 
 # Přijmutí zprávy ze socketu
-# První načte prefix a poté délku, dokud nedorazí na první nečíselný znak, který je začátkem payloadu. Poté načítá payload.
-def recvMessage(sock):
-    prefix = recv_exact(sock, 2).decode()
-    if prefix != "ML":
-        raise ValueError(f"Invalid message prefix: {prefix}")
+# Hlavička se čte bez MSG_PEEK (na AF_UNIX socketech jádro při nahlížení prochází frontu po jednotlivých
+# zprávách a je to dražší než několik obyčejných recv), viz _recv_header. Nenačte se tak nic z následující zprávy.
+# Malou zprávu obvykle přinese celou už čtení hlavičky, jinak se malý payload dočte obyčejným recv(),
+# větší rovnou do bufferu o velikosti zprávy; při owned=False se vrací memoryview nad ním (bez kopie).
+# Při binary=True (binární režim vyjednaný při přihlášení) se hlavička pevné délky přečte rovnou jedním recv_into.
+def recvMessage(sock, owned: bool = True, binary: bool = False):
+    stats = _stats
+    if stats is None:
+        payload = _recv_message(sock, owned, binary)
+    else:
+        traced = _TracedSocket(sock)
+        payload = _recv_message(traced, owned, binary)
+        stats.record_received(payload, time.perf_counter() - traced.first, traced.calls)
+    if _trace is not None:
+        _trace.record(TRACE_RECEIVED, sock, payload)
+    return payload
+
+def _recv_message(sock, owned: bool, binary: bool):
+    length, compressed, head = _recv_header(sock, binary)
+    remaining = length - len(head)
+    if length <= RECV_COPY_THRESHOLD:
+        payload = head + sock.recv(remaining) if remaining else head
+        if len(payload) < length:
+            payload += recv_exact(sock, length - len(payload))
+        if compressed:
+            payload = _decompress(payload)
+        return payload if owned else memoryview(payload)
+
+    payload = bytearray(length)
+    view = memoryview(payload)
+    if head:
+        view[:len(head)] = head
+    recv_into_exact(sock, view[len(head):])
+    if compressed:
+        payload = _decompress(payload)
+        return payload if owned else memoryview(payload)
+    return bytes(payload) if owned else memoryview(payload)
+
+# Přečtení hlavičky zprávy ze socketu bez čtení za konec zprávy
+# Vrací (délka, komprimováno, začátek payloadu). Prefix s první číslicí délky přijde jedním recv (každá
+# zpráva má aspoň tři bajty). Dosud přečtené číslice dávají dolní mez délky a za nimi je ve zprávě ještě
+# aspoň tolik bajtů (další číslice nebo payload), takže se dál čte po tolika bajtech najednou; co je za
+# poslední číslicí, je už začátek payloadu. Délka se zapisuje bez úvodních nul, takže 0 jako první číslice
+# znamená prázdnou zprávu a dál se nečte (následující bajt už patří další zprávě).
+def _recv_header(sock, binary: bool = False):
+    if binary:
+        raw = recv_exact(sock, BINARY_HEADER_SIZE)
+        if raw[:2] != BINARY_PREFIX and raw[:2] != BINARY_COMPRESSED_PREFIX:
+            raise ValueError(f"Invalid message prefix: {raw[:2].decode(errors='replace')}")
+        _, length, compressed = _scan_header(raw)
+        return length, compressed, b""
 
-    length_str = ""
+    raw = sock.recv(3)
+    if len(raw) < 3:
+        if not raw:
+            raise ConnectionError("Disconnected while reading")
+        raw += recv_exact(sock, 3 - len(raw))
+    kind = raw[1]
+    if raw[0] != 0x4D or kind not in b"LZBC": # "ML", "MZ", "MB", "MC"
+        raise ValueError(f"Invalid message prefix: {raw[:2].decode(errors='replace')}")
+    if kind == 0x42 or kind == 0x43:
+        # Binární hlavička, i když binární režim vyjednaný není
+        _, length, compressed = _scan_header(raw + recv_exact(sock, BINARY_HEADER_SIZE - 3))
+        return length, compressed, b""
 
+    compressed = kind == 0x5A
+    length = raw[2] - 0x30
+    if not 0 <= length <= 9:
+        raise ValueError("Length missing after ML")
+    if not length:
+        return 0, compressed, b""
+    digits = 1
     while True:
-        ch = sock.recv(1)
-        if not ch:
+        chunk = sock.recv(min(length, RECV_COPY_THRESHOLD))
+        if not chunk:
             raise ConnectionError("Disconnected while reading length")
+        i = 0
+        n = len(chunk)
+        while i < n and 0x30 <= chunk[i] <= 0x39:
+            length = length * 10 + chunk[i] - 0x30
+            i += 1
+        digits += i
+        if digits > MAX_LENGTH_DIGITS:
+            raise ValueError("Message too large")
+        if i < n:
+            break
+    if length > MAX_SIZE:
+        raise ValueError("Message too large")
+    return length, compressed, chunk[i:]
 
-        ch = ch.decode()
+# Proudové přijmutí zprávy
+# Vrací (délka, kusy): délku z hlavičky a generátor kusů payloadu o velikosti nejvýše chunk_size.
+# Paměť na spojení je tak omezená velikostí kusu, ne velikostí zprávy (velký ROOM_LIST, snímek hry).
+# Komprimovaná zpráva se rozbaluje průběžně; délka je pak délka komprimovaných dat, kusy jsou už rozbalené.
+# Při owned=False jsou kusy memoryview nad jedním bufferem, platné jen do dalšího kusu.
+# Generátor je potřeba dočíst (nebo zavřít přes close(), zbytek zprávy se pak zahodí), než se ze socketu čte další zpráva.
+def recv_message_stream(sock, chunk_size: int = STREAM_CHUNK_SIZE, owned: bool = True, binary: bool = False):
+    length, compressed, head = _recv_header(sock, binary)
+    chunks = _recv_chunks(sock, length - len(head), head, chunk_size, owned and not compressed)
+    if compressed:
+        chunks = _decompress_chunks(chunks, chunk_size)
+    return length, chunks
 
-        if ch.isdigit():
-            length_str += ch
+# Kusy payloadu přímo ze socketu, čtené přes recv_into do jednoho bufferu
+def _recv_chunks(sock, remaining: int, head: bytes, chunk_size: int, owned: bool):
+    view = memoryview(bytearray(min(chunk_size, remaining)))
+    try:
+        for start in range(0, len(head), chunk_size):
+            yield head[start:start + chunk_size]
+        while remaining:
+            n = sock.recv_into(view, min(len(view), remaining))
+            if not n:
+                raise ConnectionError("Disconnected while reading")
+            remaining -= n
+            yield bytes(view[:n]) if owned else view[:n]
+    except GeneratorExit:
+        # Nedočtený zbytek zprávy se zahodí, aby další čtení začalo na začátku následující zprávy
+        while remaining:
+            n = sock.recv_into(view, min(len(view), remaining))
+            if not n:
+                break
+            remaining -= n
+        raise
+
+# Průběžné rozbalování komprimovaných kusů; žádný výstupní kus není větší než chunk_size
+def _decompress_chunks(chunks, chunk_size: int):
+    decompressor = zlib.decompressobj()
+    total = 0
+    try:
+        for chunk in chunks:
+            data = chunk
+            while data:
+                try:
+                    out = decompressor.decompress(data, chunk_size)
+                except zlib.error as e:
+                    raise ValueError(f"Invalid compressed message: {e}")
+                total += len(out)
+                if total > MAX_SIZE:
+                    raise ValueError("Message too large")
+                if out:
+                    yield out
+                data = decompressor.unconsumed_tail
+        if not decompressor.eof:
+            raise ValueError("Invalid compressed message")
+    finally:
+        chunks.close()
+
+# Proudové odeslání zprávy o předem známé délce
+# Kusy (bytes, bytearray, memoryview) se odesílají tak, jak je dává iterátor, celý payload tedy nemusí být v paměti.
+# Hlavička jde spolu s prvním kusem. Součet délek kusů musí odpovídat length, jinak ValueError;
+# komprese se u proudového odesílání nepoužívá, délka komprimovaných dat předem není známá.
+def send_message_stream(sock, length: int, chunks, binary: bool = False):
+    header = encode_header(length, False, binary)
+    sent = 0
+    for chunk in chunks:
+        n = len(chunk)
+        if not n:
+            continue
+        if sent + n > length:
+            raise ValueError("Stream longer than declared length")
+        if header is not None:
+            if hasattr(sock, "sendmsg"):
+                sendmsg_all(sock, [header, chunk])
+            else:
+                sock.sendall(header + bytes(chunk))
+            header = None
         else:
-            # první ne-číslo patří payloadu
-            first_payload_byte = ch.encode()
-            break
+            sock.sendall(chunk)
+        sent += n
+    if header is not None:
+        sock.sendall(header)
+    if sent != length:
+        raise ValueError("Stream shorter than declared length")
 
-    if not length_str:
-        raise ValueError("Length missing after ML")
+# Čtečka zpráv navázaná na jeden socket.
+# Drží si vlastní přijímací buffer, do kterého načte najednou vše, co má jádro připravené,
+# a z něj pak vrací libovolný počet kompletních zpráv. Formát na drátě je stejný jako u recvMessage.
+# Funguje i nad neblokujícím socketem (read_available), např. ve smyčce nad selectors.
+# Pozor: na jednom socketu se nesmí míchat s recvMessage, data načtená do bufferu by se ztratila.
+class FrameReader:
+    def __init__(self, sock, bufsize: int = RECV_BUFSIZE):
+        self.sock = sock
+        self.bufsize = bufsize
+        self.parser = FrameParser(large_threshold=bufsize)
+        self._ready = deque() # Kompletní zprávy, které si zatím nikdo nevyzvedl
+        self._recv_buffer = bytearray(bufsize)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._trace_start = None # Čas čtení, které přineslo první bajt rozečtené zprávy (jen se statistikami)
+        self._trace_calls = 0
 
-    length = int(length_str)
-    if length > MAX_SIZE:
-        raise ValueError("Message too large")
+    # Jsou v bufferu nezpracovaná data? (užitečné pro select, kde socket už nemusí být čitelný)
+    def pending(self) -> bool:
+        return bool(self._ready) or self.parser.pending()
 
-    payload = first_payload_byte
-    if length > 1:
-        payload += recv_exact(sock, length - 1)
+    # Jedno čtení ze socketu; velká zpráva se čte rovnou do svého bufferu
+    def _fill(self):
+        view = self.parser.frame_buffer()
+        if view is not None:
+            n = self.sock.recv_into(view)
+            if not n:
+                raise ConnectionError("Disconnected while reading")
+            frames = self.parser.frame_updated(n)
+        else:
+            n = self.sock.recv_into(self._recv_view)
+            if not n:
+                raise ConnectionError("Disconnected while reading")
+            frames = self.parser.feed(self._recv_view[:n])
+        self._ready.extend(frames)
+        if _stats is not None:
+            self._record(frames)
+        if _trace is not None:
+            for frame in frames:
+                _trace.record(TRACE_RECEIVED, self.sock, frame)
 
-    return payload
+    # Statistiky příjmu: zpráva se počítá od čtení, které přineslo její první bajt
+    # Zprávy, které dorazily celé v jednom čtení za jinou zprávou, mají dobu příjmu 0 a jedno volání recv.
+    def _record(self, frames):
+        now = time.perf_counter()
+        if self._trace_start is None:
+            self._trace_start = now
+            self._trace_calls = 0
+        self._trace_calls += 1
+        for frame in frames:
+            _stats.record_received(frame, now - self._trace_start, self._trace_calls)
+            self._trace_start = now
+            self._trace_calls = 1
+        if not self.parser.pending():
+            self._trace_start = None
+
+    # Přijmutí jedné zprávy (blokuje, dokud celá nedorazí)
+    # Při owned=False vrací memoryview; u velkých zpráv je to pohled přímo na přijatá data bez kopie.
+    def read_frame(self, owned: bool = True):
+        while not self._ready:
+            self._fill()
+        payload = self._ready.popleft()
+        if owned:
+            return payload if type(payload) is bytes else bytes(payload)
+        return memoryview(payload)
+
+    # Přijmutí všech zpráv, které jsou už celé v bufferu; pokud žádná není, čeká alespoň na jednu
+    # Při owned=False se velké zprávy vrací jako bytearray, do kterého byly přijaty (bez kopie do bytes);
+    # buffer patří volajícímu, čtečka ho už nepoužije.
+    def read_frames(self, owned: bool = True) -> list:
+        while not self._ready:
+            self._fill()
+        return self._take_ready(owned)
+
+    # Po select/selectors, kdy je socket čitelný: jedno čtení (neblokuje ani na blokujícím socketu)
+    # a všechny zprávy, které jsou už celé; může vrátit i prázdný seznam. S fill=False se jen vyzvednou
+    # zprávy, které už v bufferu jsou. Při odpojení protistrany vyhodí ConnectionError. owned jako u read_frames.
+    def read_ready(self, fill: bool = True, owned: bool = True) -> list:
+        if fill:
+            self._fill()
+        return self._take_ready(owned)
+
+    # Pro neblokující socket: přečte vše, co je k dispozici, a vrátí hotové zprávy (i prázdný seznam).
+    # Při odpojení protistrany vyhodí ConnectionError. owned jako u read_frames.
+    def read_available(self, owned: bool = True) -> list:
+        try:
+            while True:
+                self._fill()
+        except (BlockingIOError, InterruptedError):
+            pass
+        return self._take_ready(owned)
+
+    def _take_ready(self, owned: bool) -> list:
+        if owned:
+            frames = [bytes(f) if type(f) is not bytes else f for f in self._ready]
+        else:
+            frames = list(self._ready)
+        self._ready.clear()
+        return frames
+
+
+# Odesílání zpráv jedním vláknem na spojení
+# send() zprávu jen zakóduje a zařadí do fronty, takže volající (Tk callback, přijímací vlákno) nikdy nečeká
+# na socket a zprávy z různých vláken se na drátě nepromíchají. Vlákno odesílá všechny zprávy,
+# které jsou ve frontě připravené, najednou (jedno sendmsg) a měří dobu od zařazení do odeslání.
+# Po chybě socketu vlákno skončí, chybu uloží do error a další send() vyhodí ConnectionError.
+class FrameWriter:
+    def __init__(self, sock, max_batch: int = IOV_MAX // 2):
+        self.sock = sock
+        self.max_batch = max_batch
+        self.error = None
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = False # Vlákno právě odesílá dávku
+        self._frames = 0
+        self._batches = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._thread = threading.Thread(target=self._run, name="FrameWriter", daemon=True)
+        self._thread.start()
+
+    # Zařazení zprávy k odeslání; compress a binary jako u sendMessage
+    def send(self, payload: bytes, compress: bool = False, binary: bool = False):
+        if _stats is not None:
+            _stats.record_sent(payload)
+        if _trace is not None:
+            _trace.record(TRACE_SENT, self.sock, payload)
+        header, payload = encode_frame(payload, compress, binary)
+        with self._cond:
+            if self.error is not None:
+                raise ConnectionError(f"Writer failed: {self.error}")
+            if self._closed:
+                raise ConnectionError("Writer closed")
+            self._queue.append((header, payload, time.perf_counter()))
+            self._cond.notify()
+
+    # Počet zpráv čekajících na odeslání
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue) + self._busy
+
+    # Počká, až se odešle vše, co je ve frontě; vrací False při vypršení timeoutu nebo chybě socketu
+    def flush(self, timeout: float = None) -> bool:
+        with self._cond:
+            done = self._cond.wait_for(lambda: self.error is not None or (not self._queue and not self._busy), timeout)
+            return done and self.error is None
+
+    # Ukončení vlákna; při flush=True se předtím odešle zbytek fronty
+    def close(self, flush: bool = True, timeout: float = 1.0):
+        if flush:
+            self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    # Doba od zařazení zprávy do jejího odeslání
+    def latency(self) -> dict:
+        with self._cond:
+            return {
+                "frames": self._frames,
+                "batches": self._batches,
+                "avg": self._latency_total / self._frames if self._frames else 0.0,
+                "max": self._latency_max,
+                "queued": len(self._queue),
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch))]
+                self._busy = True
+
+            try:
+                parts = []
+                for header, payload, _ in batch:
+                    parts.append(header)
+                    if payload:
+                        parts.append(payload)
+                if (len(parts) <= 2 and len(parts[-1]) <= COPY_THRESHOLD) or not hasattr(self.sock, "sendmsg"):
+                    self.sock.sendall(b"".join(parts))
+                else:
+                    sendmsg_all(self.sock, parts)
+            except OSError as e:
+                with self._cond:
+                    self.error = e
+                    self._busy = False
+                    self._queue.clear()
+                    self._cond.notify_all()
+                return
+
+            now = time.perf_counter()
+            with self._cond:
+                for _, _, queued in batch:
+                    latency = now - queued
+                    self._latency_total += latency
+                    if latency > self._latency_max:
+                        self._latency_max = latency
+                self._frames += len(batch)
+                self._batches += 1
+                self._busy = False
+                self._cond.notify_all()
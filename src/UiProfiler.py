@@ -0,0 +1,167 @@
+# UiProfiler.py
+# Měření odezvy Tk klienta: jak pozdě Tk spouští callbacky naplánované přes after(0) ze síťové smyčky,
+# jak dlouho trvá drawBoard, showInputPanel, showEvaluationPanel a _display_rooms a za jak dlouho
+# od příchodu dávky zpráv (NetworkLoop předá dávku přes post) je změna vidět (po překreslení Tk,
+# tj. v after_idle za překreslením UiScheduleru).
+# Zapíná se enable_ui_profile(soubor) (u client2.py --uiprofile=soubor); LogikApp se pak při vytvoření
+# nechá obalit (instrument). Bez zapnutí se nic neobaluje a měření nestojí nic.
+# Každý vzorek jde řádkem do souboru (čas od startu, metrika, ms), souhrn se vypíše při ukončení.
+# Přehled (F12 ho skryje a zase zobrazí) ukazuje pro každou metriku počet, průměr, p95 a maximum.
+
+import atexit
+import functools
+import sys
+import time
+from collections import deque
+
+# Kolik posledních vzorků metriky se drží pro percentil v přehledu
+RECENT_SAMPLES = 1000
+# Perioda obnovy přehledu
+OVERLAY_INTERVAL_MS = 500
+# Metody LogikApp, jejichž doba se měří
+DRAW_METHODS = ("drawBoard", "showInputPanel", "showEvaluationPanel", "_display_rooms")
+AFTER_LATENCY = "after(0) zpoždění"
+ARRIVAL_TO_VISIBLE = "příchod → vidět"
+
+# Jedna metrika: počet, součet, maximum a poslední vzorky
+class _Metric:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def p95(self):
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+
+class UiProfiler:
+    def __init__(self, path=None):
+        self.metrics = {}
+        self.start = time.perf_counter()
+        self.file = open(path, "w", encoding="utf-8") if path else None
+        if self.file is not None:
+            self.file.write("# t_s\tmetrika\tms\n")
+        self.master = None
+        self.overlay = None
+        self.overlay_visible = False
+        self._arrival = None # Příchod nejstarší dávky, jejíž změna ještě není vykreslená
+
+    # Zápis vzorku (doba v sekundách)
+    def record(self, name, seconds):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = _Metric()
+        metric.add(seconds)
+        if self.file is not None:
+            self.file.write(f"{time.perf_counter() - self.start:.6f}\t{name}\t{seconds * 1000:.3f}\n")
+
+    # Obalení LogikApp: volat v jeho __init__ před registrací obsluh (ty si berou metody při registraci)
+    def instrument(self, app):
+        self.master = app.master
+        for name in DRAW_METHODS:
+            setattr(app, name, self._timed(name, getattr(app, name)))
+        app.client.post = self._timed_post(app.client.post, app.ui)
+        app.ui._run = self._timed_render(app.ui._run)
+        self._build_overlay(app.master)
+
+    def _timed(self, name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return wrapper
+
+    # post volá síťová smyčka hned po příchodu dávky; měří se, kdy ji Tk opravdu spustí
+    def _timed_post(self, post, ui):
+        def timed_post(func):
+            posted = time.perf_counter()
+            def run():
+                self.record(AFTER_LATENCY, time.perf_counter() - posted)
+                func()
+                if ui.pending() and self._arrival is None:
+                    self._arrival = posted
+            post(run)
+        return timed_post
+
+    # Po překreslení UiScheduleru: změna je vidět, až Tk dokončí překreslení (after_idle za ním)
+    def _timed_render(self, run):
+        def timed_run():
+            arrival, self._arrival = self._arrival, None
+            done = run()
+            if arrival is not None and done:
+                self.master.after_idle(lambda: self.record(ARRIVAL_TO_VISIBLE, time.perf_counter() - arrival))
+            return done
+        return timed_run
+
+    # --- Přehled ---
+
+    def _build_overlay(self, master):
+        import tkinter as tk
+        self.overlay = tk.Label(master, justify=tk.LEFT, anchor="nw", font=("Courier", 9),
+                                bg="#222222", fg="#e0e0e0", padx=6, pady=4)
+        master.bind("<F12>", lambda e: self.toggle_overlay())
+        self.toggle_overlay()
+
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.overlay.place(relx=1.0, rely=1.0, anchor="se")
+            self.overlay.lift()
+            self._refresh_overlay()
+        else:
+            self.overlay.place_forget()
+
+    def _refresh_overlay(self):
+        if not self.overlay_visible:
+            return
+        try:
+            self.overlay.config(text=self.summary())
+            self.overlay.lift()
+            self.master.after(OVERLAY_INTERVAL_MS, self._refresh_overlay)
+        except Exception:
+            pass # Okno už je zavřené
+
+    # Textový souhrn metrik (ms)
+    def summary(self):
+        lines = [f"{'metrika':<20} {'počet':>6} {'prům':>7} {'p95':>7} {'max':>7}"]
+        for name, m in sorted(self.metrics.items()):
+            lines.append(f"{name:<20} {m.count:>6} {m.total / m.count * 1000:>7.2f} {m.p95() * 1000:>7.2f} {m.max * 1000:>7.2f}")
+        return "\n".join(lines)
+
+    def close(self):
+        if self.file is not None:
+            for line in self.summary().splitlines():
+                self.file.write(f"# {line}\n")
+            self.file.close()
+            self.file = None
+
+_profiler = None
+
+# Zapnutí měření odezvy GUI se zápisem do souboru path (None = jen přehled)
+def enable_ui_profile(path=None) -> UiProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = UiProfiler(path)
+        atexit.register(_profiler.close)
+    return _profiler
+
+def get_ui_profiler():
+    return _profiler
+
+# Výpis souhrnu (výchozí je stderr)
+def dump_ui_profile(file=None):
+    if _profiler is not None:
+        print(_profiler.summary(), file=file or sys.stderr)
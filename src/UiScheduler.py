@@ -0,0 +1,59 @@
+# UiScheduler.py
+# Slučování překreslení Tk klienta: obsluhy zpráv jen označí, co je potřeba obnovit (deska, status,
+# přítomnost, panel), a vše označené se provede jedním voláním after nejvýš jednou za snímek.
+# Pro každý klíč platí poslední požadavek, takže dávka zpráv (replay po reconnectu, rychlý bot)
+# vykreslí desku jednou místo jednou za zprávu. flush() vše provede hned (testy, přepnutí obrazovky).
+# Příklad: ui = UiScheduler(master); ui.schedule("board", self.drawBoard); ui.flush()
+
+import time
+import traceback
+
+# Nejkratší odstup dvou překreslení (~60 snímků za sekundu)
+FRAME_INTERVAL = 0.016
+
+class UiScheduler:
+    def __init__(self, master, interval=FRAME_INTERVAL):
+        self.master = master
+        self.interval = interval
+        self._dirty = {} # klíč -> (func, args); pořadí podle prvního označení
+        self._after_id = None
+        self._last = 0.0
+        self.requested = 0 # Počet požadavků (schedule)
+        self.rendered = 0 # Počet skutečně provedených překreslení
+
+    # Označení klíče k překreslení; dřívější nevyřízený požadavek se stejným klíčem se nahradí
+    def schedule(self, key, func, *args):
+        self.requested += 1
+        self._dirty[key] = (func, args)
+        if self._after_id is None:
+            delay = max(0.0, self.interval - (time.perf_counter() - self._last))
+            self._after_id = self.master.after(int(delay * 1000), self._run)
+
+    # Zrušení nevyřízeného požadavku
+    def discard(self, key):
+        self._dirty.pop(key, None)
+
+    def pending(self):
+        return len(self._dirty)
+
+    # Okamžité provedení všech nevyřízených překreslení; vrací jejich počet
+    def flush(self):
+        if self._after_id is not None:
+            try:
+                self.master.after_cancel(self._after_id)
+            except Exception:
+                pass
+        return self._run()
+
+    def _run(self):
+        self._after_id = None
+        self._last = time.perf_counter()
+        # Překreslení může naplánovat další; ta počkají na příští snímek
+        dirty, self._dirty = self._dirty, {}
+        for func, args in dirty.values():
+            try:
+                func(*args)
+            except Exception:
+                traceback.print_exc()
+        self.rendered += len(dirty)
+        return len(dirty)
@@ -0,0 +1,207 @@
+# bench_board.py
+# Porovnání vykreslení hrací desky pod Tk: původní drawBoard z client2.py (při každém překreslení zničí
+# a znovu vytvoří rámce desky, řádek po řádku rámce, popisky a jeden Canvas na každý kolík, pak
+# update_idletasks) proti BoardView.render (jeden Canvas, změněné položky se jen přepíšou přes itemconfigure).
+# Obě cesty projdou stejnou posloupností stavů hry (tip, hodnocení, další kolo, po konci hry nová hra)
+# a po každém překreslení se zavolá update_idletasks, aby se započítalo i rozložení a kreslení v Tk.
+# Výstup: čas na překreslení (průměr, percentily, max), widgety v okně a položky Canvasů po posledním
+# překreslení a kolik widgetů se za překreslení vytvoří. Potřebuje Tk s displejem; bez něj se měření přeskočí.
+# Použití: python bench_board.py [--states 200] [--pegs 4] [--colors 6] [--rounds 10] [--json vysledky.json]
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from Messages import Geometry, NUM_PEGS, NUM_COLORS, NUM_ROUNDS
+from LogikClient import RoundInfo
+from BoardView import BoardView, make_palette
+from bench_load import percentile, PERCENTILES
+
+# Původní vykreslení desky z client2.py (drawBoard a _draw_board_rows), jen bez tajné kombinace
+class LegacyBoard:
+    def __init__(self, board_frame, palette, num_pegs, empty):
+        self.board_frame = board_frame
+        self.palette = palette
+        self.num_pegs = num_pegs
+        self.empty = empty
+        self.e_board_frame = None
+
+    def render(self, rounds, current):
+        if self.e_board_frame is not None:
+            for w in self.e_board_frame.winfo_children():
+                w.destroy()
+        else:
+            self.e_board_frame = tk.Frame(self.board_frame, bg="#fcfcfc")
+            self.e_board_frame.pack(padx=10, pady=8, fill=tk.BOTH, expand=True)
+
+        container = tk.Frame(self.e_board_frame, bg="#ffffff", bd=1, relief=tk.RIDGE)
+        container.pack(fill=tk.BOTH, expand=True)
+        canvas = tk.Canvas(container, bg="#ffffff", highlightthickness=0)
+        vscroll = ttk.Scrollbar(container, orient=tk.VERTICAL, command=canvas.yview)
+        vscroll.pack(side=tk.RIGHT, fill=tk.Y)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        canvas.configure(yscrollcommand=vscroll.set)
+        inner_frame = tk.Frame(canvas, bg="#ffffff")
+        canvas.create_window((0, 0), window=inner_frame, anchor='nw')
+        inner_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        self._draw_rows(inner_frame, rounds, current)
+
+    def _draw_rows(self, inner_frame, rounds, current):
+        palette = self.palette
+        peg_r = 11
+        for idx, rnd in enumerate(rounds):
+            row = tk.Frame(inner_frame, height=40)
+            row.pack(fill=tk.X, padx=5, pady=2)
+            bg_color = "#fffac8" if idx == current else "#ffffff"
+            row.config(bg=bg_color)
+            tk.Label(row, text=f"{idx+1}", font=("Arial", 10, "bold" if idx == current else "normal"),
+                     bg=bg_color, width=4).pack(side=tk.LEFT, padx=5)
+
+            guess_frame = tk.Frame(row, bg=bg_color)
+            guess_frame.pack(side=tk.LEFT, padx=10)
+            guess = rnd.guesses[-1][:self.num_pegs] if rnd.guesses else [self.empty] * self.num_pegs
+            for val in guess:
+                fill_col = palette[val] if 0 <= val < len(palette) else "#ffffff"
+                outline_col = "#7a7a7a" if 0 <= val < len(palette) else "#cccccc"
+                canvas = tk.Canvas(guess_frame, width=peg_r*2, height=peg_r*2, bg=bg_color, highlightthickness=0)
+                canvas.pack(side=tk.LEFT, padx=3)
+                canvas.create_oval(1, 1, peg_r*2-1, peg_r*2-1, fill=fill_col, outline=outline_col, width=2)
+
+            eval_frame = tk.Frame(row, bg=bg_color)
+            eval_frame.pack(side=tk.LEFT, padx=10)
+            blacks, whites = rnd.evaluations[-1] if rnd.evaluations else (0, 0)
+            for i in range(self.num_pegs):
+                if i < blacks:
+                    color = "#FF6C1D"
+                elif i < blacks + whites:
+                    color = "#969696"
+                else:
+                    color = "#f0f0f0"
+                canvas = tk.Canvas(eval_frame, width=12, height=12, bg=bg_color, highlightthickness=0)
+                canvas.grid(row=i//2, column=i%2)
+                canvas.create_oval(1, 1, 11, 11, fill=color, outline="#cccccc", width=1)
+        inner_frame.update_idletasks()
+
+# Posloupnost stavů hry (kola, aktuální kolo): tip, hodnocení, další kolo; po posledním kole nová hra.
+# Každý stav je samostatná kopie, takže obě cesty dostanou přesně stejná data.
+def game_states(geometry, count):
+    states = []
+    rounds = [RoundInfo(i, geometry.pegs, geometry.empty) for i in range(geometry.rounds)]
+    current = 0
+    step = 0
+    while len(states) < count:
+        rnd = rounds[current]
+        if step == 0:
+            rnd.guesses.append([(current + i) % geometry.colors for i in range(geometry.pegs)])
+        else:
+            rnd.evaluations.append((current % geometry.pegs, 1 if geometry.pegs > 1 else 0))
+        states.append(([_copy_round(r) for r in rounds], current))
+        step = 1 - step
+        if step == 0:
+            current += 1
+            if current == geometry.rounds:
+                rounds = [RoundInfo(i, geometry.pegs, geometry.empty) for i in range(geometry.rounds)]
+                current = 0
+    return states
+
+def _copy_round(rnd):
+    copy = RoundInfo(rnd.roundNumber)
+    copy.guesses = [list(guess) for guess in rnd.guesses]
+    copy.evaluations = list(rnd.evaluations)
+    return copy
+
+# Počet widgetů ve stromu pod widgetem (včetně něj) a položek ve všech jeho Canvasech
+def count_tree(widget):
+    widgets = 1
+    items = len(widget.find_all()) if isinstance(widget, tk.Canvas) else 0
+    for child in widget.winfo_children():
+        w, i = count_tree(child)
+        widgets += w
+        items += i
+    return widgets, items
+
+# Všechny stavy přes jednu cestu vykreslení; vrací souhrn
+def measure(root, board, host, states):
+    times = []
+    created = []
+    for rounds, current in states:
+        before = _widget_names(host)
+        start = time.perf_counter()
+        board.render(rounds, current)
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+        created.append(len(_widget_names(host) - before))
+    widgets, items = count_tree(host)
+    times.sort()
+    summary = {"redraws": len(times), "mean_ms": sum(times) / len(times) * 1000, "max_ms": times[-1] * 1000,
+               "widgets": widgets, "canvas_items": items,
+               "created_per_redraw": sum(created[1:]) / max(1, len(created) - 1)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = percentile(times, p) * 1000
+    return summary
+
+def _widget_names(widget):
+    names = {str(widget)}
+    for child in widget.winfo_children():
+        names |= _widget_names(child)
+    return names
+
+def print_summary(name, s):
+    print(f"{name:<18} {s['mean_ms']:>8.3f} ms/překreslení" + "".join(f" p{p} {s[f'p{p}_ms']:>8.3f}" for p in PERCENTILES)
+          + f" max {s['max_ms']:>8.3f} ms | widgetů {s['widgets']:>5}, položek {s['canvas_items']:>5},"
+          f" nových widgetů/překreslení {s['created_per_redraw']:.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Porovnání vykreslení hrací desky (drawBoard vs. BoardView)")
+    parser.add_argument("--states", type=int, default=200, help="počet překreslení (stavů hry)")
+    parser.add_argument("--pegs", type=int, default=NUM_PEGS)
+    parser.add_argument("--colors", type=int, default=NUM_COLORS)
+    parser.add_argument("--rounds", type=int, default=NUM_ROUNDS)
+    parser.add_argument("--json", help="soubor pro uložení výsledků")
+    args = parser.parse_args()
+    try:
+        geometry = Geometry(args.pegs, args.colors, args.rounds)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Měření přeskočeno, Tk nemá displej: {e}")
+        return
+    root.geometry("600x800")
+    palette = make_palette(geometry.colors)
+    states = game_states(geometry, max(1, args.states))
+    print(f"Deska {geometry.pegs}/{geometry.colors}/{geometry.rounds}, {len(states)} překreslení")
+
+    results = {}
+    for name, factory in (("drawBoard", LegacyBoard), ("BoardView.render", BoardView)):
+        host = tk.Frame(root)
+        host.pack(fill=tk.BOTH, expand=True)
+        board = factory(host, palette, geometry.pegs, geometry.empty)
+        if isinstance(board, BoardView):
+            board.pack(fill=tk.BOTH, expand=True)
+        root.update() # Okno je zobrazené a BoardView zná svou výšku
+        results[name] = measure(root, board, host, states)
+        print_summary(name, results[name])
+        host.destroy()
+    root.destroy()
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "tk": tk.TkVersion,
+            "platform": platform.platform(),
+            "board": f"{geometry.pegs}/{geometry.colors}/{geometry.rounds}",
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# bench_framing.py
+# Sada mikrobenchmarků rámování SocketLib s výstupem do JSON, aby šly výsledky porovnávat mezi verzemi.
+# Každý případ je kombinace přenosu (socketpair / TCP přes loopback), velikosti zprávy (PING, ROOM_LIST, blízko MAX_SIZE)
+# a režimu (single = sendMessage/recvMessage po jedné zprávě, pipelined = send_messages po dávkách a FrameReader,
+# writer = zprávy po jedné přes frontu FrameWriteru, který je sám skládá do dávek, a FrameReader).
+# Měří zprávy/s, MB/s, syscally na zprávu (obě strany dohromady), alokace na zprávu a špičku paměti během kola.
+# Alokace na zprávu: rozdíl snímků tracemalloc před a po kole (počet paměťových bloků) dělený počtem zpráv;
+# přijímač po dobu kola drží všechny přijaté zprávy, takže se započítá vše, co příjem zprávy vytvoří a předá dál.
+# Špička paměti (tracemalloc) vůči velikosti zprávy ukazuje počet kopií payloadu, které existují současně.
+# Případ se spustí několikrát (rounds) a do výsledků jde medián; nepotřebuje nic mimo standardní knihovnu.
+# Použití: python bench_framing.py [--json vysledky.json] [--compare predchozi.json] [--rounds N] [--filter text]
+
+import argparse
+import json
+import platform
+import socket
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from SocketLib import MAX_SIZE, sendMessage, send_messages, recvMessage, FrameReader, FrameWriter
+from bench_socketlib import CountingSocket, room_list_payload
+
+# Velikosti zpráv: (název, payload, počet zpráv v jednom kole)
+SIZES = [
+    ("tiny", b"LK:PING", 50000),
+    ("medium", room_list_payload(200), 20000),
+    ("large", b"LK:" + b"x" * (MAX_SIZE - 64), 4),
+]
+TRANSPORTS = ["socketpair", "tcp"]
+MODES = ["single", "pipelined", "writer"]
+# Počet zpráv v jedné dávce send_messages v režimu pipelined
+PIPELINE_BATCH = 16
+
+# Dvojice propojených socketů pro daný přenos
+def connect_pair(transport):
+    if transport == "socketpair":
+        return socket.socketpair()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    a = socket.create_connection(listener.getsockname())
+    b, _ = listener.accept()
+    listener.close()
+    return a, b
+
+def send_single(sock, payload, count):
+    for _ in range(count):
+        sendMessage(sock, payload)
+
+def send_pipelined(sock, payload, count):
+    batch = [payload] * PIPELINE_BATCH
+    sent = 0
+    while sent < count:
+        n = min(PIPELINE_BATCH, count - sent)
+        send_messages(sock, batch[:n])
+        sent += n
+
+def send_writer(sock, payload, count):
+    writer = FrameWriter(sock)
+    for _ in range(count):
+        writer.send(payload)
+    writer.close(timeout=None)
+
+# keep: seznam, do kterého se ukládají přijaté zprávy (kolo s měřením alokací), jinak None
+def recv_single(sock, count, keep=None):
+    for _ in range(count):
+        frame = recvMessage(sock, owned=False)
+        if keep is not None:
+            keep.append(frame)
+
+def recv_pipelined(sock, count, keep=None):
+    reader = FrameReader(sock)
+    received = 0
+    while received < count:
+        frames = reader.read_frames(owned=False)
+        received += len(frames)
+        if keep is not None:
+            keep.extend(frames)
+
+SENDERS = {"single": send_single, "pipelined": send_pipelined, "writer": send_writer}
+RECEIVERS = {"single": recv_single, "pipelined": recv_pipelined, "writer": recv_pipelined}
+
+# Jedno kolo případu: vrací (sekundy, syscally celkem, paměť)
+# memory: None (bez tracemalloc), "blocks" (paměť = počet nově alokovaných bloků, přijaté zprávy se drží)
+# nebo "peak" (paměť = špička během kola, zprávy se hned zahazují)
+def run_round(transport, mode, payload, count, memory=None):
+    a, b = connect_pair(transport)
+    sender = CountingSocket(a)
+    receiver = CountingSocket(b)
+    t = threading.Thread(target=SENDERS[mode], args=(sender, payload, count), daemon=True)
+    keep = [] if memory == "blocks" else None
+    if memory is not None:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot() if memory == "blocks" else None
+    start = time.perf_counter()
+    t.start()
+    RECEIVERS[mode](receiver, count, keep)
+    t.join()
+    elapsed = time.perf_counter() - start
+    result = None
+    if memory == "blocks":
+        result = allocated_blocks(before, tracemalloc.take_snapshot())
+    elif memory == "peak":
+        _, result = tracemalloc.get_traced_memory()
+    if memory is not None:
+        tracemalloc.stop()
+    a.close()
+    b.close()
+    return elapsed, sender.calls + receiver.calls, result
+
+# Počet bloků, které mezi snímky přibyly; bloky samotného tracemalloc se nepočítají
+def allocated_blocks(before, after):
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before = before.filter_traces(ignore)
+    after = after.filter_traces(ignore)
+    return sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+# Celý případ: rounds měřených kol a po jednom kole s tracemalloc pro alokace a špičku (to zpomaluje, proto zvlášť)
+def run_case(transport, size_name, payload, count, mode, rounds):
+    run_round(transport, mode, payload, min(count, 100)) # zahřátí
+    times = []
+    calls = 0
+    for _ in range(rounds):
+        elapsed, calls, _ = run_round(transport, mode, payload, count)
+        times.append(elapsed)
+    memory_count = min(count, 1000)
+    _, _, blocks = run_round(transport, mode, payload, memory_count, "blocks")
+    _, _, peak = run_round(transport, mode, payload, memory_count, "peak")
+
+    elapsed = statistics.median(times)
+    frame_size = len(payload)
+    return {
+        "name": f"{transport}/{size_name}/{mode}",
+        "transport": transport,
+        "size": size_name,
+        "mode": mode,
+        "payload_bytes": frame_size,
+        "frames": count,
+        "rounds": rounds,
+        "seconds_median": elapsed,
+        "seconds_min": min(times),
+        "frames_per_sec": count / elapsed,
+        "mb_per_sec": count * frame_size / elapsed / 1e6,
+        "syscalls_per_frame": calls / count,
+        "allocations_per_frame": blocks / memory_count,
+        "peak_bytes": peak,
+        "peak_per_payload": peak / frame_size,
+    }
+
+# Změna proti předchozímu běhu (kladná = rychlejší), None pokud případ v baseline chybí
+def compare(result, baseline):
+    previous = baseline.get(result["name"])
+    if previous is None:
+        return None
+    return result["frames_per_sec"] / previous["frames_per_sec"] - 1
+
+def print_result(result, change):
+    line = (f"{result['name']:<30} {result['frames_per_sec']:>12.0f} zpráv/s {result['mb_per_sec']:>9.1f} MB/s"
+            f" {result['syscalls_per_frame']:>8.3f} syscallů/zprávu {result['allocations_per_frame']:>7.2f} alokací/zprávu"
+            f" {result['peak_bytes'] / 1024:>10.0f} KiB špička")
+    if change is not None:
+        line += f" {change:>+8.1%}"
+    print(line, flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rámování SocketLib")
+    parser.add_argument("--json", help="soubor pro uložení výsledků")
+    parser.add_argument("--compare", help="předchozí JSON výsledky pro porovnání")
+    parser.add_argument("--rounds", type=int, default=3, help="počet měřených kol na případ")
+    parser.add_argument("--filter", default="", help="spustí jen případy, jejichž název obsahuje text")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    results = []
+    for transport in TRANSPORTS:
+        for size_name, payload, count in SIZES:
+            for mode in MODES:
+                if args.filter not in f"{transport}/{size_name}/{mode}":
+                    continue
+                result = run_case(transport, size_name, payload, count, mode, args.rounds)
+                print_result(result, compare(result, baseline))
+                results.append(result)
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
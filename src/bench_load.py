@@ -0,0 +1,328 @@
+# bench_load.py
+# Zátěžový test serveru: asyncio generátor, který otevře mnoho spojení a hraje na nich celé hry Logik
+# (START_LOGIN → REQUEST_ROOMS → JOIN_ROOM → READY_GAME_START → volba, tipy a hodnocení → WIN_GAME).
+# Hráči jsou ve dvojicích (hodnotitel a tipující v jedné místnosti), odpovídají na PING a po konci hry
+# jdou zpět do lobby a hrají znovu. Počet dvojic se postupně zvyšuje (--ramp); pro každý krok se vypíše
+# latence požadavků podle typu zprávy (p50/p90/p99/max), odehrané hry za sekundu a počty chyb.
+# Server musí mít aspoň tolik místností, kolik je dvojic; volné místnosti navíc slouží dvojicím po chybě
+# (./server <mistnosti> <port> <adresa>). Nepotřebuje nic mimo standardní knihovnu.
+# Deska je klasická, nebo ji zadá --pegs/--colors/--rounds (jako u LogikServer.py); s --geom nebo jinou než
+# klasickou deskou zkušební hráč nabídne GEOM a převezme desku, kterou server ohlásí.
+# Použití: python bench_load.py <port> [--host 127.0.0.1] [--ramp 1,10,50] [--duration 10] [--guesses 5]
+#                               [--pause 0.5] [--timeout 10] [--pegs 4] [--colors 6] [--rounds 10] [--geom]
+#                               [--json vysledky.json]
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from collections import Counter
+
+import Messages
+from Messages import decode, Geometry, CAP_GEOMETRY
+from AsyncSocketLib import FramedConnection
+from SocketLib import parse_capabilities
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+# Percentily latence ve výpisu
+PERCENTILES = (50, 90, 99)
+# Počet dvojic, které se současně připojují a přihlašují (aby se nepřeplnila fronta listen() serveru)
+CONNECT_BATCH = 200
+
+# Odpověď serveru, kterou hráč v dané chvíli nečekal
+class UnexpectedReply(Exception):
+    def __init__(self, message):
+        super().__init__(f"Unexpected reply: {message!r}")
+        self.message = message
+
+# Výsledky jednoho kroku: latence podle typu požadavku, hry a chyby
+class LoadStats:
+    def __init__(self):
+        self.latencies = {} # TYPE požadavku -> seznam latencí v sekundách
+        self.failures = Counter()
+        self.games = 0
+
+    def latency(self, kind, seconds):
+        samples = self.latencies.get(kind)
+        if samples is None:
+            samples = self.latencies[kind] = []
+        samples.append(seconds)
+
+    def fail(self, kind):
+        self.failures[kind] += 1
+
+    # Shrnutí kroku pro výpis a JSON
+    def summary(self, pairs, elapsed, cpu) -> dict:
+        latency = {}
+        for kind, samples in sorted(self.latencies.items()):
+            samples.sort()
+            entry = {"count": len(samples), "max_ms": samples[-1] * 1000}
+            for p in PERCENTILES:
+                entry[f"p{p}_ms"] = percentile(samples, p) * 1000
+            latency[kind] = entry
+        return {
+            "pairs": pairs,
+            "connections": pairs * 2,
+            "seconds": elapsed,
+            "games": self.games,
+            "games_per_sec": self.games / elapsed if elapsed else 0.0,
+            "failures": dict(self.failures),
+            "client_cpu": cpu / elapsed if elapsed else 0.0,
+            "latency": latency,
+        }
+
+# Percentil metodou nejbližšího pořadí ze seřazeného seznamu
+def percentile(samples, p):
+    index = max(0, min(len(samples) - 1, int(round(p / 100 * len(samples) + 0.5)) - 1))
+    return samples[index]
+
+# Jedno spojení se serverem
+# Samostatná úloha čte zprávy, na PING hned odpoví PONG a ostatní zprávy řadí do fronty pro průběh hry.
+class Player:
+    def __init__(self, name, role, stats, timeout, geometry=Messages.CLASSIC):
+        self.name = name
+        self.role = role
+        self.stats = stats
+        self.timeout = timeout
+        self.geometry = geometry
+        self.conn = None
+        self._inbox = asyncio.Queue()
+        self._reader = None
+
+    async def open(self, host, port):
+        self.conn = await FramedConnection.open(host, port)
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        if self.conn is not None:
+            await self.conn.close()
+
+    async def _read_loop(self):
+        try:
+            async for payload in self.conn:
+                try:
+                    message = decode(payload, self.geometry)
+                except ValueError:
+                    self.stats.fail("invalid_message")
+                    continue
+                if type(message) is Messages.Ping:
+                    self.conn.send_nowait(Messages.Pong(self.name, self.role).encode())
+                    continue
+                self._inbox.put_nowait(message)
+        except (ConnectionError, OSError):
+            pass
+        self._inbox.put_nowait(None) # Odpojení
+
+    # Čekání na zprávu daného typu (třída nebo n-tice tříd z Messages)
+    async def receive(self, expected):
+        message = await asyncio.wait_for(self._inbox.get(), self.timeout)
+        if message is None:
+            raise ConnectionError("Server closed connection")
+        if not isinstance(message, expected):
+            raise UnexpectedReply(message)
+        return message
+
+    # Odeslání požadavku a čekání na odpověď; latence se zapíše pod TYPE požadavku
+    async def request(self, message, expected):
+        start = time.perf_counter()
+        await self.conn.send(message.encode())
+        reply = await self.receive(expected)
+        self.stats.latency(message.TYPE, time.perf_counter() - start)
+        return reply
+
+    async def send(self, message):
+        await self.conn.send(message.encode())
+
+# Hodnocení tipu: (černé, bílé)
+def score(secret, guess):
+    blacks = sum(s == g for s, g in zip(secret, guess))
+    whites = sum(min(secret.count(c), guess.count(c)) for c in set(guess)) - blacks
+    return blacks, whites
+
+def random_colors(geometry):
+    return tuple(random.randrange(geometry.colors) for _ in range(geometry.pegs))
+
+# Jedna celá hra dvojice v dané místnosti; oba hráči jsou přihlášení a v lobby
+async def play_game(evaluator, guesser, room, guesses):
+    await evaluator.request(Messages.RequestRooms(evaluator.name, evaluator.role), Messages.RoomList)
+    await evaluator.request(Messages.JoinRoom(evaluator.name, evaluator.role, room), Messages.JoinSuccess)
+    await guesser.request(Messages.RequestRooms(guesser.name, guesser.role), Messages.RoomList)
+    await guesser.request(Messages.JoinRoom(guesser.name, guesser.role, room), Messages.JoinSuccess)
+    await evaluator.receive(Messages.GameStart)
+    await guesser.receive(Messages.GameStart)
+    await evaluator.send(Messages.ReadyGameStart(evaluator.name, evaluator.role))
+    await guesser.send(Messages.ReadyGameStart(guesser.name, guesser.role))
+
+    geometry = evaluator.geometry
+    secret = random_colors(geometry)
+    await evaluator.request(Messages.ChoosingColors(secret, geometry), Messages.ChoosingColorsConfirm)
+    await guesser.receive(Messages.ChoosingColorsConfirm)
+
+    # guesses chybných tipů, pak uhodnutí (tipující tajnou kombinaci zná, hraje jen kvůli zátěži)
+    for i in range(guesses + 1):
+        guess = secret
+        while i < guesses and guess == secret:
+            guess = random_colors(geometry)
+        await guesser.request(Messages.GuessingColors(guess, geometry), Messages.GuessingColorsAck)
+        await evaluator.receive(Messages.GuessingColorsAck)
+        await evaluator.request(Messages.Evaluation(*score(secret, guess)), Messages.EvaluationAck)
+        await guesser.receive(Messages.EvaluationAck)
+
+    await evaluator.receive(Messages.WinGame)
+    await guesser.receive(Messages.WinGame)
+    await evaluator.send(Messages.WinGameAck())
+    await guesser.send(Messages.WinGameAck())
+
+# Dvojice hráčů hrající hry až do konce kroku
+# Místnost si dvojice bere ze společné fronty volných místností. Po chybě ji vrátí na konec fronty
+# (server ji může ještě chvíli držet kvůli čekání na reconnect), počká a připojí se znovu pod novými
+# jmény s jinou místností, aby počet hrajících dvojic zůstal stejný.
+async def run_pair(args, step, index, rooms, stats, deadline, connect_limit):
+    generation = 0
+    while time.monotonic() < deadline:
+        evaluator = Player(f"s{step}p{index}g{generation}e", 1, stats, args.timeout, args.geometry)
+        guesser = Player(f"s{step}p{index}g{generation}t", 0, stats, args.timeout, args.geometry)
+        generation += 1
+        room = await rooms.get()
+        failed = True
+        try:
+            async with connect_limit:
+                for player in (evaluator, guesser):
+                    await player.open(args.host, args.port)
+                    await player.request(Messages.StartLogin(player.name, player.role), Messages.LoginSuccess)
+            while time.monotonic() < deadline:
+                await play_game(evaluator, guesser, room, args.guesses)
+                stats.games += 1
+                await asyncio.sleep(args.pause)
+            failed = False
+        except asyncio.TimeoutError:
+            stats.fail("timeout")
+        except UnexpectedReply as e:
+            stats.fail(f"unexpected_{e.message.TYPE}")
+        except (ConnectionError, OSError):
+            stats.fail("connection")
+        finally:
+            await evaluator.close()
+            await guesser.close()
+            rooms.put_nowait(room)
+        if failed:
+            await asyncio.sleep(args.pause)
+
+# Seznam místností ze serveru (přihlášení zkušebního hráče); s nabídnutým GEOM převezme i ohlášenou desku
+async def fetch_rooms(args):
+    stats = LoadStats()
+    probe = Player("probe", 0, stats, args.timeout, args.geometry)
+    await probe.open(args.host, args.port)
+    try:
+        capabilities = CAP_GEOMETRY if args.geom or args.geometry != Messages.CLASSIC else ""
+        reply = await probe.request(Messages.StartLogin(probe.name, probe.role, capabilities), Messages.LoginSuccess)
+        announced = Geometry.from_capabilities(parse_capabilities(reply.capabilities))
+        if announced is not None and announced != args.geometry:
+            print(f"Server hraje na desce {announced}", file=sys.stderr)
+            args.geometry = probe.geometry = announced
+        reply = await probe.request(Messages.RequestRooms(probe.name, probe.role), Messages.RoomList)
+        return [int(room) for room in reply.rooms]
+    finally:
+        await probe.close()
+
+# Jeden krok: pairs dvojic po dobu duration sekund
+async def run_step(args, step, pairs, rooms) -> dict:
+    stats = LoadStats()
+    free_rooms = asyncio.Queue()
+    for room in rooms:
+        free_rooms.put_nowait(room)
+    connect_limit = asyncio.Semaphore(CONNECT_BATCH)
+    start = time.monotonic()
+    cpu_start = time.process_time()
+    deadline = start + args.duration
+    tasks = [asyncio.create_task(run_pair(args, step, i, free_rooms, stats, deadline, connect_limit)) for i in range(pairs)]
+    # Rozehrané hry se po konci kroku ještě dohrají, nejdéle však timeout
+    done, pending = await asyncio.wait(tasks, timeout=args.duration + args.timeout)
+    for task in pending:
+        task.cancel()
+        stats.fail("unfinished")
+    await asyncio.gather(*pending, return_exceptions=True)
+    return stats.summary(pairs, time.monotonic() - start, time.process_time() - cpu_start)
+
+def print_summary(summary):
+    failures = ", ".join(f"{kind} {count}" for kind, count in sorted(summary["failures"].items())) or "žádné"
+    print(f"{summary['pairs']} dvojic ({summary['connections']} spojení): {summary['games']} her,"
+          f" {summary['games_per_sec']:.1f} her/s, CPU klienta {summary['client_cpu']:.0%}, chyby: {failures}")
+    for kind, t in summary["latency"].items():
+        print(f"  {kind:<20} {t['count']:>8}x" + "".join(f" p{p} {t[f'p{p}_ms']:>8.2f} ms" for p in PERCENTILES)
+              + f" max {t['max_ms']:>8.2f} ms")
+    sys.stdout.flush()
+
+# Zvýšení limitu otevřených souborů (každé spojení je jeden deskriptor)
+def raise_fd_limit(needed):
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+async def run(args):
+    ramp = [int(n) for n in args.ramp.split(",")]
+    rooms = await fetch_rooms(args)
+    # Poslední kolo patří uhodnutí
+    args.guesses = max(0, min(args.guesses, args.geometry.rounds - 1))
+    if max(ramp) > len(rooms):
+        print(f"Server má jen {len(rooms)} místností, počet dvojic se omezí", file=sys.stderr)
+        ramp = sorted({min(n, len(rooms)) for n in ramp})
+    raise_fd_limit(max(ramp) * 2 + 64)
+
+    results = []
+    for step, pairs in enumerate(ramp):
+        summary = await run_step(args, step, pairs, rooms)
+        print_summary(summary)
+        results.append(summary)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Zátěžový test serveru Logik")
+    parser.add_argument("port", type=int)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--ramp", default="1,10,50", help="počty současně hrajících dvojic oddělené čárkou")
+    parser.add_argument("--duration", type=float, default=10.0, help="délka jednoho kroku v sekundách")
+    parser.add_argument("--guesses", type=int, default=5, help="počet chybných tipů v jedné hře (0 až kola-1)")
+    parser.add_argument("--pause", type=float, default=0.5, help="pauza v lobby mezi hrami a po chybě")
+    parser.add_argument("--timeout", type=float, default=10.0, help="nejdelší čekání na odpověď serveru")
+    parser.add_argument("--pegs", type=int, default=Messages.NUM_PEGS, help="kolíků v tipu (deska serveru)")
+    parser.add_argument("--colors", type=int, default=Messages.NUM_COLORS, help="počet barev")
+    parser.add_argument("--rounds", type=int, default=Messages.NUM_ROUNDS, help="počet kol hry")
+    parser.add_argument("--geom", action="store_true", help="nabídnout GEOM a hrát na desce, kterou server ohlásí")
+    parser.add_argument("--json", help="soubor pro uložení výsledků")
+    args = parser.parse_args()
+    try:
+        args.geometry = Geometry(args.pegs, args.colors, args.rounds)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = asyncio.run(run(args))
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "target": f"{args.host}:{args.port}",
+            "guesses": args.guesses,
+            "board": f"{args.geometry.pegs}/{args.geometry.colors}/{args.geometry.rounds}",
+            "pause": args.pause,
+            "steps": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
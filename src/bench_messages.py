@@ -0,0 +1,167 @@
+# bench_messages.py
+# Kontrola a benchmark kodeku zpráv (Messages.py).
+# Nejdřív ověří, že každá zpráva ve tvaru, v jakém ji posílá C++ server (Messages.cpp) nebo klient,
+# projde decode() a serialize() beze změny a že chybné zprávy vyhodí ValueError.
+# Pak měří decode a encode v porovnání s původním dělením textu v client2.py
+# a směrování zpráv přes Dispatcher proti původnímu řetězci if/elif v handleMessage.
+# Použití: python bench_messages.py [pocet_opakovani]
+
+import sys
+import time
+
+import Messages
+from Messages import decode
+from Dispatcher import Dispatcher
+
+# Zprávy přesně tak, jak je vytvoří serialize() v Messages.cpp
+SERVER_MESSAGES = [
+    ("LK:LOGIN_SUCCESS:Pavel:1", Messages.LoginSuccess("Pavel", 1)),
+    ("LK:ROOM_LIST:1:2:15", Messages.RoomList(("1", "2", "15"))),
+    ("LK:ROOM_LIST:", Messages.RoomList(())),
+    ("LK:JOIN_SUCCESS", Messages.JoinSuccess()),
+    ("LK:JOIN_FAIL", Messages.JoinFail()),
+    ("LK:GAME_START:Jana", Messages.GameStart("Jana")),
+    ("LK:PING", Messages.Ping()),
+    ("LK:PERMANENT_DISCONNECT:Jana:0", Messages.PermanentDisconnect("Jana", 0)),
+    ("LK:TEMPORARY_DISCONNECT:Jana:0", Messages.TemporaryDisconnect("Jana", 0)),
+    ("LK:RECONNECT_CONFIRM:2:012312:554440:666600:666600:666600:666600:666600:666600:666600:666600:1:Jana",
+     Messages.ReconnectConfirm(2, [((0, 1, 2, 3), 1, 2), ((5, 5, 4, 4), 4, 0)] + [((6, 6, 6, 6), 0, 0)] * 8, 1, "Jana")),
+    ("LK:RECONNECT_FAIL", Messages.ReconnectFail()),
+    ("LK:CHOOSING_COLORS_CONFIRM:", Messages.ChoosingColorsConfirm()),
+    ("LK:GUESSING_COLORS_ACK:3210", Messages.GuessingColorsAck((3, 2, 1, 0))),
+    ("LK:EVALUATION_ACK:2:1", Messages.EvaluationAck(2, 1)),
+    ("LK:WIN_GAME:0", Messages.WinGame(0)),
+    ("LK:WIN_GAME:1", Messages.WinGame(1)),
+    ("LK:RECONNECT_OTHER_PLAYER", Messages.ReconnectOtherPlayer()),
+]
+
+# Zprávy, které posílá klient (client2.py) a přijímá evaluate() v Messages.cpp
+CLIENT_MESSAGES = [
+    ("LK:START_LOGIN:Pavel:1", Messages.StartLogin("Pavel", 1)),
+    ("LK:START_LOGIN:Pavel:1:BIN,ZLIB", Messages.StartLogin("Pavel", 1, "BIN,ZLIB")),
+    ("LK:REQUEST_ROOMS:Pavel:1", Messages.RequestRooms("Pavel", 1)),
+    ("LK:JOIN_ROOM:Pavel:1:3", Messages.JoinRoom("Pavel", 1, 3)),
+    ("LK:READY_GAME_START:Pavel:1", Messages.ReadyGameStart("Pavel", 1)),
+    ("LK:PONG:Pavel:1", Messages.Pong("Pavel", 1)),
+    ("LK:PERMANENT_DISCONNECT_CONFIRM:Pavel:1", Messages.PermanentDisconnectConfirm("Pavel", 1)),
+    ("LK:TEMPORARY_DISCONNECT_CONFIRM:Pavel:1", Messages.TemporaryDisconnectConfirm("Pavel", 1)),
+    ("LK:RECONNECT_REQUEST:Pavel:1", Messages.ReconnectRequest("Pavel", 1)),
+    ("LK:CHOOSING_COLORS:0123", Messages.ChoosingColors((0, 1, 2, 3))),
+    ("LK:GUESSING_COLORS:5540", Messages.GuessingColors((5, 5, 4, 0))),
+    ("LK:EVALUATION:2:1", Messages.Evaluation(2, 1)),
+    ("LK:WIN_GAME_ACK", Messages.WinGameAck()),
+    ("LK:RECONNECT_OTHER_PLAYER_ACK", Messages.ReconnectOtherPlayerAck()),
+]
+
+# Zprávy, které musí decode() odmítnout
+INVALID_MESSAGES = [
+    "", "LK", "XX:PING", "LK:UNKNOWN", "LK:PING:1", "LK:EVALUATION_ACK:2", "LK:EVALUATION_ACK:x:1",
+    "LK:GUESSING_COLORS_ACK:012", "LK:GUESSING_COLORS_ACK:0126", "LK:WIN_GAME:2", "LK:PONG:Pavel:3",
+    "LK:JOIN_ROOM:Pavel:1:a", "LK:RECONNECT_CONFIRM:2:01231:1:Jana", "LK:CHOOSING_COLORS_CONFIRM:x",
+]
+
+# Kontrola obousměrného převodu; vrací počet chyb
+def check_round_trips() -> int:
+    errors = 0
+    for text, expected in SERVER_MESSAGES + CLIENT_MESSAGES:
+        for payload in (text, text.encode()):
+            message = decode(payload)
+            if message != expected or message.serialize() != text or expected.encode() != text.encode():
+                print(f"CHYBA {text!r}: {message!r} -> {message.serialize()!r}")
+                errors += 1
+    for text in INVALID_MESSAGES:
+        try:
+            message = decode(text)
+        except ValueError:
+            continue
+        print(f"CHYBA {text!r} měla být odmítnuta, výsledek {message!r}")
+        errors += 1
+    print(f"kontrola kodeku: {len(SERVER_MESSAGES) + len(CLIENT_MESSAGES)} zpráv, {errors} chyb")
+    return errors
+
+# Původní zpracování v client2.py: rozdělení a převody podle typu přímo v obsluze
+def legacy_parse(data: bytes):
+    message = data.decode()
+    parts = message.split(":")
+    if len(parts) < 2 or parts[0] != "LK":
+        return None
+    msg_type = parts[1]
+    if msg_type == "EVALUATION_ACK":
+        return int(parts[2]), int(parts[3])
+    if msg_type == "GUESSING_COLORS_ACK":
+        return [int(ch) for ch in parts[2] if ch.isdigit()][:4]
+    if msg_type == "RECONNECT_CONFIRM":
+        rounds = []
+        for round_str in parts[3:-2]:
+            rounds.append(([int(ch) for ch in round_str[:-2] if ch.isdigit()][:4], int(round_str[-2]), int(round_str[-1])))
+        return int(parts[2]), rounds, int(parts[-2]), parts[-1]
+    if msg_type == "ROOM_LIST":
+        return [p for p in parts[2:] if p]
+    return parts
+
+# Původní směrování v LogikApp.handleMessage: porovnání typu s řetězci postupně
+LEGACY_ORDER = ["PING", "WIN_GAME", "PERMANENT_DISCONNECT", "TEMPORARY_DISCONNECT", "RECONNECT_OTHER_PLAYER",
+                "CHOOSING_COLORS_CONFIRM", "GUESSING_COLORS_ACK", "EVALUATION_ACK", "GAME_OVER"]
+
+def _handle(i):
+    return i
+
+def legacy_route(msg_type):
+    if msg_type == "PING":
+        return _handle(0)
+    elif msg_type == "WIN_GAME":
+        return _handle(1)
+    elif msg_type == "PERMANENT_DISCONNECT":
+        return _handle(2)
+    elif msg_type == "TEMPORARY_DISCONNECT":
+        return _handle(3)
+    elif msg_type == "RECONNECT_OTHER_PLAYER":
+        return _handle(4)
+    elif msg_type == "CHOOSING_COLORS_CONFIRM":
+        return _handle(5)
+    elif msg_type == "GUESSING_COLORS_ACK":
+        return _handle(6)
+    elif msg_type == "EVALUATION_ACK":
+        return _handle(7)
+    elif msg_type == "GAME_OVER":
+        return _handle(8)
+
+def bench(name, func, payloads, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            func(payload)
+    elapsed = time.perf_counter() - start
+    count = repeat * len(payloads)
+    print(f"{name:<36} {count / elapsed:>12.0f} zpráv/s {elapsed / count * 1e9:>8.0f} ns/zprávu")
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    if check_round_trips():
+        sys.exit(1)
+
+    payloads = [text.encode() for text, _ in SERVER_MESSAGES]
+    bench("legacy split (serverové zprávy)", legacy_parse, payloads, repeat)
+    bench("decode (serverové zprávy)", decode, payloads, repeat)
+    for text, _ in SERVER_MESSAGES:
+        if text.startswith(("LK:PING", "LK:EVALUATION_ACK", "LK:RECONNECT_CONFIRM")):
+            bench(f"  legacy {text.split(':')[1]}", legacy_parse, [text.encode()], repeat * 5)
+            bench(f"  decode {text.split(':')[1]}", decode, [text.encode()], repeat * 5)
+
+    dispatcher = Dispatcher()
+    for i, kind in enumerate(LEGACY_ORDER):
+        dispatcher.register(kind, lambda msg, i=i: i)
+    for kind in ("PING", "EVALUATION_ACK"):
+        message = Messages.MESSAGE_TYPES[kind].parse(["LK", kind, "2", "1"])
+        bench(f"if/elif {kind}", legacy_route, [kind], repeat * 5)
+        bench(f"Dispatcher {kind}", dispatcher.dispatch, [message], repeat * 5)
+
+    # Sestavení a zakódování odchozí zprávy, původně f-stringem přímo v client2.py
+    name, role = "Pavel", 1
+    bench("f-string PONG", lambda _: f"LK:PONG:{name}:{role}".encode(), [None], repeat * 5)
+    bench("Pong(...).encode()", lambda _: Messages.Pong(name, role).encode(), [None], repeat * 5)
+    bench("f-string GUESSING_COLORS", lambda _: f"LK:GUESSING_COLORS:{'0123'}".encode(), [None], repeat * 5)
+    bench("GuessingColors(...).encode()", lambda _: Messages.GuessingColors((0, 1, 2, 3)).encode(), [None], repeat * 5)
+
+if __name__ == "__main__":
+    main()
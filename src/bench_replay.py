@@ -0,0 +1,293 @@
+# bench_replay.py
+# Přehrání záznamu zpráv (SocketLib.enable_trace, client2.py --trace=soubor) proti serveru a měření latence.
+# Každé zaznamenané spojení se otevře v čase svého prvního záznamu a odešle své zprávy ve stejném pořadí,
+# buď v původních časech (--speed 1), N× rychleji (--speed N), nebo co nejrychleji (--speed 0).
+# Zpráva se ale nikdy neodešle dřív, než dorazí odpovědi, které v záznamu přišly před ní, takže přehrání
+# dodrží pořadí protokolu i mezi spojeními (GAME_START přijde až po vstupu druhého hráče).
+# Latence zprávy je doba od jejího odeslání do odpovědi serveru (REPLIES); zprávy bez odpovědi (READY_GAME_START,
+# WIN_GAME_ACK) se jen počítají. PING/PONG se nepřehrává, na PING odpovídá přehrávač sám, protože server
+# si časy PING určuje sám.
+# Víc souborů (např. oba hráči z různých procesů) se spojí podle time.monotonic(), s --align začne každý soubor
+# v čase 0. Výstup: latence podle typu zprávy, odchylky od záznamu (jiná odpověď než v záznamu), timeouty;
+# --json uloží i latenci každé jednotlivé zprávy. Nepotřebuje nic mimo standardní knihovnu.
+# Použití: python bench_replay.py <port> <zaznam> [<zaznam> ...] [--host 127.0.0.1] [--speed 1] [--align]
+#                                 [--timeout 10] [--json vysledky.json]
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from collections import Counter
+
+import Messages
+from Messages import decode
+from AsyncSocketLib import FramedConnection
+from SocketLib import read_trace, message_type, parse_capabilities, TRACE_SENT, CAP_ZLIB, CAP_BINARY
+from bench_load import percentile, PERCENTILES
+
+# Zprávy, které se nepřehrávají (na PING odpovídá přehrávač sám)
+SKIPPED_SENT = {Messages.Pong.TYPE}
+SKIPPED_RECEIVED = {Messages.Ping.TYPE}
+# Požadavky klienta a typy zpráv, kterými na ně server odpovídá
+REPLIES = {
+    Messages.StartLogin.TYPE: {Messages.LoginSuccess.TYPE},
+    Messages.ReconnectRequest.TYPE: {Messages.ReconnectConfirm.TYPE, Messages.ReconnectFail.TYPE},
+    Messages.RequestRooms.TYPE: {Messages.RoomList.TYPE},
+    Messages.JoinRoom.TYPE: {Messages.JoinSuccess.TYPE, Messages.JoinFail.TYPE},
+    Messages.ChoosingColors.TYPE: {Messages.ChoosingColorsConfirm.TYPE},
+    Messages.GuessingColors.TYPE: {Messages.GuessingColorsAck.TYPE},
+    Messages.Evaluation.TYPE: {Messages.EvaluationAck.TYPE},
+}
+
+# Jeden krok spojení: odeslání payloadu, nebo čekání na zprávu typu kind od serveru
+class Step:
+    __slots__ = ("sent", "t", "payload", "kind")
+
+    def __init__(self, sent, t, payload, kind):
+        self.sent = sent
+        self.t = t
+        self.payload = payload
+        self.kind = kind
+
+# Zaznamenané spojení: kroky v pořadí záznamu a hráč (pro PONG)
+class Script:
+    def __init__(self, key):
+        self.key = key
+        self.steps = []
+        self.name = None
+        self.role = None
+
+    # Jméno a role z přihlášení nebo reconnectu
+    def learn_player(self, payload):
+        try:
+            message = decode(payload)
+        except ValueError:
+            return
+        if type(message) in (Messages.StartLogin, Messages.ReconnectRequest) and self.name is None:
+            self.name = message.name
+            self.role = message.role
+
+# Výsledek jedné odeslané zprávy
+class FrameResult:
+    __slots__ = ("connection", "index", "kind", "scheduled", "lag", "sent_at", "latency", "reply")
+
+    def __init__(self, connection, index, kind, scheduled, lag, sent_at):
+        self.connection = connection
+        self.index = index
+        self.kind = kind
+        self.scheduled = scheduled
+        self.lag = lag
+        self.sent_at = sent_at
+        self.latency = None
+        self.reply = None
+
+    def to_json(self) -> dict:
+        return {
+            "connection": self.connection,
+            "index": self.index,
+            "type": self.kind,
+            "scheduled_s": self.scheduled,
+            "lag_ms": self.lag * 1000,
+            "latency_ms": None if self.latency is None else self.latency * 1000,
+            "reply": self.reply,
+        }
+
+class ReplayResults:
+    def __init__(self):
+        self.frames = []
+        self.failures = Counter()
+        self.diverged = Counter() # (očekávaný typ, skutečný typ) -> počet
+
+# Načtení záznamů; vrací seznam Script seřazený podle prvního kroku
+# Čas kroků je v sekundách od začátku záznamu (všech souborů, nebo každého zvlášť s align).
+def load_scripts(paths, align) -> list:
+    scripts = {}
+    origins = {}
+    for index, path in enumerate(paths):
+        for session, kind, conn, t, payload in read_trace(path):
+            origins[index] = min(origins.get(index, t), t)
+            key = f"{index}:{session}:{conn}"
+            script = scripts.get(key)
+            if script is None:
+                script = scripts[key] = Script(key)
+            payload = bytes(payload)
+            if kind == TRACE_SENT:
+                if message_type(payload) in SKIPPED_SENT:
+                    continue
+                script.learn_player(payload)
+                script.steps.append(Step(True, (index, t), payload, message_type(payload)))
+            else:
+                received = message_type(payload)
+                if received not in SKIPPED_RECEIVED:
+                    script.steps.append(Step(False, (index, t), None, received))
+    if not origins:
+        return []
+    start = min(origins.values())
+    for script in scripts.values():
+        for step in script.steps:
+            index, t = step.t
+            step.t = t - (origins[index] if align else start)
+    result = [s for s in scripts.values() if s.steps]
+    result.sort(key=lambda s: s.steps[0].t)
+    return result
+
+# Přehrání jednoho spojení
+async def replay_connection(script, args, start, results):
+    loop = asyncio.get_running_loop()
+
+    async def wait_until(t):
+        if args.speed > 0:
+            delay = start + t / args.speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    await wait_until(script.steps[0].t)
+    try:
+        conn = await asyncio.wait_for(FramedConnection.open(args.host, args.port), args.timeout)
+    except (OSError, asyncio.TimeoutError):
+        results.failures["connect"] += 1
+        return
+
+    inbox = asyncio.Queue()
+
+    async def read_loop():
+        try:
+            async for payload in conn:
+                kind = message_type(payload)
+                if kind == Messages.Ping.TYPE and script.name is not None:
+                    conn.send_nowait(Messages.Pong(script.name, script.role).encode())
+                    continue
+                if kind == Messages.LoginSuccess.TYPE:
+                    try:
+                        accepted = parse_capabilities(decode(payload).capabilities)
+                    except ValueError:
+                        accepted = set()
+                    conn.compress = CAP_ZLIB in accepted
+                    conn.binary = CAP_BINARY in accepted
+                inbox.put_nowait((loop.time(), kind))
+        except (ConnectionError, OSError):
+            pass
+        inbox.put_nowait(None)
+
+    reader = asyncio.create_task(read_loop())
+    pending = None # Poslední odeslaný požadavek, který ještě nemá odpověď
+    try:
+        for index, step in enumerate(script.steps):
+            if step.sent:
+                await wait_until(step.t)
+                now = loop.time()
+                scheduled = start + step.t / args.speed if args.speed > 0 else now
+                frame = FrameResult(script.key, index, step.kind, step.t, max(0.0, now - scheduled), now)
+                results.frames.append(frame)
+                if step.kind in REPLIES:
+                    pending = frame
+                await conn.send(step.payload)
+                continue
+            try:
+                item = await asyncio.wait_for(inbox.get(), args.timeout)
+            except asyncio.TimeoutError:
+                results.failures["timeout"] += 1
+                return
+            if item is None:
+                results.failures["connection"] += 1
+                return
+            arrived, kind = item
+            if kind != step.kind:
+                results.diverged[(step.kind, kind)] += 1
+            if pending is not None and kind in REPLIES[pending.kind]:
+                pending.latency = arrived - pending.sent_at
+                pending.reply = kind
+                pending = None
+    finally:
+        reader.cancel()
+        await conn.close()
+
+async def replay(args, scripts) -> dict:
+    loop = asyncio.get_running_loop()
+    results = ReplayResults()
+    start = loop.time()
+    cpu_start = time.process_time()
+    await asyncio.gather(*(replay_connection(s, args, start, results) for s in scripts))
+    elapsed = loop.time() - start
+    return summarize(results, len(scripts), elapsed, time.process_time() - cpu_start)
+
+def summarize(results, connections, elapsed, cpu) -> dict:
+    by_type = {}
+    for frame in results.frames:
+        by_type.setdefault(frame.kind, []).append(frame)
+    latency = {}
+    for kind, frames in sorted(by_type.items()):
+        samples = sorted(f.latency for f in frames if f.latency is not None)
+        entry = {"count": len(frames), "answered": len(samples)}
+        if samples:
+            entry["max_ms"] = samples[-1] * 1000
+            for p in PERCENTILES:
+                entry[f"p{p}_ms"] = percentile(samples, p) * 1000
+        latency[kind] = entry
+    lags = sorted(f.lag for f in results.frames)
+    return {
+        "connections": connections,
+        "frames_sent": len(results.frames),
+        "seconds": elapsed,
+        "client_cpu": cpu / elapsed if elapsed else 0.0,
+        "lag_p99_ms": percentile(lags, 99) * 1000 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+        "failures": dict(results.failures),
+        "diverged": {f"{expected}->{got}": count for (expected, got), count in sorted(results.diverged.items())},
+        "latency": latency,
+        "frames": [f.to_json() for f in results.frames],
+    }
+
+def print_summary(summary, speed):
+    mode = f"{speed:g}×" if speed > 0 else "co nejrychleji"
+    print(f"{summary['connections']} spojení, {summary['frames_sent']} zpráv za {summary['seconds']:.2f} s ({mode}),"
+          f" CPU klienta {summary['client_cpu']:.0%}, zpoždění proti plánu p99 {summary['lag_p99_ms']:.2f} ms"
+          f" max {summary['lag_max_ms']:.2f} ms")
+    failures = ", ".join(f"{kind} {count}" for kind, count in sorted(summary["failures"].items())) or "žádné"
+    diverged = ", ".join(f"{kind} {count}" for kind, count in summary["diverged"].items()) or "žádné"
+    print(f"  chyby: {failures}; odchylky od záznamu: {diverged}")
+    for kind, t in summary["latency"].items():
+        line = f"  {kind:<28} {t['count']:>7}x"
+        if t["answered"]:
+            line += "".join(f" p{p} {t[f'p{p}_ms']:>8.2f} ms" for p in PERCENTILES) + f" max {t['max_ms']:>8.2f} ms"
+        if kind in REPLIES and t["answered"] < t["count"]:
+            line += f" bez odpovědi {t['count'] - t['answered']}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Přehrání záznamu zpráv proti serveru Logik")
+    parser.add_argument("port", type=int)
+    parser.add_argument("traces", nargs="+", help="soubory se záznamem (enable_trace, client2.py --trace=soubor)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--speed", type=float, default=1.0, help="násobek původní rychlosti, 0 = co nejrychleji")
+    parser.add_argument("--align", action="store_true", help="každý soubor začne v čase 0")
+    parser.add_argument("--timeout", type=float, default=10.0, help="nejdelší čekání na zprávu ze záznamu")
+    parser.add_argument("--json", help="soubor pro uložení výsledků včetně latence každé zprávy")
+    args = parser.parse_args()
+    if args.speed < 0:
+        parser.error("--speed nesmí být záporné")
+
+    scripts = load_scripts(args.traces, args.align)
+    if not scripts:
+        print("Záznam neobsahuje žádné zprávy", file=sys.stderr)
+        sys.exit(1)
+    summary = asyncio.run(replay(args, scripts))
+    print_summary(summary, args.speed)
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "target": f"{args.host}:{args.port}",
+            "traces": args.traces,
+            "speed": args.speed,
+            "result": summary,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# bench_rooms.py
+# Měření seznamu místností v lobby pod Tk pro různé počty místností (výchozí 10, 1 000 a 10 000).
+# RoomListView: set_rooms (nový ROOM_LIST) a posun seznamu (kolečko po řádku a stránkování);
+# původní _display_rooms z client2.py (při každém ROOM_LIST zničí a znovu vytvoří Canvas s jedním
+# ttk.Button na místnost) jen set_rooms, nad --legacy-limit místností se kvůli délce přeskočí.
+# Po každé operaci se zavolá update_idletasks, aby se započítalo i rozložení a kreslení v Tk.
+# Výstup: čas na operaci (průměr, percentily, max) a počet widgetů seznamu po posledním set_rooms.
+# Potřebuje Tk s displejem; bez něj se měření přeskočí.
+# Použití: python bench_rooms.py [--sizes 10,1000,10000] [--repeat 5] [--scrolls 200] [--legacy-limit 1000]
+#                                [--json vysledky.json]
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from RoomListView import RoomListView
+from bench_load import percentile, PERCENTILES
+from bench_board import count_tree
+
+# Původní vykreslení místností z client2.py (_display_rooms a _clear_room_display), bez stavového popisku
+class LegacyRoomList:
+    def __init__(self, room_list_frame):
+        self.room_list_frame = room_list_frame
+
+    def set_rooms(self, rooms_list):
+        for widget in self.room_list_frame.winfo_children():
+            widget.destroy()
+        if not rooms_list:
+            return
+        frame_container = tk.Frame(self.room_list_frame, bg="#ffffff")
+        frame_container.pack(fill="both", expand=True, padx=5, pady=5)
+        canvas = tk.Canvas(frame_container, highlightthickness=0, bg="#ffffff")
+        scrollbar = ttk.Scrollbar(frame_container, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg="#ffffff")
+        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        for room_id in rooms_list:
+            btn = ttk.Button(scrollable_frame, text=f"Místnost {room_id}", command=lambda rid=room_id: None, width=30)
+            btn.pack(pady=5, padx=10, ipady=5)
+
+# Časy operace (s) -> souhrn v ms
+def summarize(times):
+    times = sorted(times)
+    summary = {"count": len(times), "mean_ms": sum(times) / len(times) * 1000, "max_ms": times[-1] * 1000}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = percentile(times, p) * 1000
+    return summary
+
+def timed(root, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    root.update_idletasks()
+    return time.perf_counter() - start
+
+# Seznamy místností pro opakování set_rooms; každý ROOM_LIST se od předchozího liší (jedna místnost ubude)
+def room_lists(size, repeat):
+    rooms = [str(i) for i in range(1, size + 1)]
+    return [rooms[:i] + rooms[i + 1:] if size > 1 else rooms for i in range(repeat)]
+
+def measure_view(root, size, args):
+    host = tk.Frame(root)
+    host.pack(fill=tk.BOTH, expand=True)
+    view = RoomListView(host, on_select=lambda room_id: None)
+    view.pack(fill="both", expand=True)
+    root.update() # Okno je zobrazené a seznam zná svou výšku
+    lists = room_lists(size, args.repeat)
+    result = {"set_rooms": summarize([timed(root, view.set_rooms, rooms) for rooms in lists])}
+    units = []
+    pages = []
+    for i in range(args.scrolls):
+        direction = 1 if (i // 50) % 2 == 0 else -1 # Tam a zpátky, aby se nezůstalo na konci seznamu
+        units.append(timed(root, view.yview, "scroll", direction, "units"))
+        pages.append(timed(root, view.yview, "scroll", direction, "pages"))
+    result["scroll_units"] = summarize(units)
+    result["scroll_pages"] = summarize(pages)
+    result["widgets"] = count_tree(host)[0]
+    host.destroy()
+    return result
+
+def measure_legacy(root, size, args):
+    host = tk.Frame(root)
+    host.pack(fill=tk.BOTH, expand=True)
+    legacy = LegacyRoomList(host)
+    root.update()
+    lists = room_lists(size, args.repeat)
+    result = {"set_rooms": summarize([timed(root, legacy.set_rooms, rooms) for rooms in lists])}
+    result["widgets"] = count_tree(host)[0]
+    host.destroy()
+    return result
+
+def print_line(label, s):
+    print(f"  {label:<30} {s['mean_ms']:>9.3f} ms" + "".join(f" p{p} {s[f'p{p}_ms']:>9.3f}" for p in PERCENTILES)
+          + f" max {s['max_ms']:>9.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Měření seznamu místností v lobby (RoomListView vs. původní _display_rooms)")
+    parser.add_argument("--sizes", default="10,1000,10000", help="počty místností oddělené čárkou")
+    parser.add_argument("--repeat", type=int, default=5, help="počet set_rooms pro každý počet místností")
+    parser.add_argument("--scrolls", type=int, default=200, help="počet posunů po řádku a po stránce")
+    parser.add_argument("--legacy-limit", type=int, default=1000, help="nejvyšší počet místností pro původní vykreslení")
+    parser.add_argument("--json", help="soubor pro uložení výsledků")
+    args = parser.parse_args()
+    sizes = [int(n) for n in args.sizes.split(",")]
+    args.repeat = max(1, args.repeat)
+    args.scrolls = max(1, args.scrolls)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Měření přeskočeno, Tk nemá displej: {e}")
+        return
+    root.geometry("600x800")
+
+    results = {}
+    for size in sizes:
+        print(f"{size} místností")
+        entry = {"RoomListView": measure_view(root, size, args)}
+        view = entry["RoomListView"]
+        print_line("RoomListView.set_rooms", view["set_rooms"])
+        print_line("RoomListView posun o řádek", view["scroll_units"])
+        print_line("RoomListView posun o stránku", view["scroll_pages"])
+        print(f"  {'RoomListView widgetů':<30} {view['widgets']:>9}")
+        if size <= args.legacy_limit:
+            entry["_display_rooms"] = legacy = measure_legacy(root, size, args)
+            print_line("_display_rooms", legacy["set_rooms"])
+            print(f"  {'_display_rooms widgetů':<30} {legacy['widgets']:>9}")
+        else:
+            print(f"  _display_rooms přeskočeno (víc než --legacy-limit {args.legacy_limit} místností)")
+        results[str(size)] = entry
+        sys.stdout.flush()
+    root.destroy()
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "tk": tk.TkVersion,
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# bench_socketlib.py
+# Benchmark přijímací cesty SocketLib nad socket.socketpair().
+# Porovnává původní recvMessage (jeden recv() na každou číslici délky) s FrameReaderem,
+# který načítá do vlastního bufferu. Měří zprávy za sekundu a počet syscallů na zprávu.
+# U velkých zpráv (blízko MAX_SIZE) měří čas a špičku paměti původní cesty proti čtení přes recv_into
+# a proudovému čtení po kusech (recv_message_stream).
+# Na straně odesílání porovnává sendall po jedné zprávě se send_messages (jedno sendmsg pro více zpráv).
+# Pro velké ROOM_LIST zprávy měří bajty na drátě a dobu odezvy (tam a zpět) s kompresí a bez ní.
+# Binární režim (prefix "MB" a 4 bajty délky) se měří vedle textové hlavičky se stejnými zprávami.
+# Použití: python bench_socketlib.py [pocet_zprav]
+
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+from SocketLib import MAX_SIZE, sendMessage, send_messages, recvMessage, recv_message_stream, encode_frame, FrameReader
+
+# Typické malé zprávy hry
+SAMPLE_PAYLOADS = [b"LK:PING", b"LK:EVALUATION_ACK:2:1", b"LK:ROOM_LIST:" + b":".join(str(i).encode() for i in range(1, 21))]
+
+# Původní implementace přijmu (před FrameReaderem a recv_into), ponechaná jako základ pro srovnání
+def legacy_recv_exact(sock, n):
+    data = bytearray()
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("Disconnected while reading")
+        data.extend(chunk)
+    return bytes(data)
+
+def legacy_recv_message(sock):
+    prefix = legacy_recv_exact(sock, 2).decode()
+    if prefix != "ML":
+        raise ValueError(f"Invalid message prefix: {prefix}")
+    length_str = ""
+    while True:
+        ch = sock.recv(1)
+        if not ch:
+            raise ConnectionError("Disconnected while reading length")
+        ch = ch.decode()
+        if ch.isdigit():
+            length_str += ch
+        else:
+            first_payload_byte = ch.encode()
+            break
+    length = int(length_str)
+    payload = first_payload_byte
+    if length > 1:
+        payload += legacy_recv_exact(sock, length - 1)
+    return payload
+
+# Obal nad socketem, který počítá volání recv/recv_into/send*
+class CountingSocket:
+    def __init__(self, sock):
+        self.sock = sock
+        self.calls = 0
+
+    def recv(self, n, *args):
+        self.calls += 1
+        return self.sock.recv(n, *args)
+
+    def recv_into(self, buf, *args):
+        self.calls += 1
+        return self.sock.recv_into(buf, *args)
+
+    def sendall(self, data, *args):
+        self.calls += 1
+        return self.sock.sendall(data, *args)
+
+    def sendmsg(self, buffers, *args):
+        self.calls += 1
+        return self.sock.sendmsg(buffers, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.sock, name)
+
+# Odesílací vlákno, které pošle count zpráv co nejrychleji
+def _sender(sock, payloads, count, binary=False):
+    for i in range(count):
+        sendMessage(sock, payloads[i % len(payloads)], binary=binary)
+
+# Původní odeslání: spojení hlavičky s payloadem a sendall
+def legacy_send_message(sock, payload):
+    sock.sendall(f"ML{len(payload)}".encode() + payload)
+
+# Spustí jeden běh: receive(sock, count) musí přijmout přesně count zpráv
+def run_case(name, receive, count, payloads=SAMPLE_PAYLOADS, binary=False):
+    a, b = socket.socketpair()
+    counting = CountingSocket(b)
+    t = threading.Thread(target=_sender, args=(a, payloads, count, binary), daemon=True)
+    start = time.perf_counter()
+    t.start()
+    receive(counting, count)
+    elapsed = time.perf_counter() - start
+    t.join()
+    a.close()
+    b.close()
+    print(f"{name:<24} {count / elapsed:>12.0f} zpráv/s {counting.calls / count:>8.3f} syscallů/zprávu")
+    return count / elapsed, counting.calls / count
+
+def recv_legacy(sock, count):
+    for _ in range(count):
+        legacy_recv_message(sock)
+
+def recv_message(sock, count):
+    for _ in range(count):
+        recvMessage(sock)
+
+def recv_message_view(sock, count):
+    for _ in range(count):
+        recvMessage(sock, owned=False)
+
+def recv_message_binary(sock, count):
+    for _ in range(count):
+        recvMessage(sock, binary=True)
+
+def recv_frame_reader(sock, count):
+    reader = FrameReader(sock)
+    received = 0
+    while received < count:
+        received += len(reader.read_frames())
+
+def recv_frame_reader_view(sock, count):
+    reader = FrameReader(sock)
+    for _ in range(count):
+        reader.read_frame(owned=False)
+
+def recv_stream(sock, count):
+    for _ in range(count):
+        _, chunks = recv_message_stream(sock, owned=False)
+        for _ in chunks:
+            pass
+
+# Běh nad velkými zprávami, navíc měří špičku paměti přijímající strany (tracemalloc)
+def run_large_case(name, receive, count, size=MAX_SIZE - 64):
+    # Rámec se sestaví předem, aby se do špičky paměti nepočítala odesílající strana
+    frame = f"ML{size}".encode() + b"LK:" + b"x" * (size - 3)
+    a, b = socket.socketpair()
+    t = threading.Thread(target=lambda: [a.sendall(frame) for _ in range(count)], daemon=True)
+    t.start()
+    tracemalloc.start()
+    start = time.perf_counter()
+    receive(b, count)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t.join()
+    a.close()
+    b.close()
+    print(f"{name:<24} {elapsed / count * 1000:>9.2f} ms/zprávu {peak / size:>6.2f}x velikost zprávy (špička paměti)")
+    return elapsed / count, peak
+
+# Běh odesílání: send(sock, payloads) odešle dávku zpráv, přijímá FrameReader v druhém vlákně
+def run_send_case(name, send, count, batch, payloads=SAMPLE_PAYLOADS):
+    a, b = socket.socketpair()
+    counting = CountingSocket(a)
+    t = threading.Thread(target=recv_frame_reader, args=(b, count), daemon=True)
+    t.start()
+    batch_payloads = [payloads[i % len(payloads)] for i in range(batch)]
+    start = time.perf_counter()
+    for _ in range(count // batch):
+        send(counting, batch_payloads)
+    # Zbytek, když count není násobkem batch (přijímač čeká přesně count zpráv)
+    if count % batch:
+        send(counting, batch_payloads[:count % batch])
+    t.join()
+    elapsed = time.perf_counter() - start
+    a.close()
+    b.close()
+    print(f"{name:<24} {count / elapsed:>12.0f} zpráv/s {counting.calls / count:>8.3f} syscallů/zprávu")
+    return count / elapsed, counting.calls / count
+
+def send_legacy(sock, payloads):
+    for payload in payloads:
+        legacy_send_message(sock, payload)
+
+def send_one_by_one(sock, payloads):
+    for payload in payloads:
+        sendMessage(sock, payload)
+
+# ROOM_LIST tak, jak ho posílá server pro lobby s rooms místnostmi
+def room_list_payload(rooms):
+    return ("LK:ROOM_LIST:" + ":".join(str(i) for i in range(1, rooms + 1))).encode()
+
+# RECONNECT_CONFIRM se snímkem rozehrané hry (10 kol)
+def reconnect_payload():
+    rounds = ":".join("012312" if i < 5 else "666600" for i in range(10))
+    return f"LK:RECONNECT_CONFIRM:5:{rounds}:1:Protihrac".encode()
+
+# Odezva tam a zpět přes echo vlákno; obě strany posílají s compress a přijímají přes recvMessage
+def run_compression_case(name, payload, compress, rounds=50):
+    a, b = socket.socketpair()
+
+    def echo():
+        for _ in range(rounds):
+            sendMessage(b, recvMessage(b), compress=compress)
+
+    t = threading.Thread(target=echo, daemon=True)
+    t.start()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        sendMessage(a, payload, compress=compress)
+        assert recvMessage(a) == payload
+    elapsed = time.perf_counter() - start
+    t.join()
+    a.close()
+    b.close()
+    header, data = encode_frame(payload, compress)
+    wire = len(header) + len(data)
+    print(f"{name:<34} {wire:>9} B na drátě ({wire / (len(payload) + len(header)):>5.1%}) {elapsed / rounds * 1e6:>9.1f} µs/odezva")
+    return wire, elapsed / rounds
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run_case("legacy recvMessage", recv_legacy, count)
+    run_case("recvMessage", recv_message, count)
+    run_case("FrameReader", recv_frame_reader, count)
+    run_case("recvMessage (binární)", recv_message_binary, count, binary=True)
+    run_case("FrameReader (binární)", recv_frame_reader, count, binary=True)
+
+    run_send_case("legacy sendall", send_legacy, count, 2)
+    run_send_case("sendMessage", send_one_by_one, count, 2)
+    run_send_case("send_messages (po 2)", send_messages, count, 2)
+    run_send_case("send_messages (po 16)", send_messages, count, 16)
+
+    for rooms in (100, 1000, 10000):
+        payload = room_list_payload(rooms)
+        run_compression_case(f"ROOM_LIST {rooms} místností", payload, False)
+        run_compression_case(f"ROOM_LIST {rooms} místností (zlib)", payload, True)
+    run_compression_case("RECONNECT_CONFIRM", reconnect_payload(), False)
+    run_compression_case("RECONNECT_CONFIRM (zlib)", reconnect_payload(), True)
+
+    large_count = 5
+    run_large_case("legacy recvMessage", recv_legacy, large_count)
+    run_large_case("recvMessage", recv_message, large_count)
+    run_large_case("recvMessage(owned=False)", recv_message_view, large_count)
+    run_large_case("FrameReader(owned=False)", recv_frame_reader_view, large_count)
+    run_large_case("recv_message_stream", recv_stream, large_count)
+
+if __name__ == "__main__":
+    main()
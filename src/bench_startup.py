@@ -0,0 +1,152 @@
+# bench_startup.py
+# Měření startu Tk klienta: každý běh je nový proces Pythonu (studený import jako při spuštění client2.py).
+# Měří se import client2 (a zda přitom načetl tkinter), samotný import tkinter, který import bez okna
+# ušetří, a start okna: load_gui, tk.Tk(), LogikApp a první vykreslení (<Expose> hlavního rámce).
+# Spojení se serverem běží na pozadí, takže okno se vykreslí dřív, než je výsledek připojení znám;
+# čas výsledku (connected / connect_failed) se vypisuje zvlášť. Celkový čas procesu od spuštění
+# (včetně startu interpretu a ukončení) je v řádku process. První vykreslení se porovná s cílem --target.
+# Bez displeje (tk.Tk() selže) se vypíšou jen importy. Nepotřebuje nic mimo standardní knihovnu.
+# Použití: python bench_startup.py [port] [--host 127.0.0.1] [--runs 10] [--target 100] [--json vysledky.json]
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Nejdelší čekání na vykreslení a výsledek připojení v jednom běhu
+PROBE_TIMEOUT = 10.0
+
+# --- Měření v novém procesu (python bench_startup.py --probe <režim> <host> <port>) ---
+
+def probe(mode, host, port):
+    start = time.perf_counter()
+    result = {}
+    if mode == "tkinter":
+        import tkinter
+        from tkinter import ttk, messagebox
+        result["import tkinter"] = time.perf_counter() - start
+        return result
+
+    import client2
+    result["import client2"] = time.perf_counter() - start
+    result["tkinter loaded"] = "tkinter" in sys.modules
+    if mode == "import":
+        return result
+
+    client2.load_gui()
+    result["load_gui"] = time.perf_counter() - start
+    tk = client2.tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        result["error"] = f"Tk: {e}"
+        return result
+    result["tk.Tk()"] = time.perf_counter() - start
+    app = client2.LogikApp(root, host, port)
+    result["LogikApp"] = time.perf_counter() - start
+
+    # Konec po prvním vykreslení a výsledku připojení (nebo po timeoutu)
+    def mark(name):
+        if name not in result:
+            result[name] = time.perf_counter() - start
+        if "first paint" in result and "connection" in result:
+            root.quit()
+
+    app.main_container.bind("<Expose>", lambda e: mark("first paint"), add="+")
+    app.client.on("connected", lambda: mark("connection"))
+    app.client.on("connect_failed", lambda error: mark("connection"))
+    root.after(int(PROBE_TIMEOUT * 1000), root.quit)
+    root.mainloop()
+    result["connected"] = app.client.connected
+    app.client.close()
+    root.destroy()
+    return result
+
+# --- Řízení běhů ---
+
+def run_probe(mode, host, port):
+    here = os.path.dirname(os.path.abspath(__file__))
+    spawned = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--probe", mode, host, str(port)],
+                          cwd=here, capture_output=True, text=True, timeout=PROBE_TIMEOUT + 10)
+    wall = time.perf_counter() - spawned
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"Měření {mode} selhalo: {proc.stderr.strip()[-500:]}")
+    result = json.loads(lines[-1])
+    result["process"] = wall # Od spuštění do konce procesu
+    return result
+
+# Medián, minimum a maximum časů (ms) podle fáze
+def summarize(runs):
+    phases = {}
+    for result in runs:
+        for name, value in result.items():
+            if isinstance(value, float):
+                phases.setdefault(name, []).append(value * 1000)
+    return {name: {"median": statistics.median(v), "min": min(v), "max": max(v)} for name, v in phases.items()}
+
+def print_summary(title, summary):
+    print(f"\n{title}")
+    print(f"  {'fáze (ms od startu)':<22} {'medián':>8} {'min':>8} {'max':>8}")
+    for name, s in summary.items():
+        print(f"  {name:<22} {s['median']:>8.1f} {s['min']:>8.1f} {s['max']:>8.1f}")
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--probe":
+        print(json.dumps(probe(sys.argv[2], sys.argv[3], int(sys.argv[4]))))
+        return
+
+    parser = argparse.ArgumentParser(description="Měření startu Tk klienta Logik")
+    parser.add_argument("port", type=int, nargs="?", default=10000, help="port serveru (nemusí běžet)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--runs", type=int, default=10, help="počet běhů (procesů) pro každé měření")
+    parser.add_argument("--target", type=float, default=100.0, help="cíl pro první vykreslení od startu měření (ms)")
+    parser.add_argument("--json", help="soubor pro uložení výsledků")
+    args = parser.parse_args()
+
+    report = {}
+    for mode, title in (("import", "Import client2 bez okna"),
+                        ("tkinter", "Import tkinter (ušetří ho import bez okna)"),
+                        ("gui", "Start okna")):
+        runs = []
+        for _ in range(max(1, args.runs)):
+            result = run_probe(mode, args.host, args.port)
+            if "error" in result:
+                print(f"\n{title}: přeskočeno ({result['error']})")
+                runs = []
+                break
+            runs.append(result)
+        if not runs:
+            continue
+        summary = summarize(runs)
+        print_summary(title, summary)
+        if mode == "import":
+            loaded = sum(1 for r in runs if r["tkinter loaded"])
+            print(f"  tkinter načten při importu: {loaded}/{len(runs)}")
+        elif mode == "gui":
+            paint = summary.get("first paint", {}).get("median")
+            connected = sum(1 for r in runs if r["connected"])
+            print(f"  připojeno k {args.host}:{args.port}: {connected}/{len(runs)}")
+            if paint is not None:
+                print(f"  první vykreslení {paint:.1f} ms, cíl {args.target:.0f} ms: {'splněn' if paint <= args.target else 'nesplněn'}")
+        report[mode] = summary
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "target": f"{args.host}:{args.port}",
+            "runs": args.runs,
+            "phases": report,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,32 @@
-import socket
-import threading
-import time
-import tkinter as tk
-from tkinter import messagebox
-from tkinter import ttk
 from random import choice, randint, random
 import sys
 import os
 
-from SocketLib import sendMessage, recvMessage
-# Datová struktura pro jedno kolo hry
-class RoundInfo:
-    def __init__(self, roundNumber, num_pegs=4):
-        self.roundNumber = roundNumber # Číslo kola
-        self.guesses = [[6] * num_pegs] # Defaultní prázdný tip (6 = žádná barva)
-        self.evaluations = [] # List hodnocení
+from SocketLib import enable_stats, enable_trace, get_stats
+import Messages
+from Messages import Geometry
+from LogikClient import LogikClient
+from UiScheduler import UiScheduler
+from UiProfiler import enable_ui_profile, get_ui_profiler, dump_ui_profile
+
+# Moduly GUI (tkinter a pohledy nad ním) se načtou až při vytvoření okna (load_gui), takže import client2
+# bez okna (bot, benchmark, výpis nápovědy) tkinter vůbec nenačte
+tk = ttk = messagebox = None
+RoomListView = BoardView = make_palette = None
+
+def load_gui():
+    global tk, ttk, messagebox, RoomListView, BoardView, make_palette
+    if tk is None:
+        import tkinter
+        from tkinter import ttk, messagebox
+        from RoomListView import RoomListView
+        from BoardView import BoardView, make_palette
+        tk = tkinter
 
 # Hlavní aplikační třída klienta
 class LogikApp:
-    def __init__(self, master, host, port):
+    def __init__(self, master, host, port, compress=False, binary=False, geometry=Messages.CLASSIC, offer_geometry=None):
+        load_gui()
         
         # Vytvoření hlavního okna
         self.master = master
@@ -36,43 +44,36 @@ class LogikApp:
         
         self.master.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        # Klientské atributy při startu hry
-        self.host = host
-        self.port = port
-        self.name = None
-        self.role = None
-        self.socket = None
-        self.connected = False
-        self.GAME_PREFIX = "LK"
-        self.reconnected = False
-        self.reconnectData = None
+        # Překreslení vyvolaná zprávami se slučují do jednoho za snímek
+        self.ui = UiScheduler(self.master)
+        
+        # Jádro klienta (protokol a stav hry); obsluhy jeho událostí běží ve vlákně Tk
+        self.client = LogikClient(host, port, compress=compress, binary=binary,
+                                  post=lambda func: self.master.after(0, func), geometry=geometry,
+                                  offer_geometry=offer_geometry)
+        # Měření odezvy GUI (--uiprofile) obalí metody ještě před registrací obsluh
+        profiler = get_ui_profiler()
+        if profiler is not None:
+            profiler.instrument(self)
+        self._subscribe()
         self.input_values = None 
-        self.other_player_name = None
-        self.isRunning = False
         self.isPaused = False
-        self.palette = ["#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4"] # 6 barev (0-5)
-        self.num_pegs = 4
-        self.currentRoundNumber = 0 
-        self.rounds = []
-        self.reconnecting = False
-        self.last_online = None
-        self.me_online = 1
-        self.opponent_online = 1
         self.opponent_name = "Protihráč"
+        self.after_connect = None # Přihlášení nebo reconnect, o který uživatel požádal před navázáním spojení
         
         # Prvky GUI
         self.current_frame = None
         self.status_label = None 
+        self.board_view = None
         self._input_panel_initialized = False
         
         # Vytvoření hlavního rámečku
         self.main_container = tk.Frame(self.master, bg="#fcfcfc")
         self.main_container.pack(fill=tk.BOTH, expand=True)
         
-        # Spuštění
-        self._initialize_rounds()
-        self.connect_to_server()
+        # Spuštění: okno se ukáže hned, spojení se naváže na pozadí a jeho stav je vidět na přihlášení
         self.show_login()
+        self.connect_to_server()
 
     # Centrování okna na obrazovce
     def _center_window(self, width, height):
@@ -82,14 +83,48 @@ class LogikApp:
         y_position = int((screen_height / 2) - (height / 2))
         self.master.geometry(f"{width}x{height}+{x_position}+{y_position}")
     
-    # Inicializace kol hry
-    def _initialize_rounds(self):
-        self.rounds = []
-        for i in range(10):
-            self.rounds.append(RoundInfo(i, self.num_pegs))
-
-    # Vyčištění aktuálního rámce
+    # Stav hry drží LogikClient, view ho jen čte
+    name = property(lambda self: self.client.name)
+    role = property(lambda self: self.client.role)
+    rounds = property(lambda self: self.client.rounds)
+    currentRoundNumber = property(lambda self: self.client.currentRoundNumber)
+    num_pegs = property(lambda self: self.client.num_pegs)
+    # Barvy 0..colors-1 a kód prázdné pozice podle geometrie desky (klasicky 6 barev, prázdná 6)
+    palette = property(lambda self: make_palette(self.client.geometry.colors))
+    empty = property(lambda self: self.client.geometry.empty)
+    other_player_name = property(lambda self: self.client.other_player_name)
+    me_online = property(lambda self: self.client.me_online)
+    opponent_online = property(lambda self: self.client.opponent_online)
+
+    # Napojení obsluh na události LogikClient
+    def _subscribe(self):
+        client = self.client
+        client.on("connected", self.onConnected)
+        client.on("connect_failed", self.onConnectFailed)
+        client.on("login_success", self.onLoginSuccess)
+        client.on("login_failed", self.onLoginFailed)
+        client.on("reconnect_confirm", self.continueGame)
+        client.on("reconnect_fail", self.onReconnectFail)
+        client.on("room_list", self._display_rooms)
+        client.on("join_success", self.onJoinSuccess)
+        client.on("join_fail", self.onJoinFail)
+        client.on("game_start", self.onGameStart)
+        client.on("unexpected", self.onUnexpected)
+        client.on("disconnected", self.onDisconnected)
+        client.on("connection_lost", self.onConnectionLost)
+        client.on("reconnecting", self.onReconnecting)
+        client.on("reconnected", self.onReconnected)
+        client.on("presence", self.updatePresenceUI)
+        client.on("colors_chosen", self.onColorsChosen)
+        client.on("guess", self.onGuess)
+        client.on("evaluation", self.onEvaluation)
+        client.on("game_over", self.onGameOver)
+        client.on("opponent_left", self.onOpponentLeft)
+
+    # Vyčištění aktuálního rámce; nevyřízená překreslení desky a panelu patří ke starému rámci
     def _clear_frame(self):
+        self.ui.discard("board")
+        self.ui.discard("panel")
         if self.current_frame:
             self.current_frame.destroy()
         self.current_frame = None
@@ -114,7 +149,8 @@ class LogikApp:
         self.role_entry.grid(row=1, column=1, padx=10)
 
         # Stavový label pro Login
-        self.login_status_label = tk.Label(self.current_frame, text="Stav: Připojeno k serveru", fg="#3cb44b", bg="#fcfcfc", font=("Helvetica", 10))
+        text, color = self._connection_status()
+        self.login_status_label = tk.Label(self.current_frame, text=text, fg=color, bg="#fcfcfc", font=("Helvetica", 10))
         self.login_status_label.pack(pady=15)
         
         # Tlačítka (použijeme ttk.Button)
@@ -139,14 +175,15 @@ class LogikApp:
         # Rámeček pro scroll
         self.room_list_frame = tk.Frame(self.current_frame, bg="#ffffff", bd=1, relief=tk.RIDGE)
         self.room_list_frame.pack(pady=10, fill=tk.BOTH, expand=True, padx=20)
+        self.room_view = RoomListView(self.room_list_frame, on_select=self.join_room)
+        self.room_view.pack(fill="both", expand=True, padx=5, pady=5)
         
         # Spustit načítání
-        threading.Thread(target=self.choose_room, daemon=True).start()
+        self.choose_room()
 
     # Vykreslení herní obrazovky
     def show_game(self, start_type='new'):
         self._clear_frame()
-        self.isRunning = True
         self.game_frame = tk.Frame(self.main_container, bg="#fcfcfc")
         self.game_frame.pack(fill=tk.BOTH, expand=True)
         self.current_frame = self.game_frame 
@@ -166,14 +203,16 @@ class LogikApp:
         # Vykreslení tajné kombinace pro hodnotitele
         if self.role == 1:
             self.secret_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
-            self.secret_canvas = tk.Canvas(self.secret_frame, width=250, height=40, bg="#fcfcfc", highlightthickness=0)
-            self.secret_canvas.pack(side=tk.LEFT, padx=150)
+            width = max(250, 20 + self._secret_spacing() * self.num_pegs)
+            self.secret_canvas = tk.Canvas(self.secret_frame, width=width, height=40, bg="#fcfcfc", highlightthickness=0)
+            self.secret_canvas.pack(side=tk.LEFT, padx=max(10, 150 - (width - 250) // 2))
             tk.Label(self.secret_frame, text="Tajná kombinace:", font=("Arial", 9, "bold"), bg="#fcfcfc").pack(side=tk.LEFT, padx=5)
 
         self.input_frame = tk.Frame(self.game_frame, bg="#ffffff", bd=1, relief=tk.RIDGE, padx=10, pady=10)
         self.input_frame.pack(side=tk.TOP, fill=tk.X, pady=5, padx=10)
         self.board_frame = tk.Frame(self.game_frame, bg="#fcfcfc")
         self.board_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.board_view = None
         
         self.drawBoard()
         if start_type == 'new' and self.role == 1:
@@ -181,42 +220,47 @@ class LogikApp:
         elif start_type == 'reconnect':
             pass
 
-        self.last_online = time.time()
-
-        # Spuštění vláken pro příjem zpráv a monitorování reconnectu
-        threading.Thread(target=self.recvMessageThread, daemon=True).start()
-        threading.Thread(target=self.reconnectMonitor, daemon=True).start()
-        try:
-            print("[DEBUG] reconnectMonitor spuštěn")
-        except Exception:
-            pass
-
-    # Metoda pro připojení k serveru
+    # Připojení k serveru na pozadí (ve vlákně síťové smyčky); výsledek přijde jako connected / connect_failed
     def connect_to_server(self):
-        try:
-            print(f"[DEBUG] Připojuji se na {self.host}:{self.port} (typ: {type(self.host)}, {type(self.port)})")
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.host, self.port))
-            print(f"[DEBUG] Připojení úspěšné!")
-            self.connected = True
-            return True
-        except Exception as e:
-            print(f"[DEBUG] Chyba připojení: {type(e).__name__}: {e}")
-            messagebox.showerror("Connection Error", f"Nepodařilo se připojit k serveru: {e}")
-            self.socket = None
-            self.connected = False
-            return False
-
-    # Odeslání přihlašovacích údajů a zpracování odpovědi
+        print(f"[DEBUG] Připojuji se na {self.client.host}:{self.client.port}")
+        self.client.connect_async()
+        text, color = self._connection_status()
+        self.update_status_safely(self.login_status_label, text, color)
+
+    # Text a barva stavu spojení na přihlašovací obrazovce
+    def _connection_status(self):
+        if self.client.connected:
+            return "Stav: Připojeno k serveru", "#3cb44b"
+        if self.client.connecting:
+            return f"Stav: Připojuji se k serveru {self.client.host}:{self.client.port}…", "#4363d8"
+        return "Stav: Odpojeno od serveru.", "#e6194b"
+
+    def onConnected(self):
+        print(f"[DEBUG] Připojení úspěšné!")
+        if self.client.phase is None: # Přihlášení odeslané ještě před touto událostí má vlastní stav
+            self.update_status_safely(self.login_status_label, *self._connection_status())
+        action, self.after_connect = self.after_connect, None
+        if action is not None:
+            action()
+
+    # Nepovedené připojení: místo modálního okna stav na přihlášení, další pokus přes Přihlásit se / Obnovit hru
+    def onConnectFailed(self, error):
+        print(f"[DEBUG] Chyba připojení: {type(error).__name__}: {error}")
+        self.after_connect = None
+        self.update_status_safely(self.login_status_label, f"Nepodařilo se připojit k serveru: {error}", "#e6194b")
+
+    # Odeslání přihlašovacích údajů; odpověď přijde jako událost login_success / login_failed
     def submit_login(self):
-        if not self.connected:
-            self.login_status_label.config(text="Stav: Odpojeno od serveru.", fg="red")
+        if not self.client.connected:
+            # Přihlášení proběhne po připojení (nový pokus, pokud se předtím nepovedlo)
+            self.after_connect = self.submit_login
+            self.connect_to_server()
             return
         
-        self.name = self.name_entry.get()
+        name = self.name_entry.get()
         role_str = self.role_entry.get()
 
-        if not self.name or not role_str:
+        if not name or not role_str:
             self.login_status_label.config(text="Vyplň jméno i roli!", fg="red")
             return
 
@@ -224,52 +268,34 @@ class LogikApp:
             role_int = int(role_str)
             if role_int not in [0, 1]:
                 raise ValueError
-            self.role = role_int
         except ValueError:
             self.login_status_label.config(text="Role musí být 0 (Tipující) nebo 1 (Hodnotitel)!", fg="red")
             return
         
-        # Spuštění odeslání a příjmu v samostatném vlákně
-        threading.Thread(target=self.send_and_receive_login, daemon=True).start()
-
-    # Odeslání přihlašovacích údajů a zpracování odpovědi
-    def send_and_receive_login(self):
         try:
-            STATE_PREFIX = "START_LOGIN"
-            msg = f"{self.GAME_PREFIX}:{STATE_PREFIX}:{self.name}:{self.role}"
-            sendMessage(self.socket, msg.encode())
-
+            self.client.login(name, role_int)
             self.update_status_safely(self.login_status_label, "Čekám na odpověď od serveru…", "#4363d8")
-            
-            data = recvMessage(self.socket)
-            if not data:
-                self.connected = False
-                self.update_status_safely(self.login_status_label, "Server zavřel spojení.", "red")
-                return
-
-            data_str = data.decode()
-
-            if self.evaluate_message(data_str, "LOGIN_SUCCESS", 4):
-                self.update_status_safely(self.login_status_label, "Přihlášení úspěšné!", "#3cb44b")
-                self.master.after(500, self.show_lobby)
-            else:
-                self.connected = False
-                self.update_status_safely(self.login_status_label, "Přihlášení selhalo nebo server neodpovídá.", "#e6194b")
-                return
         except Exception as e:
-            self.connected = False
             self.update_status_safely(self.login_status_label, f"Chyba při komunikaci: {e}", "#e6194b")
 
-    # Obsluha reconnectu
+    # Odpověď na přihlášení
+    def onLoginSuccess(self, capabilities):
+        self.update_status_safely(self.login_status_label, "Přihlášení úspěšné!", "#3cb44b")
+        self.master.after(500, self.show_lobby)
+
+    def onLoginFailed(self, message):
+        self.update_status_safely(self.login_status_label, "Přihlášení selhalo nebo server neodpovídá.", "#e6194b")
+
+    # Obsluha reconnectu; odpověď přijde jako událost reconnect_confirm / reconnect_fail
     def handleReconnect(self, name, role):
-        if not self.connected:
-            self.login_status_label.config(text="Stav: Odpojeno. Nelze reconnect.", fg="#e6194b")
+        if not self.client.connected:
+            self.after_connect = lambda: self.handleReconnect(name, role)
+            self.connect_to_server()
             return
         
-        self.name = name
         role_str = str(role)
 
-        if not self.name or not role_str:
+        if not name or not role_str:
             self.login_status_label.config(text="Vyplň jméno i roli!", fg="#e6194b")
             return
         
@@ -277,209 +303,132 @@ class LogikApp:
             role_int = int(role_str)
             if role_int not in [0, 1]:
                 raise ValueError
-            self.role = role_int
         except ValueError:
             self.login_status_label.config(text="Role musí být 0 nebo 1!", fg="#e6194b")
             return
             
-        threading.Thread(target=self.send_and_receive_reconnect, daemon=True).start()
-
-    # Odeslání požadavku na reconnect a zpracování odpovědi
-    def send_and_receive_reconnect(self):
         try:
-            RECONNECT_PREFIX = "RECONNECT_REQUEST"
-            msg = f"{self.GAME_PREFIX}:{RECONNECT_PREFIX}:{self.name}:{self.role}"
-            sendMessage(self.socket, msg.encode())
-
+            self.client.reconnect(name, role_int)
             self.update_status_safely(self.login_status_label, "Čekám na odpověď od serveru (Reconnect)…", "#f58231")
-            data_bytes = recvMessage(self.socket)
-            
-            if not data_bytes:
-                self.connected = False
-                self.update_status_safely(self.login_status_label, "❌ Server zavřel spojení.", "#e6194b")
-                return
-            
-            data = data_bytes.decode()
-            
-            if data and "RECONNECT_CONFIRM" in data:
-                self.reconnectData = data
-                self.isRunning = False
-                time.sleep(0.2)
-                self.master.after(0, self.continueGame)
-            elif data and "RECONNECT_FAIL" in data:
-                self.update_status_safely(self.login_status_label, "❌ Obnovení připojení selhalo (hra neexistuje).", "#e6194b")
-            else:
-                self.connected = False
-                self.update_status_safely(self.login_status_label, "❌ Obnovení připojení selhalo.", "#e6194b")
-        
         except Exception as e:
-            self.connected = False
             self.update_status_safely(self.login_status_label, f"Chyba reconnectu: {e}", "#e6194b")
 
+    def onReconnectFail(self, message):
+        if isinstance(message, Messages.ReconnectFail):
+            self.update_status_safely(self.login_status_label, "❌ Obnovení připojení selhalo (hra neexistuje).", "#e6194b")
+        else:
+            self.update_status_safely(self.login_status_label, "❌ Obnovení připojení selhalo.", "#e6194b")
+
     # Obnovení hry po reconnectu
-    def continueGame(self):
-        """Inicializuje GUI a obnovuje herní stav po reconnectu."""
+    def continueGame(self, game_state):
+        """Inicializuje GUI podle herního stavu obnoveného v LogikClient po reconnectu."""
         print(f"[{self.name}] Continuing game with reconnect data.")
-        self.isRunning = True
         self.isPaused = False
         
-        # Parsuje data a obnoví herní stav
-        game_state = self.parseAndAttachReconnectData(self.reconnectData)
-        
         self.show_game(start_type='reconnect') 
-        self.drawBoard() 
 
         # Obnoví panely a status podle stavu hry
         if game_state == 0 and self.role == 1:
-            self.showInputPanel(role='evaluator')
+            self.requestPanel(self.showInputPanel, 'evaluator')
             self.updateStatus("Čekáš na tip protihráče.", color="#4363d8")
         elif game_state == 0 and self.role == 0:
             self.updateStatus("Čekáš na tajnou kombinaci", color="#4363d8")
         elif game_state == 1 and self.role == 1:
             self.updateStatus("Tajná kombinace odeslána. Čekám na tip protihráče.", color="#4363d8")
         elif game_state == 1 and self.role == 0:
-            self.showInputPanel(role='guesser')
+            self.requestPanel(self.showInputPanel, 'guesser')
             self.updateStatus("Můžeš hádat!", color="#3cb44b")
         elif game_state == 2 and self.role == 0:
             self.updateStatus("Tip odeslán. Čekám na hodnocení...", "#4363d8")
-            self.hideInputPanel(show_status=True, status_text="Tip odeslán. Čekám na hodnocení...", color="#4363d8")
+            self.requestPanel(self.hideInputPanel, True, "Tip odeslán. Čekám na hodnocení...", "#4363d8")
         elif game_state == 2 and self.role == 1:
             last_guess = self.rounds[self.currentRoundNumber].guesses[-1]
             guess_str = ''.join(str(x) for x in last_guess) if isinstance(last_guess, list) else last_guess
             
-            self.showEvaluationPanel(guess_str)
+            self.requestPanel(self.showEvaluationPanel, guess_str)
             self.updateStatus("Protihráč tipoval! Ohodnoť jeho tip.", "#3cb44b")
 
-    # Výběr místnosti v lobby
+    # Výběr místnosti v lobby: požadavek na seznam, odpověď přijde jako událost room_list
     def choose_room(self):
         try:
-            ROOM_REQUEST_PREFIX = "REQUEST_ROOMS"
-            msg = f"{self.GAME_PREFIX}:{ROOM_REQUEST_PREFIX}:{self.name}:{self.role}"
-            sendMessage(self.socket, msg.encode())
-
-            rooms_bytes = recvMessage(self.socket)
-            if not rooms_bytes:
-                self.updateStatus("Server neodpovídá.", "#e6194b")
-                self.master.after(1000, self.on_close)
-                return
-
-            rooms_str = rooms_bytes.decode()
-
-            if not self.evaluate_message(rooms_str, "ROOM_LIST", -1):
-                self.updateStatus("Chybná odpověď od serveru.", "#e6194b")
-                return
-
-            raw_parts = rooms_str.split(":")
-            rooms_list = [p for p in raw_parts[2:] if p]
-            
-            self._display_rooms(rooms_list)
-
+            self.client.request_rooms()
         except Exception as e:
             self.updateStatus(f"Chyba v lobby komunikaci: {e}", "#e6194b")
             self.master.after(1000, self.on_close)
 
-    # Vykreslení místností v lobby
+    # Vykreslení místností v lobby: jen výměna dat ve virtualizovaném seznamu
+    # Místnosti, kam se nedávno nepodařilo vstoupit, se nezobrazují (mezipaměť LogikClient)
     def _display_rooms(self, rooms_list):
-        """Vykreslí tlačítka místností do scrollable rámce v lobby."""
-        self.master.after(0, lambda: self._clear_room_display())
+        """Předá volné místnosti seznamu v lobby; tlačítka vzniknou jen pro viditelné řádky."""
+        self.room_view.set_rooms(self.client.room_cache.free())
+        # Seznam obnovený během pokusu o vstup (join_next_room) nemění stavový text
+        if self.client.phase != "lobby":
+            return
         
         if not rooms_list:
             self.updateStatus("Žádné volné místnosti nejsou dostupné.", "#e6194b")
             return
             
         self.updateStatus("Vyberte si volnou místnost pro hru:", "#4363d8")
-        frame_container = tk.Frame(self.room_list_frame, bg="#ffffff")
-        frame_container.pack(fill="both", expand=True, padx=5, pady=5)
 
-        canvas = tk.Canvas(frame_container, highlightthickness=0, bg="#ffffff")
-        scrollbar = ttk.Scrollbar(frame_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg="#ffffff")
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        self.master.bind_all("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1 * (event.delta / 120)), "units"))
-
-        for room_id in rooms_list:
-            btn = ttk.Button(
-                scrollable_frame,
-                text=f"Místnost {room_id}",
-                command=lambda rid=room_id: threading.Thread(target=self.join_room, args=(rid,), daemon=True).start(),
-                width=30
-            )
-            btn.pack(pady=5, padx=10, ipady=5)
-
-    # Vyčištění zobrazení místností     
-    def _clear_room_display(self):
-        for widget in self.room_list_frame.winfo_children():
-            widget.destroy()
-
-    # Připojení k vybrané místnosti
+    # Připojení k vybrané místnosti; odpověď přijde jako událost join_success / join_fail
     def join_room(self, room_id):
         try:
-            JOIN_PREFIX = "JOIN_ROOM"
-            join_msg = f"{self.GAME_PREFIX}:{JOIN_PREFIX}:{self.name}:{self.role}:{room_id}"
-            sendMessage(self.socket, join_msg.encode())
-
+            self.client.join_room(room_id)
             self.updateStatus(f"Čekám na potvrzení připojení k místnosti {room_id}...", "#4363d8")
+        except Exception as e:
+            self.updateStatus(f"⚠️ Nepodařilo se připojit: {e}", "#e6194b")
+            self.master.after(1500, self.choose_room)
 
-            data = recvMessage(self.socket)
-            if not data:
-                self.updateStatus("❌ Server neodpovídá.", "#e6194b")
-                self.master.after(1000, self.on_close)
-                return
-
-            data_str = data.decode()
-
-            if "JOIN_SUCCESS" in data_str:
-                self.updateStatus(f"✅ Připojen k místnosti {room_id}, čekáš na soupeře...", "#3cb44b")
-                threading.Thread(target=self.wait_for_game_start, daemon=True).start()
+    # Připojení k místnosti potvrzeno, dál se čeká na GAME_START
+    def onJoinSuccess(self, room_id):
+        self.updateStatus(f"✅ Připojen k místnosti {room_id}, čekáš na soupeře...", "#3cb44b")
 
-            elif "JOIN_FAIL" in data_str:
-                self.updateStatus(f"⚠️ Místnost {room_id} je obsazena nebo je zde uživatel stejné role. Načítám znovu...", "#f58231")
-                self.master.after(1000, lambda: threading.Thread(target=self.choose_room, daemon=True).start())
-            else:
-                self.updateStatus("❌ Neočekávaná odpověď od serveru. Načítám znovu...", "#e6194b")
-                self.master.after(1500, lambda: threading.Thread(target=self.choose_room, daemon=True).start())
+    # Neúspěšný vstup: hned zkusit další volnou místnost z mezipaměti, teprve bez ní načíst seznam znovu
+    def onJoinFail(self, room_id):
+        if self._join_next(room_id, "je obsazena nebo je zde uživatel stejné role"):
+            return
+        self.updateStatus(f"⚠️ Místnost {room_id} je obsazena nebo je zde uživatel stejné role. Načítám znovu...", "#f58231")
+        self.master.after(1000, self.choose_room)
 
+    # Pokus o další volnou místnost; vrací False, když v mezipaměti žádná není
+    def _join_next(self, room_id, reason):
+        self.room_view.set_rooms(self.client.room_cache.free())
+        try:
+            next_room = self.client.join_next_room()
         except Exception as e:
             self.updateStatus(f"⚠️ Nepodařilo se připojit: {e}", "#e6194b")
-            self.master.after(1500, lambda: threading.Thread(target=self.choose_room, daemon=True).start())
+            self.master.after(1500, self.choose_room)
+            return True
+        if next_room is None:
+            return False
+        self.updateStatus(f"⚠️ Místnost {room_id} {reason}, zkouším místnost {next_room}...", "#f58231")
+        return True
 
-    # Čekání na start hry po připojení k místnosti
-    def wait_for_game_start(self):
-        try:
-            if self.socket:
-                self.socket.settimeout(None)
-            
-            data = recvMessage(self.socket)
-            if not data:
-                self.updateStatus("Server neodpovídá.", "#e6194b")
-                self.master.after(1000, self.on_close)
+    # Start hry po připojení k místnosti
+    def onGameStart(self, other_name):
+        self.updateStatus("Hra začíná!", "#3cb44b")
+        self.master.after(500, self.show_game)
+
+    # Odpověď, kterou LogikClient v dané fázi nečekal
+    def onUnexpected(self, phase, message):
+        if phase == "lobby":
+            self.updateStatus("Chybná odpověď od serveru.", "#e6194b")
+        elif phase == "join":
+            if self._join_next(self.client.joining_room, "neodpověděla podle protokolu"):
                 return
-            data_str = data.decode()
-            parts = data_str.split(":")
-            if len(parts) >= 3:
-                self.other_player_name = parts[2]
-
-            if self.evaluate_message(data_str, "GAME_START", -1):
-                message = f"{self.GAME_PREFIX}:READY_GAME_START:{self.name}:{self.role}"
-                sendMessage(self.socket, message.encode())
-                self.updateStatus("Hra začíná!", "#3cb44b")
-                self.master.after(500, self.show_game)
-            else:
-                self.updateStatus("Neočekávaná zpráva od serveru.", "#e6194b")
-                self.master.after(1000, self.on_close)
-        except Exception as e:
-            self.updateStatus(f"Chyba při čekání na start hry: {e}", "#e6194b")
+            self.updateStatus("❌ Neočekávaná odpověď od serveru. Načítám znovu...", "#e6194b")
+            self.master.after(1500, self.choose_room)
+        elif phase == "waiting":
+            self.updateStatus("Neočekávaná zpráva od serveru.", "#e6194b")
+            self.master.after(1000, self.on_close)
+
+    # Spojení se serverem skončilo mimo hru
+    def onDisconnected(self, error):
+        if self.client.phase in ("login", "reconnect", None):
+            self.update_status_safely(self.login_status_label, "❌ Server zavřel spojení.", "#e6194b")
+        else:
+            self.updateStatus("Server neodpovídá.", "#e6194b")
             self.master.after(1000, self.on_close)
 
     # Vytvoření panelu přítomnosti hráčů
@@ -529,63 +478,8 @@ class LogikApp:
             paint(self.me_status_canvas, self.me_online)
             paint(self.opponent_status_canvas, self.opponent_online)
 
-        try:
-            self.master.after(0, _draw)
-        except Exception:
-            pass
+        self.ui.schedule("presence", _draw)
     
-    # Parsování dat po reconnectu a obnovení herního stavu
-    def parseAndAttachReconnectData(self, data):
-        """Parsuje data po reconnectu a obnovuje herní stav."""
-        print(f"Parsuji reconnect data: {data}")
-        try:
-            parts = data.split(":")
-            if len(parts) < 4 or parts[1] != "RECONNECT_CONFIRM":
-                return 0 
-            
-            current_round_num = int(parts[2])
-            game_state = int(parts[-1]) if parts[-1].isdigit() else 0
-
-            # Pokud poslední položka není číslo stavu, ale jméno protihráče, získej jej z konce
-            if not parts[-1].isdigit() and len(parts) >= 5:
-                self.other_player_name = parts[-1]
-                # Stav hry by pak měl být v předposlední položce
-                game_state = int(parts[-2]) if parts[-2].isdigit() else 0
-            
-            self._initialize_rounds() 
-            
-            # Očekáváme, že poslední prvek je buď stav, nebo jméno; předposlední pak stav
-            round_data_parts = parts[3:-2] if len(parts) > 5 else (parts[3:-1] if len(parts) > 4 else [])
-            
-            for i, round_str in enumerate(round_data_parts):
-                if len(round_str) < 4: 
-                    continue
-                
-                guesses_str = round_str[:-2]
-                try:
-                    blacks = int(round_str[-2])
-                    whites = int(round_str[-1])
-                except (ValueError, IndexError):
-                    continue
-                
-                if i < len(self.rounds):
-                    round_obj = self.rounds[i]
-                else:
-                    round_obj = RoundInfo(i, self.num_pegs)
-                    self.rounds.append(round_obj)
-                
-                guesses_list = [int(ch) for ch in guesses_str if ch.isdigit()][:self.num_pegs]
-                
-                round_obj.guesses = [guesses_list]
-                round_obj.evaluations = [(blacks, whites)]
-            
-            self.currentRoundNumber = current_round_num
-            
-        except Exception as e:
-            print(f"Chyba při parsování reconnect dat: {e}")
-        
-        return game_state
-
     # Zobrazení panelu pro vstup uživatele (výběr barev nebo tipování)
     def showInputPanel(self, role):
         """Zobrazí unifikovaný panel pro výběr barev (Evaluator) nebo tipování (Guesser)."""
@@ -596,22 +490,24 @@ class LogikApp:
         self._input_panel_initialized = False
         self.is_evaluator_mode = (role == 'evaluator')
         self.current_palette = self.palette
-        self.input_values = [6] * self.num_pegs
+        self.input_values = [self.empty] * self.num_pegs
         self.input_slot_ids = []
         self.input_sent = False
 
         try:
-            title_text = "Vyber tajnou kombinaci:" if self.is_evaluator_mode else f"Kolo {self.currentRoundNumber+1}: Hádej 4 barvy:"
+            pegs = self.num_pegs
+            colors_word = "barvu" if pegs == 1 else "barvy" if pegs < 5 else "barev"
+            title_text = "Vyber tajnou kombinaci:" if self.is_evaluator_mode else f"Kolo {self.currentRoundNumber+1}: Hádej {pegs} {colors_word}:"
             tk.Label(self.input_frame, text=title_text, font=("Helvetica", 11, "bold"), bg="#ffffff").pack(pady=4)
 
             input_ctrl_frame = tk.Frame(self.input_frame, bg="#ffffff")
             input_ctrl_frame.pack(pady=5)
             
-            self.input_canvas = tk.Canvas(input_ctrl_frame, width=300, height=50, bg="#ffffff", highlightthickness=0)
+            margin_x = 30
+            spacing = min(60, 360 // pegs)
+            self.input_canvas = tk.Canvas(input_ctrl_frame, width=max(300, 2 * margin_x + spacing * (pegs - 1)), height=50, bg="#ffffff", highlightthickness=0)
             self.input_canvas.pack(side=tk.LEFT, padx=10)
 
-            margin_x = 30
-            spacing = 60
             cy = 25
             r = 14 
 
@@ -654,18 +550,18 @@ class LogikApp:
             cur = self.input_values[slot_idx]
             num_colors = len(self.current_palette)
             
-            if cur == 6:
+            if cur == self.empty:
                 new = 0 
             elif cur < num_colors - 1:
                 new = cur + 1 
             else:
-                new = 6
+                new = self.empty
                 
             self.input_values[slot_idx] = new
             
             oid = self.input_slot_ids[slot_idx]
             
-            if new == 6:
+            if new == self.empty:
                 fill_color = "#ffffff"
                 outline = "#333333"
             else:
@@ -679,12 +575,12 @@ class LogikApp:
 
     # Aktualizace stavu tlačítka odeslání vstupu
     def _update_input_submit_enabled(self):
-        """Povolí tlačítko, pokud jsou vyplněny všechny sloty (ne 6)."""
+        """Povolí tlačítko, pokud jsou vyplněny všechny sloty (ne prázdná pozice)."""
         try:
             if getattr(self, 'input_sent', False):
                 self.input_submit_btn.config(state=tk.DISABLED)
                 return
-            all_set = all((v is not None and int(v) != 6) for v in self.input_values)
+            all_set = all((v is not None and int(v) != self.empty) for v in self.input_values)
             if hasattr(self, 'input_submit_btn'):
                 self.input_submit_btn.config(state=(tk.NORMAL if all_set else tk.DISABLED))
         except Exception:
@@ -694,7 +590,7 @@ class LogikApp:
     def _reset_input(self):
         """Vymaže všechny sloty."""
         try:
-            self.input_values = [6] * self.num_pegs
+            self.input_values = [self.empty] * self.num_pegs
             for oid in self.input_slot_ids:
                 self.input_canvas.itemconfig(oid, fill="#ffffff", outline="#333333")
             self._update_input_submit_enabled()
@@ -705,10 +601,10 @@ class LogikApp:
     def _submit_input(self):
         """Sestaví zprávu a odešle ji na server."""
         try:
-            if getattr(self, 'input_sent', False) or any(int(v) == 6 for v in self.input_values):
+            if getattr(self, 'input_sent', False) or any(int(v) == self.empty for v in self.input_values):
                 return
 
-            s = ''.join(str(v) for v in self.input_values)
+            s = list(self.input_values)
             
             if self.is_evaluator_mode:
                 ok = self.send_choice(s)
@@ -729,7 +625,7 @@ class LogikApp:
                     else:
                         self.hideInputPanel(show_status=True, status_text="Tajná kombinace odeslána. Čekám na tip protihráče.", color="#4363d8")
                     
-                    self.drawBoard() 
+                    self.requestBoard()
                 except Exception:
                     pass
             else:
@@ -769,7 +665,8 @@ class LogikApp:
             
             def change_val(delta):
                 new_val = var.get() + delta
-                if 0 <= new_val <= max_val and (new_val + whites_var.get() <= 4 if var == blacks_var else new_val + blacks_var.get() <= 4):
+                other = whites_var if var == blacks_var else blacks_var
+                if 0 <= new_val <= max_val and new_val + other.get() <= max_val:
                     var.set(new_val)
                     self._update_eval_submit_enabled(blacks_var.get(), whites_var.get())
 
@@ -781,8 +678,8 @@ class LogikApp:
 
         stepper_frame = tk.Frame(eval_frame, bg="#ffffff")
         stepper_frame.pack(pady=10, anchor=tk.CENTER)
-        create_stepper(stepper_frame, "Černé (Přesné)", blacks_var, 4)
-        create_stepper(stepper_frame, "Bílé (Barva)", whites_var, 4)
+        create_stepper(stepper_frame, "Černé (Přesné)", blacks_var, self.num_pegs)
+        create_stepper(stepper_frame, "Bílé (Barva)", whites_var, self.num_pegs)
 
         # Tlačítko ttk
         self.eval_submit_btn = ttk.Button(
@@ -798,7 +695,7 @@ class LogikApp:
     # Povolí tlačítka pro submit
     def _update_eval_submit_enabled(self, blacks, whites):
         try:
-            if hasattr(self, 'eval_submit_btn') and blacks + whites <= 4:
+            if hasattr(self, 'eval_submit_btn') and blacks + whites <= self.num_pegs:
                  self.eval_submit_btn.config(state=tk.NORMAL)
             elif hasattr(self, 'eval_submit_btn'):
                  self.eval_submit_btn.config(state=tk.DISABLED)
@@ -808,15 +705,14 @@ class LogikApp:
     # Potvrzení ohodnocení
     def _submit_evaluation(self, blacks, whites):
         """Odešle hodnocení serveru."""
-        if blacks + whites > 4:
-            messagebox.showerror("Chyba", "Součet černých a bílých kolíků nesmí přesáhnout 4.")
+        if blacks + whites > self.num_pegs:
+            messagebox.showerror("Chyba", f"Součet černých a bílých kolíků nesmí přesáhnout {self.num_pegs}.")
             return
 
-        msg = f"{self.GAME_PREFIX}:EVALUATION:{blacks}:{whites}"
         try:
-            self.send_evaluation(msg)
+            self.send_evaluation(blacks, whites)
             
-            self.addEvaluation((blacks, whites)) 
+            self.requestBoard()
             
             if hasattr(self, 'input_frame') and self.input_frame:
                 self.hideInputPanel(show_status=True, status_text="Hodnocení odesláno. Čekám na další tip od protihráče.", color="#4363d8")
@@ -827,67 +723,34 @@ class LogikApp:
             print(f"Chyba při odesílání hodnocení: {e}")
             self.updateStatus("Chyba při odesílání hodnocení", "#e6194b")
 
-    # Odešle tip
-    def send_guess(self, colors_str):
+    # Odešle tip (barvy jako čísla 0..colors-1)
+    def send_guess(self, colors):
         """Send GUESSING_COLORS message to server."""
         try:
-            msg = f"{self.GAME_PREFIX}:GUESSING_COLORS:{colors_str}"
-            sendMessage(self.socket, msg.encode())
+            self.client.send_guess(tuple(int(c) for c in colors))
             return True
         except Exception:
             return False
 
     # Odešle volbu
-    def send_choice(self, colors_str):
+    def send_choice(self, colors):
         """Send CHOOSING_COLORS message to server."""
         try:
-            msg = f"{self.GAME_PREFIX}:CHOOSING_COLORS:{colors_str}"
-            sendMessage(self.socket, msg.encode())
+            self.client.send_choice(tuple(int(c) for c in colors))
             return True
         except Exception:
             return False
 
     # Odešle hodnocení
-    def send_evaluation(self, msg):
+    def send_evaluation(self, blacks, whites):
         """Send EVALUATION message to server."""
         try:
-            sendMessage(self.socket, msg.encode())
+            self.client.send_evaluation(blacks, whites)
             return True
         except Exception:
             return False
 
-    # Přidá tip do kola, do hry s kokrétním čislem kola
-    def addGuess(self, guess_data):
-        """Přidá tip do aktuálního kola a obnoví desku."""
-        if 0 <= self.currentRoundNumber < len(self.rounds):
-            if isinstance(guess_data, list):
-                guesses_list = guess_data
-            elif isinstance(guess_data, str):
-                 guesses_list = [int(ch) for ch in guess_data if ch.isdigit()][:self.num_pegs]
-            else:
-                 return
-
-            self.rounds[self.currentRoundNumber].guesses = [guesses_list]
-        
-        self.master.after(0, self.drawBoard)
-
-    # Přidá hodnocení do kola
-    def addEvaluation(self, evaluation_tuple):
-        """Přidá hodnocení do aktuálního kola, obnoví desku."""
-        if 0 <= self.currentRoundNumber < len(self.rounds):
-            self.rounds[self.currentRoundNumber].evaluations.append(evaluation_tuple)
-        
-        self.master.after(0, self.drawBoard) 
-
-    # Přesune hru do dalšího kola
-    def nextRound(self):
-        """Přesune hru do dalšího kola a aktualizuje UI."""
-        if self.currentRoundNumber < 9:
-            self.currentRoundNumber += 1
-        
-        self.master.after(0, self.drawBoard)
-
-    # Vykreslení hrací desky
+    # Vykreslení hrací desky: jeden Canvas na celou hru, mění se jen kolíky, které se změnily
     def drawBoard(self):
         """Vykreslí hrací desku a tajnou kombinaci (pro Evaluatora)."""
         
@@ -895,35 +758,14 @@ class LogikApp:
         
         self._draw_secret_combination()
 
-        if hasattr(self, 'e_board_frame') and self.e_board_frame:
-            try:
-                if self.e_board_frame.winfo_exists():
-                    for w in self.e_board_frame.winfo_children(): w.destroy()
-                else:
-                    self.e_board_frame = tk.Frame(self.board_frame, bg="#fcfcfc")
-                    self.e_board_frame.pack(padx=10, pady=8, fill=tk.BOTH, expand=True)
-            except tk.TclError:
-                self.e_board_frame = tk.Frame(self.board_frame, bg="#fcfcfc")
-                self.e_board_frame.pack(padx=10, pady=8, fill=tk.BOTH, expand=True)
-        else:
-             self.e_board_frame = tk.Frame(self.board_frame, bg="#fcfcfc")
-             self.e_board_frame.pack(padx=10, pady=8, fill=tk.BOTH, expand=True)
-
-        container = tk.Frame(self.e_board_frame, bg="#ffffff", bd=1, relief=tk.RIDGE)
-        container.pack(fill=tk.BOTH, expand=True)
-
-        canvas = tk.Canvas(container, bg="#ffffff", highlightthickness=0)
-        vscroll = ttk.Scrollbar(container, orient=tk.VERTICAL, command=canvas.yview) # ttk scrollbar
-        
-        vscroll.pack(side=tk.RIGHT, fill=tk.Y)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        canvas.configure(yscrollcommand=vscroll.set)
+        if self.board_view is None:
+            self.board_view = BoardView(self.board_frame, self.palette, self.num_pegs, self.empty)
+            self.board_view.pack(padx=10, pady=8, fill=tk.BOTH, expand=True)
+        self.board_view.render(self.rounds, self.currentRoundNumber)
 
-        inner_frame = tk.Frame(canvas, bg="#ffffff")
-        canvas.create_window((0, 0), window=inner_frame, anchor='nw')
-        inner_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        
-        self._draw_board_rows(inner_frame)
+    # Rozestup kolíků tajné kombinace (u více kolíků hustší, aby se vešly do okna)
+    def _secret_spacing(self):
+        return min(50, 300 // self.num_pegs)
 
     # Vykreslení tajné kombinace
     def _draw_secret_combination(self):
@@ -933,7 +775,7 @@ class LogikApp:
         
         self.secret_canvas.delete("all")
         r = 12
-        spacing = 50
+        spacing = self._secret_spacing()
         margin_x = 10
         cy = 20
         
@@ -942,7 +784,7 @@ class LogikApp:
         for i, color_idx in enumerate(self.input_values):
             cx = margin_x + i * spacing
             
-            if color_idx == 6:
+            if color_idx == self.empty:
                 fill_col = "#ffffff"
                 outline = "#cccccc"
             elif 0 <= color_idx < len(palette):
@@ -957,80 +799,10 @@ class LogikApp:
                 fill=fill_col, outline=outline, width=2
             )
 
-    # Vykreslení řádků desky
-    def _draw_board_rows(self, inner_frame):
-        """Vykresluje jednotlivé řádky desky do inner_frame."""
-        
-        palette = self.palette
-        row_h = 40
-        peg_r = 11
-        
-        def parse_guess(rnd):
-            if rnd.guesses and isinstance(rnd.guesses[-1], list):
-                return rnd.guesses[-1][:self.num_pegs]
-            return [6] * self.num_pegs
-
-        def parse_eval(rnd):
-            if rnd.evaluations:
-                ev = rnd.evaluations[-1]
-                if isinstance(ev, tuple) and len(ev) >= 2:
-                    return (int(ev[0]), int(ev[1]))
-            return (0, 0)
-
-        for idx, rnd in enumerate(self.rounds):
-            row = tk.Frame(inner_frame, height=row_h)
-            row.pack(fill=tk.X, padx=5, pady=2)
-            
-            bg_color = "#ffffff"
-            if idx == self.currentRoundNumber:
-                bg_color = "#fffac8"
-            row.config(bg=bg_color)
-
-            # 1. Číslo kola
-            tk.Label(row, text=f"{idx+1}", font=("Arial", 10, "bold" if idx == self.currentRoundNumber else "normal"), 
-                     bg=bg_color, width=4).pack(side=tk.LEFT, padx=5)
-
-            # 2. Tip (4 velké kolíky)
-            guess_frame = tk.Frame(row, bg=bg_color)
-            guess_frame.pack(side=tk.LEFT, padx=10)
-            
-            guess_vec = parse_guess(rnd)
-            
-            for val in guess_vec:
-                fill_col = palette[val] if 0 <= val < len(palette) else "#ffffff"
-                outline_col = "#7a7a7a" if 0 <= val < len(palette) else "#cccccc"
-                
-                canvas = tk.Canvas(guess_frame, width=peg_r*2, height=peg_r*2, bg=bg_color, highlightthickness=0)
-                canvas.pack(side=tk.LEFT, padx=3)
-                canvas.create_oval(1, 1, peg_r*2-1, peg_r*2-1, fill=fill_col, outline=outline_col, width=2)
-
-            # 3. Hodnocení (4 malé kolíky)
-            eval_frame = tk.Frame(row, bg=bg_color)
-            eval_frame.pack(side=tk.LEFT, padx=10)
-            
-            blacks, whites = parse_eval(rnd)
-            k = 0
-            
-            for i in range(4):
-                if k < blacks:
-                    color = "#FF6C1D"
-                    k += 1
-                elif k < blacks + whites:
-                    color = "#969696" 
-                    k += 1
-                else:
-                    color = "#f0f0f0"
-                
-                canvas = tk.Canvas(eval_frame, width=12, height=12, bg=bg_color, highlightthickness=0)
-                canvas.grid(row=i//2, column=i%2)
-                canvas.create_oval(1, 1, 11, 11, fill=color, outline="#cccccc", width=1)
-                
-        inner_frame.update_idletasks()
-        canvas.config(scrollregion=canvas.bbox("all"))
-    
     def updateStatus(self, text, color):
         self.update_status_safely(self.status_label, text, color)
         
+    # Text labelu se nastaví při nejbližším překreslení; z více změn téhož labelu platí poslední
     def update_status_safely(self, label, text, color):
         try:
             if hasattr(self, 'master') and self.master.winfo_exists() and label:
@@ -1039,39 +811,29 @@ class LogikApp:
                         label.config(text=text, fg=color)
                     except Exception:
                         pass
-                self.master.after(0, _upd)
+                self.ui.schedule(("status", str(label)), _upd)
         except Exception:
             pass
 
-    # Hodnocení přijaté zprávy, pokud projde je vlaidní vůči protokolu
-    def evaluate_message(self, message, STATE_PREFIX, PARTS_COUNT):
-        parts = message.split(":")
-        
-        if parts[0] != self.GAME_PREFIX or parts[1] != STATE_PREFIX:
-            return False
-            
-        if PARTS_COUNT != -1 and len(parts) != PARTS_COUNT:
-            return False
-            
-        return True
+    # Naplánování překreslení desky (sloučí se s ostatními změnami do jednoho za snímek)
+    def requestBoard(self):
+        self.ui.schedule("board", self.drawBoard)
+
+    # Naplánování přestavby vstupního panelu; platí poslední požadavek
+    def requestPanel(self, func, *args):
+        self.ui.schedule("panel", func, *args)
+
+    # Výpis statistik SocketLib (jen se zapnutým --stats)
+    def dump_stats(self):
+        self.client.dump_stats()
+        if get_stats() is not None:
+            print(f"[STATS] překreslení GUI: {self.ui.rendered} z {self.ui.requested} požadavků", file=sys.stderr)
+        dump_ui_profile()
 
     # Uzavření klienta a ukončení aplikace
     def on_close(self):
-        self.isRunning = False
-        self.connected = False
-        
-        if self.socket:
-            try:
-                pass
-            except Exception:
-                pass
-            try:
-                self.socket.shutdown(socket.SHUT_RDWR)
-                self.socket.close()
-            except Exception:
-                pass
-            finally:
-                self.socket = None
+        self.dump_stats()
+        self.client.close()
 
         try:
             self.master.destroy()
@@ -1083,244 +845,104 @@ class LogikApp:
         except SystemExit:
             os._exit(0)
 
-    # Hlavní smyčka pro přijímání zpráv od serveru
-    def recvMessageThread(self):
-        # Nastav timeout, aby při ztrátě konektivity recv vyhodil výjimku
-        try:
-            if self.socket:
-                self.socket.settimeout(6.0)
-                print("[DEBUG] socket timeout nastaven na 6s")
-        except Exception:
-            pass
-        while self.isRunning:
-            try:
-                data = recvMessage(self.socket)
-                if not data:
-                    self.master.after(0, self.handleDisconnect)
-                    continue
-                    
-                message = data.decode()
-                try:
-                    self.last_online = time.time()
-                except Exception:
-                    pass
-                self.handleMessage(message)
-            except socket.timeout:
-                # Neaktivita -> detekuj odpojení a přepni do reconnectingu
-                print("[DEBUG] recv timeout -> handleDisconnect")
-                self.master.after(0, self.handleDisconnect)
-                time.sleep(0.1)
-            except Exception:
-                self.master.after(0, self.handleDisconnect)
-                time.sleep(0.1)
-
-    # Zpracování příchozích zpráv
-    def handleMessage(self, message):
-        parts = message.split(":")
-        
-        if len(parts) < 2 or parts[0] != self.GAME_PREFIX:
-            return
-        
-        msg_type = parts[1]
-        
-        # odpověď na ping
-        if msg_type == "PING":
-            if self.reconnecting:
-                return
-            pong_msg = f"{self.GAME_PREFIX}:PONG:{self.name}:{self.role}"
-            try:
-                self.last_online = time.time()
-                sendMessage(self.socket, pong_msg.encode())
-            except Exception:
-                self.master.after(0, self.handleDisconnect)
-
-        # výhra/prohra
-        elif msg_type == "WIN_GAME":
-            if(int(parts[2]) == self.role):
-                self.updateStatus("Gratuluji! Vyhrál jsi hru!", "#ffe119") # Zlatá
-            else:
-                self.updateStatus("Bohužel, prohrál jsi.", "#e6194b")
-            try:
-                sendMessage(self.socket, f"{self.GAME_PREFIX}:WIN_GAME_ACK".encode())
-            except Exception:
-                pass
-            self.isRunning = False
-            self.reconnecting = False
-            self.master.after(2000, self.returnToLobby)
-
-        # permanentní odpojení
-        elif msg_type == "PERMANENT_DISCONNECT":
-            opponent_name = parts[2] if len(parts) > 2 else self.opponent_name
-            self.opponent_online = 0
-            self.updatePresenceUI(opponent_name)
-            respond_message = f"{self.GAME_PREFIX}:PERMANENT_DISCONNECT_CONFIRM:{self.name}:{self.role}"
-            try:
-                sendMessage(self.socket, respond_message.encode())
-            except Exception:
-                pass 
-            self.isRunning = False
-            self.master.after(2000, self.returnToLobby)
-
-        # dočasné odpojení
-        elif msg_type == "TEMPORARY_DISCONNECT":
-            opponent_name = parts[2] if len(parts) > 2 else self.opponent_name
-            self.opponent_online = 0
-            self.updatePresenceUI(opponent_name)
-            respond_message = f"{self.GAME_PREFIX}:TEMPORARY_DISCONNECT_CONFIRM:{self.name}:{self.role}"
-            try:
-                sendMessage(self.socket, respond_message.encode())
-            except Exception:
-                pass
-
-        # reconnect jiného hráče
-        elif msg_type == "RECONNECT_OTHER_PLAYER":
-            opponent_name = parts[2] if len(parts) > 2 else self.opponent_name
-            self.opponent_online = 1
-            self.updatePresenceUI(opponent_name)
-            respond_message = f"{self.GAME_PREFIX}:RECONNECT_OTHER_PLAYER_ACK"
-
-            try:
-                sendMessage(self.socket, respond_message.encode())
-            except Exception:
-                pass
-
-        # herní zprávy (volba)
-        elif msg_type == "CHOOSING_COLORS_CONFIRM":
-            if self.role == 0:
-                self.updateStatus("Protihráč vybral kombinaci. Můžeš hádat!", "#3cb44b")
-                self.master.after(0, lambda: self.showInputPanel(role='guesser'))
+    # výhra/prohra
+    def onGameOver(self, winner):
+        if winner == self.role:
+            self.updateStatus("Gratuluji! Vyhrál jsi hru!", "#ffe119") # Zlatá
+        else:
+            self.updateStatus("Bohužel, prohrál jsi.", "#e6194b")
+        self.master.after(2000, self.returnToLobby)
+
+    # permanentní odpojení protihráče
+    def onOpponentLeft(self, name):
+        self.updatePresenceUI(name)
+        self.master.after(2000, self.returnToLobby)
+
+    # herní zprávy (volba)
+    def onColorsChosen(self):
+        if self.role == 0:
+            self.updateStatus("Protihráč vybral kombinaci. Můžeš hádat!", "#3cb44b")
+            self.requestPanel(self.showInputPanel, 'guesser')
+
+    # herní zprávy (tipování)
+    def onGuess(self, colors):
+        guess_str = "".join(str(c) for c in colors)
+        self.requestBoard()
         
-        # herní zprávy (tipování)
-        elif msg_type == "GUESSING_COLORS_ACK":
-            if len(parts) > 2:
-                guess_str = parts[2]
-                
-                if self.role == 1:
-                    self.addGuess(guess_str)
-                    self.updateStatus("Protihráč tipoval! Ohodnoť jeho tip.", "#3cb44b")
-                    self.master.after(0, lambda: self.showEvaluationPanel(guess_str))
-                    
-                elif self.role == 0:
-                    self.addGuess(guess_str)
-                    self.updateStatus("Tip odeslán. Čekám na hodnocení...", "#4363d8")
-                    self.hideInputPanel(show_status=True, status_text="Tip odeslán. Čekám na hodnocení...", color="#4363d8")
-
-        # herní zprávy (hodnocení)
-        elif msg_type == "EVALUATION_ACK":
-            if len(parts) > 3:
-                try:
-                    blacks = int(parts[2])
-                    whites = int(parts[3])
-                except ValueError:
-                    return
-                
-                self.addEvaluation((blacks, whites)) 
-                self.master.after(100, self.nextRound)
-                    
-                if self.role == 0:
-                    self.updateStatus(f"Protihráč hodnotil. Hodnocení: {blacks} Černá, {whites} Bílá. Hádej znovu.", "#3cb44b")
-                    self.master.after(200, lambda: self.showInputPanel(role='guesser'))
-                        
-                elif self.role == 1:
-                    self.updateStatus("Hodnocení odesláno. Čekám na další tip...", "#4363d8")
-                    self.hideInputPanel(show_status=True, status_text="Hodnocení odesláno. Čekám na další tip od protihráče.", color="#4363d8")
-
-        elif msg_type == "GAME_OVER":
-            self.updateStatus("Konec hry! " + parts[2] if len(parts) > 2 else "Hra skončila.", "#911eb4")
-            self.isRunning = False
-            self.master.after(5000, self.returnToLobby)
-
-    # Zpracování odpojení od serveru
-    def handleDisconnect(self):
-        """Zpracování odpojení od serveru"""
-        if not self.isRunning or not hasattr(self, 'master') or not self.master.winfo_exists():
-            return
-        if not self.reconnecting:
-            self.reconnecting = True
-            self.me_online = 0
-            self.updatePresenceUI()
-            self.updateStatus("Odpojeno - pokus o reconnect...", "#e6194b")
-    
-    # Monitor připojení a reconnect
-    def reconnectMonitor(self):
-        """Monitoruje stav připojení a pokouší se o reconnect"""
-        retry_delay = 1.0
-        while self.isRunning:
-            if self.reconnecting:
-                ref = self.last_online if isinstance(self.last_online, (int, float)) else time.time()
-                elapsed = int(time.time() - ref)
-                self.updateStatus(f"Reconnecting... ({elapsed}s)", "#f58231")
-                if self.attemptReconnect():
-                    self.reconnecting = False
-                    self.last_online = time.time()
-                    self.me_online = 1
-                    self.updatePresenceUI()
-                    self.updateStatus("Připojeno zpět - hra pokračuje", "#3cb44b")
-                else:
-                    time.sleep(retry_delay)
-            else:
-                time.sleep(0.5)
-    
-    # Pokus o reconnect k serveru
-    def attemptReconnect(self):
-        """Pokus o reconnect k serveru v Game fázi."""
-        try:
-            new_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            new_socket.connect((self.host, self.port)) 
-            
-            reconnect_msg = f"{self.GAME_PREFIX}:RECONNECT_REQUEST:{self.name}:{self.role}"
-            sendMessage(new_socket, reconnect_msg.encode())
-            
-            response = recvMessage(new_socket)
-            if response:
-                msg = response.decode()
-                if "RECONNECT_CONFIRM" in msg:
-                    try:
-                        self.socket.close()
-                    except:
-                        pass
-                    self.isRunning = False
-                    time.sleep(0.2)
-                    self.socket = new_socket
-                    self.reconnectData = msg
-                    self.isRunning = True
-                    self.master.after(0, self.continueGame)
-                    return True
+        if self.role == 1:
+            self.updateStatus("Protihráč tipoval! Ohodnoť jeho tip.", "#3cb44b")
+            self.requestPanel(self.showEvaluationPanel, guess_str)
             
-            new_socket.close()
-            return False
+        elif self.role == 0:
+            self.updateStatus("Tip odeslán. Čekám na hodnocení...", "#4363d8")
+            self.requestPanel(self.hideInputPanel, True, "Tip odeslán. Čekám na hodnocení...", "#4363d8")
+
+    # herní zprávy (hodnocení); LogikClient už hru posunul do dalšího kola
+    def onEvaluation(self, blacks, whites):
+        self.requestBoard()
             
-        except Exception:
-            return False
+        if self.role == 0:
+            self.updateStatus(f"Protihráč hodnotil. Hodnocení: {blacks} Černá, {whites} Bílá. Hádej znovu.", "#3cb44b")
+            self.requestPanel(self.showInputPanel, 'guesser')
+                
+        elif self.role == 1:
+            self.updateStatus("Hodnocení odesláno. Čekám na další tip...", "#4363d8")
+            self.requestPanel(self.hideInputPanel, True, "Hodnocení odesláno. Čekám na další tip od protihráče.", "#4363d8")
+
+    # Odpojení od serveru během hry, LogikClient zkouší reconnect
+    def onConnectionLost(self, error):
+        if not hasattr(self, 'master') or not self.master.winfo_exists():
+            return
+        self.updatePresenceUI()
+        self.updateStatus("Odpojeno - pokus o reconnect...", "#e6194b")
+
+    def onReconnecting(self, elapsed):
+        self.updateStatus(f"Reconnecting... ({elapsed}s)", "#f58231")
+
+    # Spojení obnoveno, herní obrazovka se sestaví ze snímku hry
+    def onReconnected(self, game_state):
+        self.continueGame(game_state)
+        self.updatePresenceUI()
 
     # Návrat do lobby
     def returnToLobby(self):
-        self.isRunning = False
-        self.reconnecting = False
-        self.currentRoundNumber = 0
-        self._initialize_rounds()
-        
-        # Reset socket timeoutu - v lobby čekáme bez timeoutu
-        if self.socket:
-            try:
-                self.socket.settimeout(None)
-            except Exception:
-                pass
+        self.client.return_to_lobby()
         
         # Reset herních UI referencí
-        self.e_board_frame = None
+        self.board_view = None
         self.input_values = None
         
         self.master.after(0, self.show_lobby)
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python client2.py <port> [host]")
+    # Volitelné přepínače, zbytek jsou poziční argumenty
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    compress = "--compress" in sys.argv[1:]
+    binary = "--binary" in sys.argv[1:]
+    offer_geometry = True if "--geom" in sys.argv[1:] else None
+    if "--stats" in sys.argv[1:]:
+        enable_stats()
+    for arg in sys.argv[1:]:
+        if arg.startswith("--trace="):
+            enable_trace(arg.split("=", 1)[1])
+        elif arg.startswith("--uiprofile="):
+            enable_ui_profile(arg.split("=", 1)[1])
+
+    if len(args) < 1:
+        print("Usage: python client2.py <port> [host] [--compress] [--binary] [--stats] [--trace=soubor] [--uiprofile=soubor]")
+        print("       [--pegs=4] [--colors=6] [--rounds=10] [--geom]")
         print("       host default: 127.0.0.1")
+        print("       --compress: nabídne serveru kompresi velkých zpráv (zlib)")
+        print("       --binary: nabídne serveru binární hlavičku zpráv (MB + 4 bajty délky)")
+        print("       --stats: sbírá statistiky zpráv a vypíše je při výpadku spojení a při ukončení")
+        print("       --trace=soubor: zapisuje všechny zprávy do souboru pro přehrání (bench_replay.py)")
+        print("       --uiprofile=soubor: měří zpoždění Tk a dobu vykreslení, přehled v okně (F12) a vzorky do souboru")
+        print("       --pegs, --colors, --rounds: deska pro server, který ji neohlásí; jiná než klasická se nabídne i serveru (GEOM)")
+        print("       --geom: převezme desku ohlášenou serverem (LogikServer.py) i s klasickou deskou; starší server pětidílné přihlášení odmítne")
         sys.exit(1)
         
     try:
-        port = int(sys.argv[1])
+        port = int(args[0])
     except ValueError:
         print("Port musí být celé číslo.")
         sys.exit(1)
@@ -1329,10 +951,23 @@ def main():
         print("Port musí být v rozsahu 1-65535.")
         sys.exit(1)
 
-    host = sys.argv[2] if len(sys.argv) >= 3 else "127.0.0.1"
+    host = args[1] if len(args) >= 2 else "127.0.0.1"
+
+    # Geometrie desky pro server, který ji neohlásí
+    geometry = {"pegs": Messages.NUM_PEGS, "colors": Messages.NUM_COLORS, "rounds": Messages.NUM_ROUNDS}
+    try:
+        for arg in sys.argv[1:]:
+            key, _, value = arg[2:].partition("=")
+            if arg.startswith("--") and key in geometry:
+                geometry[key] = int(value)
+        geometry = Geometry(**geometry)
+    except ValueError as e:
+        print(f"Neplatná geometrie desky: {e}")
+        sys.exit(1)
     
+    load_gui()
     root = tk.Tk()
-    app = LogikApp(root, host, port)
+    app = LogikApp(root, host, port, compress=compress, binary=binary, geometry=geometry, offer_geometry=offer_geometry)
     root.mainloop()
 
 if __name__ == "__main__":